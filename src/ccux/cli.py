@@ -5,60 +5,12 @@ A sophisticated Python CLI tool that automatically generates conversion-optimize
 frontend landing pages using professional UX design thinking methodology.
 """
 
-import os
-import sys
-import json
-import time
-import threading
-import subprocess
-import signal
-import re
 import importlib.metadata
-from pathlib import Path
-from typing import Optional, List, Dict, Any
-from urllib.parse import urlparse
+from typing import Optional, List
 
 import typer
-import yaml
-from rich import print
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
-from rich.status import Status
 from rich.table import Table
-from rich.prompt import Prompt, Confirm, IntPrompt
-from rich.panel import Panel
-
-# Import all the existing functionality we need
-from .scrape import capture_multiple_references
-from .scrape_simple import capture
-from .theme_specifications import (
-    THEME_SPECIFICATIONS,
-    get_theme_choices,
-    get_theme_description,
-    get_theme_design_system_rules,
-    detect_theme_from_content
-)
-from .prompt_templates import (
-    reference_discovery_prompt,
-    deep_product_understanding_prompt,
-    ux_analysis_prompt,
-    empathize_prompt,
-    define_prompt,
-    ideate_prompt,
-    wireframe_prompt,
-    design_system_prompt,
-    high_fidelity_design_prompt,
-    prototype_prompt,
-    implementation_prompt,
-    landing_prompt,
-    regeneration_prompt,
-    editgen_prompt,
-    editgen_sections_prompt,
-    get_animation_requirements,
-    form_on_prompt,
-    form_off_prompt,
-    form_edit_prompt
-)
 
 app = typer.Typer(
     name="ccux",
@@ -68,35 +20,27 @@ app = typer.Typer(
 )
 console = Console()
 
-# Import usage tracking functions from core module
-from .core.usage_tracking import get_latest_usage, calculate_usage_difference
-
 # Import signal handling from core module
 from .core.signal_handling import register_signal_handler
 
 # Register signal handler
 register_signal_handler()
 
-# Import configuration management from core module
-from .core.configuration import Config
-
 # Import project management functions from core module
-from .core.project_management import (
-    get_next_available_output_dir,
-    discover_existing_projects, 
-    extract_project_name_from_dir
-)
+from .core.project_management import discover_existing_projects
 
-# Import Claude integration and content processing from core modules
-from .core.claude_integration import run_claude_with_progress, summarize_long_description
-from .core.content_processing import safe_json_parse, strip_code_blocks
+# Commands delegate to the interactive app or cli_old, which are imported
+# on first use so that every ccux invocation does not pay for them
 
 @app.command()
-def init():
+def init(
+    no_cache: bool = typer.Option(False, "--no-cache", help="Don't read or write cached Claude responses"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached Claude responses and store fresh ones")
+):
     """Launch CCUX Interactive Application (Main Entry Point)"""
     try:
         from .interactive import run_interactive_app
-        run_interactive_app()
+        run_interactive_app(use_cache=not no_cache, refresh_cache=refresh)
     except ImportError as e:
         console.print(f"[red]❌ Error importing interactive module: {e}[/red]")
         console.print("Please ensure all dependencies are installed.")
@@ -164,12 +108,14 @@ def gen(
     theme: Optional[str] = typer.Option("minimal", "--theme", "-t", help="Design theme"),
     no_design_thinking: bool = typer.Option(False, "--no-design-thinking", help="Skip full design thinking process"),
     include_forms: bool = typer.Option(False, "--include-forms", help="Include contact forms"),
-    output_dir: Optional[str] = typer.Option(None, "--output", "-o", help="Output directory")
+    output_dir: Optional[str] = typer.Option(None, "--output", "-o", help="Output directory"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Don't read or write cached Claude responses"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached Claude responses and store fresh ones")
 ):
     """Generate conversion-optimized landing page"""
     # Import and use the gen function from cli_old
     from . import cli_old
-    cli_old.gen(desc, desc_file, url, framework, theme, no_design_thinking, include_forms, output_dir)
+    cli_old.gen(desc, desc_file, url, framework, theme, no_design_thinking, include_forms, output_dir, no_cache, refresh)
 
 @app.command()
 def regen(
@@ -194,7 +140,7 @@ def main(ctx: typer.Context):
     """
     if ctx.invoked_subcommand is None:
         # If no command is provided, launch the interactive app
-        ctx.invoke(init)
+        ctx.invoke(init, no_cache=False, refresh=False)
 
 if __name__ == "__main__":
     app()
\ No newline at end of file
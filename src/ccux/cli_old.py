@@ -6,29 +6,24 @@ frontend landing pages using professional UX design thinking methodology.
 """
 
 import os
-import sys
 import json
+import html
 import time
-import threading
 import subprocess
-import signal
 import re
 import importlib.metadata
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any
 from urllib.parse import urlparse
 
 import typer
-import yaml
 from rich import print
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+from rich.progress import Progress
 from rich.status import Status
 from rich.table import Table
 from rich.prompt import Prompt, Confirm, IntPrompt
 from rich.panel import Panel
-from .scrape import capture_multiple_references
-from .scrape_simple import capture
 from .theme_specifications import (
     THEME_SPECIFICATIONS,
     get_theme_choices,
@@ -66,13 +61,8 @@ app = typer.Typer(
 )
 console = Console()
 
-# Import core module functions (these will override any duplicates below due to import order)
-from .core.usage_tracking import (
-    calculate_estimated_cost,
-    get_latest_usage, 
-    calculate_usage_difference,
-    display_usage_stats
-)
+# Import core module functions
+from .core.usage_tracking import get_latest_usage, calculate_usage_difference
 from .core.signal_handling import register_signal_handler
 from .core.configuration import Config  
 from .core.project_management import (
@@ -80,110 +70,37 @@ from .core.project_management import (
     discover_existing_projects,
     extract_project_name_from_dir
 )
-from .core.claude_integration import run_claude_with_progress, summarize_long_description
-from .core.content_processing import safe_json_parse, strip_code_blocks
+from .core.claude_integration import (
+    run_claude_with_progress as core_run_claude_with_progress,
+    run_claude_to_file as core_run_claude_to_file,
+    run_claude_simple as core_run_claude_simple,
+    create_claude_progress,
+    run_phase_graph,
+    summarize_long_description
+)
+from .core.content_processing import safe_json_parse, is_json_output, strip_code_blocks, save_json_file, extract_reference_urls
 from .core.animation_utilities import add_theme_appropriate_animations, remove_animations_from_content
 
 # Register signal handler
 register_signal_handler()
 
-def calculate_estimated_cost(input_tokens: int, output_tokens: int) -> float:
-    """Calculate estimated cost based on Claude pricing"""
-    # Claude 3.5 Sonnet pricing (as of 2024)
-    # Input: $3.00 per million tokens
-    # Output: $15.00 per million tokens
-    input_cost = (input_tokens / 1_000_000) * 3.00
-    output_cost = (output_tokens / 1_000_000) * 15.00
-    return input_cost + output_cost
-
-def get_latest_usage() -> Dict[str, Any]:
-    """Get the latest usage data from ccusage"""
-    try:
-        result = subprocess.run(['ccusage', '--json', '--order', 'desc'], 
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            if data.get('daily') and len(data['daily']) > 0:
-                return data['daily'][0]  # Most recent day
-    except Exception:
-        pass
-    return {}
-
-def calculate_usage_difference(pre_usage: Dict[str, Any], post_usage: Dict[str, Any]) -> Dict[str, Any]:
-    """Calculate the difference in usage between two ccusage snapshots"""
-    if not pre_usage or not post_usage:
-        return {}
-    
-    # Calculate differences
-    input_diff = post_usage.get('inputTokens', 0) - pre_usage.get('inputTokens', 0)
-    output_diff = post_usage.get('outputTokens', 0) - pre_usage.get('outputTokens', 0)
-    cost_diff = post_usage.get('totalCost', 0) - pre_usage.get('totalCost', 0)
-    
-    # Return usage stats in expected format
-    return {
-        'input_tokens': max(0, input_diff),
-        'output_tokens': max(0, output_diff),
-        'cost': max(0.0, cost_diff)
-    }
-
-# Global variables for signal handling
-current_subprocess = None
-current_progress = None
-
-def signal_handler(signum, frame):
-    """Handle keyboard interrupts gracefully"""
-    global current_subprocess, current_progress
-    
-    console.print("\n[yellow]⚠️  Interrupt received, cleaning up...[/yellow]")
-    
-    if current_subprocess:
-        try:
-            current_subprocess.terminate()
-            current_subprocess.wait(timeout=5)
-        except:
-            try:
-                current_subprocess.kill()
-            except:
-                pass
-    
-    if current_progress:
-        current_progress.stop()
-    
-    console.print("[red]❌ Operation cancelled by user[/red]")
-    sys.exit(1)
-
-# Register signal handler
-signal.signal(signal.SIGINT, signal_handler)
-
-class Config:
-    """Configuration management for CCUX"""
-    
-    def __init__(self, config_path: str = "ccux.yaml"):
-        self.config_path = config_path
-        self.defaults = {
-            'framework': 'html',
-            'theme': 'minimal',
-            'sections': ['hero', 'features', 'pricing', 'footer'],
-            'claude_cmd': 'claude',
-            'output_dir': 'output/landing-page'
-        }
-        self.config = self._load_config()
-    
-    def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from file or use defaults"""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    config = yaml.safe_load(f) or {}
-                # Merge with defaults
-                return {**self.defaults, **config}
-            except Exception as e:
-                console.print(f"[yellow]⚠️  Error loading config: {e}. Using defaults.[/yellow]")
-        
-        return self.defaults.copy()
-    
-    def get(self, key: str, default=None):
-        return self.config.get(key, default)
+# Patterns used when editing generated pages, compiled once at import time
+SECTION_BLOCK_PATTERN = re.compile(r'<!-- START: (\w+) -->(.*?)<!-- END: \1 -->', re.DOTALL)
+BRAND_NAME_PATTERNS = [
+    re.compile(r'^([A-Z][A-Za-z0-9\s]{1,30})\s*[-–—]\s*'),  # "ProductName - description"
+    re.compile(r'^([A-Z][A-Za-z0-9\s]{1,30})\s*\([^)]+\)'),  # "ProductName (description)"
+    re.compile(r'^([A-Z][A-Za-z0-9\s]{1,30})\s+is\s+'),      # "ProductName is a..."
+    re.compile(r'^([A-Z][A-Za-z0-9\s]{1,30})\s*:\s*'),       # "ProductName: description"
+    re.compile(r'^([A-Z][A-Za-z0-9\s]{1,30})\s*,\s*'),       # "ProductName, description"
+]
+FORM_PATTERN = re.compile(r'<form[^>]*>.*?</form>', re.DOTALL | re.IGNORECASE)
+CONTACT_SECTION_PATTERN = re.compile(
+    r'<!-- START: contact -->\s*<section[^>]*id=["\']contact["\'][^>]*>.*?</section>\s*<!-- END: contact -->',
+    re.DOTALL | re.IGNORECASE
+)
+SECTION_INNER_PATTERN = re.compile(r'<section[^>]*>(.*?)</section>', re.DOTALL)
+EMPTY_DIV_PATTERN = re.compile(r'<div[^>]*>\s*</div>', re.DOTALL)
+EXCESS_BLANK_LINES_PATTERN = re.compile(r'\n\s*\n\s*\n')
 
 def get_next_available_output_dir() -> str:
     """Find the next available output directory"""
@@ -349,98 +266,8 @@ def select_theme_interactively() -> str:
             console.print("\n[yellow]Theme selection cancelled[/yellow]")
             raise typer.Exit(1)
 
-def run_claude_with_progress(prompt: str, description: str = "Claude Code is thinking...") -> tuple[str, Dict[str, Any]]:
-    """Run Claude CLI with real-time progress indication and usage tracking via ccusage"""
-    global current_subprocess, current_progress
-    
-    config = Config()
-    claude_cmd = config.get('claude_cmd', 'claude')
-    
-    # Get usage before Claude call for comparison
-    pre_usage = get_latest_usage()
-    
-    # Prepare Claude command
-    cmd = [claude_cmd, '--print', prompt]
-    
-    output_lines = []
-    stderr_lines = []
-    
-    def read_stream(stream, lines_list):
-        """Read from stream and collect output"""
-        try:
-            for line in iter(stream.readline, ''):
-                if line:
-                    lines_list.append(line.strip())
-        except:
-            pass
-    
-    with Progress(
-        SpinnerColumn(),
-        TextColumn(f"[bold blue]{description}"),
-        TimeElapsedColumn(),
-        console=console,
-        transient=False
-    ) as progress:
-        current_progress = progress
-        task = progress.add_task("Processing", total=None)
-        
-        try:
-            # Start Claude process
-            current_subprocess = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            
-            # Start threads to read stdout and stderr
-            stdout_thread = threading.Thread(
-                target=read_stream, 
-                args=(current_subprocess.stdout, output_lines)
-            )
-            stderr_thread = threading.Thread(
-                target=read_stream, 
-                args=(current_subprocess.stderr, stderr_lines)
-            )
-            
-            stdout_thread.start()
-            stderr_thread.start()
-            
-            # Wait for process with timeout (5 minutes)
-            try:
-                current_subprocess.wait(timeout=300)
-            except subprocess.TimeoutExpired:
-                current_subprocess.kill()
-                raise Exception("Claude Code timed out after 5 minutes")
-            
-            # Wait for threads to finish
-            stdout_thread.join(timeout=2)
-            stderr_thread.join(timeout=2)
-            
-            if current_subprocess.returncode != 0:
-                error_msg = '\n'.join(stderr_lines) if stderr_lines else "Claude Code execution failed"
-                raise Exception(f"Claude Code failed: {error_msg}")
-            
-            
-        except Exception as e:
-            current_progress = None
-            current_subprocess = None
-            raise e
-        
-        finally:
-            current_progress = None
-            current_subprocess = None
-    
-    # Combine output
-    full_output = '\n'.join(output_lines)
-    
-    # Get usage after Claude call and calculate difference
-    post_usage = get_latest_usage()
-    usage_stats = calculate_usage_difference(pre_usage, post_usage)
-    
-    # Show usage statistics if available
+def print_usage_statistics(usage_stats: Dict[str, Any]) -> None:
+    """Show usage statistics for a Claude call if available"""
     if usage_stats and any(usage_stats.get(key, 0) > 0 for key in ['input_tokens', 'output_tokens']):
         console.print("\n[bold cyan]📊 Usage Statistics:[/bold cyan]")
         if 'input_tokens' in usage_stats:
@@ -450,9 +277,43 @@ def run_claude_with_progress(prompt: str, description: str = "Claude Code is thi
         if 'cost' in usage_stats:
             console.print(f"  Cost: [green]${usage_stats['cost']:.4f}[/green]")
         console.print()
-    
+
+def run_claude_with_progress(prompt: str, description: str = "Claude Code is thinking...",
+                             progress: Optional[Progress] = None, use_cache: bool = False,
+                             refresh_cache: bool = False, track_usage: bool = True,
+                             validate: Optional[Callable[[str], bool]] = None) -> tuple[str, Dict[str, Any]]:
+    """Run Claude CLI with real-time progress indication and usage tracking via ccusage"""
+    full_output, usage_stats = core_run_claude_with_progress(
+        prompt, description, progress=progress, use_cache=use_cache, refresh_cache=refresh_cache,
+        track_usage=track_usage, validate=validate
+    )
+    print_usage_statistics(usage_stats)
     return full_output, usage_stats
 
+def run_claude_simple(prompt: str, description: str = "Claude Code is thinking...",
+                      progress: Optional[Progress] = None, use_cache: bool = False,
+                      refresh_cache: bool = False, track_usage: bool = True,
+                      validate: Optional[Callable[[str], bool]] = None) -> tuple[str, Dict[str, Any]]:
+    """Run Claude CLI without live output streaming and show usage statistics"""
+    full_output, usage_stats = core_run_claude_simple(
+        prompt, description, progress=progress, use_cache=use_cache, refresh_cache=refresh_cache,
+        track_usage=track_usage, validate=validate
+    )
+    print_usage_statistics(usage_stats)
+    return full_output, usage_stats
+
+def run_claude_to_file(prompt: str, out_path: str, description: str = "Claude Code is thinking...",
+                       progress: Optional[Progress] = None, use_cache: bool = False,
+                       refresh_cache: bool = False,
+                       validate: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Run Claude CLI, streaming its output into out_path, and show usage statistics"""
+    usage_stats = core_run_claude_to_file(
+        prompt, out_path, description, progress=progress, use_cache=use_cache, refresh_cache=refresh_cache,
+        validate=validate
+    )
+    print_usage_statistics(usage_stats)
+    return usage_stats
+
 def extract_sections_html(html_content: str, section_names: List[str]) -> str:
     """Extract specific sections from HTML content for section-only editing"""
     extracted = []
@@ -481,16 +342,14 @@ def merge_sections_into_html(original_html: str, updated_sections: str) -> str:
     result_html = original_html
     
     # Parse updated sections and replace them one by one
-    import re
-    section_pattern = r'<!-- START: (\w+) -->(.*?)<!-- END: \1 -->'
-    
-    for match in re.finditer(section_pattern, updated_sections, re.DOTALL):
+    for match in SECTION_BLOCK_PATTERN.finditer(updated_sections):
         section_name = match.group(1)
         new_section_content = match.group(0)  # Full section with markers
         
-        # Find and replace the section in original HTML
-        original_section_pattern = f'<!-- START: {section_name} -->.*?<!-- END: {section_name} -->'
-        result_html = re.sub(original_section_pattern, new_section_content, result_html, flags=re.DOTALL)
+        # Find and replace the section in original HTML (as a literal, so
+        # backslashes in the generated markup are not read as group references)
+        original_section_pattern = f'<!-- START: {re.escape(section_name)} -->.*?<!-- END: {re.escape(section_name)} -->'
+        result_html = re.sub(original_section_pattern, lambda _: new_section_content, result_html, flags=re.DOTALL)
     
     return result_html
 
@@ -578,19 +437,9 @@ def validate_html_output(html_content: str) -> bool:
 
 def extract_brand_name(description: str) -> str:
     """Extract brand/product name from description for display (max 10 words)"""
-    import re
-    
     # Common patterns for product names
-    patterns = [
-        r'^([A-Z][A-Za-z0-9\s]{1,30})\s*[-–—]\s*',  # "ProductName - description"
-        r'^([A-Z][A-Za-z0-9\s]{1,30})\s*\([^)]+\)',  # "ProductName (description)"  
-        r'^([A-Z][A-Za-z0-9\s]{1,30})\s+is\s+',      # "ProductName is a..."
-        r'^([A-Z][A-Za-z0-9\s]{1,30})\s*:\s*',       # "ProductName: description"
-        r'^([A-Z][A-Za-z0-9\s]{1,30})\s*,\s*',       # "ProductName, description"
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, description.strip())
+    for pattern in BRAND_NAME_PATTERNS:
+        match = pattern.match(description.strip())
         if match:
             brand = match.group(1).strip()
             if len(brand.split()) <= 10:
@@ -623,60 +472,6 @@ def extract_brand_name(description: str) -> str:
     # Final fallback: first 8 words with ellipsis
     return ' '.join(words[:8]) + ('...' if len(words) > 8 else '')
 
-def safe_json_parse(text: str) -> Dict[str, Any]:
-    """Safely parse JSON from Claude output"""
-    try:
-        # Try to extract JSON from code blocks
-        lines = text.strip().split('\n')
-        json_lines = []
-        in_json = False
-        
-        for line in lines:
-            if line.strip().startswith('```json') or line.strip().startswith('```'):
-                in_json = True
-                continue
-            elif line.strip() == '```' and in_json:
-                break
-            elif in_json:
-                json_lines.append(line)
-            elif line.strip().startswith('{'):
-                # Direct JSON start
-                json_lines = [line]
-                in_json = True
-            elif in_json and line.strip().endswith('}'):
-                json_lines.append(line)
-                break
-            elif in_json:
-                json_lines.append(line)
-        
-        if json_lines:
-            json_text = '\n'.join(json_lines)
-            return json.loads(json_text)
-        
-        # Fallback: try parsing entire text
-        return json.loads(text)
-        
-    except Exception:
-        return {}
-
-def strip_code_blocks(text: str) -> str:
-    """Strip markdown code blocks from Claude output"""
-    lines = text.strip().split('\n')
-    result_lines = []
-    in_code_block = False
-    
-    for line in lines:
-        # Check for start of code block
-        if line.strip().startswith('```'):
-            in_code_block = not in_code_block
-            continue
-        
-        # If not in code block, include the line
-        if not in_code_block:
-            result_lines.append(line)
-    
-    return '\n'.join(result_lines).strip()
-
 def get_form_specification_interactive(type_arg, fields_arg, style_arg, cta_arg, theme):
     """Get form specification either from arguments or interactive prompts"""
     
@@ -1188,28 +983,24 @@ def extract_page_context(file_path: str) -> Dict[str, Any]:
 
 def remove_forms_surgically(content: str) -> str:
     """Remove all forms from HTML content without altering anything else"""
-    import re
-    
     # Remove form elements and their content
     # This regex matches <form...>...</form> including nested content
-    form_pattern = r'<form[^>]*>.*?</form>'
-    content = re.sub(form_pattern, '', content, flags=re.DOTALL | re.IGNORECASE)
+    content = FORM_PATTERN.sub('', content)
     
     # Remove standalone contact sections that are only forms
     # Look for contact sections that only contain form elements
-    contact_section_pattern = r'<!-- START: contact -->\s*<section[^>]*id=["\']contact["\'][^>]*>.*?</section>\s*<!-- END: contact -->'
     
     def check_contact_section(match):
         section_content = match.group(0)
         # If the section only contains form-related content, remove it
         # Otherwise, just remove the form from within it
-        section_inner = re.search(r'<section[^>]*>(.*?)</section>', section_content, re.DOTALL)
+        section_inner = SECTION_INNER_PATTERN.search(section_content)
         if section_inner:
             inner_content = section_inner.group(1)
             # Remove forms from inner content
-            inner_without_forms = re.sub(r'<form[^>]*>.*?</form>', '', inner_content, flags=re.DOTALL | re.IGNORECASE)
+            inner_without_forms = FORM_PATTERN.sub('', inner_content)
             # Remove empty divs and wrapper elements
-            inner_without_forms = re.sub(r'<div[^>]*>\s*</div>', '', inner_without_forms, flags=re.DOTALL)
+            inner_without_forms = EMPTY_DIV_PATTERN.sub('', inner_without_forms)
             inner_without_forms = inner_without_forms.strip()
             
             # If nothing meaningful left, remove the entire section
@@ -1220,10 +1011,10 @@ def remove_forms_surgically(content: str) -> str:
                 return section_content.replace(inner_content, inner_without_forms)
         return section_content
     
-    content = re.sub(contact_section_pattern, check_contact_section, content, flags=re.DOTALL | re.IGNORECASE)
+    content = CONTACT_SECTION_PATTERN.sub(check_contact_section, content)
     
     # Clean up extra whitespace/newlines left by form removal
-    content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
+    content = EXCESS_BLANK_LINES_PATTERN.sub('\n\n', content)
     
     return content
 
@@ -1469,8 +1260,7 @@ def update_design_analysis_for_regen(output_dir: str, sections_regenerated: List
             analysis_data['product_understanding']['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
         
         # Save updated analysis
-        with open(analysis_file, 'w') as f:
-            json.dump(analysis_data, f, indent=2)
+        save_json_file(analysis_file, analysis_data)
         
         console.print(f"[cyan]📊 Updated design analysis: {analysis_file}[/cyan]")
         
@@ -1590,6 +1380,51 @@ def init():
         console.print(f"[red]❌ Error during initialization: {e}[/red]")
         raise typer.Exit(1)
 
+# Static page that loads the generated App.jsx through in-browser Babel
+REACT_HTML_SHELL = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <script src="https://unpkg.com/react@18/umd/react.development.js"></script>
+    <script src="https://unpkg.com/react-dom@18/umd/react-dom.development.js"></script>
+    <script src="https://unpkg.com/@babel/standalone/babel.min.js"></script>
+    <script src="https://cdn.tailwindcss.com"></script>
+</head>
+<body>
+    <div id="root"></div>
+    <script type="text/babel" src="App.jsx"></script>
+</body>
+</html>'''
+
+def _save_output(code: Optional[str], framework: str, desc: str, output_dir: str, raw_output: str = "") -> None:
+    """Write generated code to App.jsx or index.html, plus the React HTML shell
+    
+    Pass code=None when the page was already streamed to disk. HTML that fails
+    validation is still written, with the raw Claude output kept in debug_output.txt.
+    """
+    if code is not None:
+        if framework == 'react':
+            entry_file = 'App.jsx'
+        else:
+            entry_file = 'index.html'
+            # Final validation before writing HTML
+            if not validate_html_output(code):
+                console.print("[red]⚠️  Warning: Generated HTML may contain errors[/red]")
+                # Save the raw output for debugging
+                with open(os.path.join(output_dir, 'debug_output.txt'), 'w') as f:
+                    f.write(raw_output or code)
+                console.print(f"[yellow]Debug output saved to: {output_dir}/debug_output.txt[/yellow]")
+        
+        with open(os.path.join(output_dir, entry_file), 'w') as f:
+            f.write(code)
+    
+    if framework == 'react':
+        # Create minimal index.html shell; the description is user text, so escape it
+        with open(os.path.join(output_dir, 'index.html'), 'w') as f:
+            f.write(REACT_HTML_SHELL.format(title=html.escape(desc)))
+
 @app.command()
 def gen(
     desc: Optional[str] = typer.Option(None, "--desc", "-d", help="Product description"),
@@ -1599,7 +1434,9 @@ def gen(
     theme: Optional[str] = typer.Option(None, "--theme", "-t", help=f"Design theme ({'/'.join(get_theme_choices())})"),
     no_design_thinking: bool = typer.Option(False, "--no-design-thinking", help="Skip design thinking process"),
     include_forms: bool = typer.Option(False, "--include-forms", help="Include contact forms in the landing page"),
-    output_dir: Optional[str] = typer.Option(None, "--output", "-o", help="Output directory")
+    output_dir: Optional[str] = typer.Option(None, "--output", "-o", help="Output directory"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Don't read or write cached Claude responses"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore cached Claude responses and store fresh ones")
 ):
     """Generate a conversion-optimized landing page
     
@@ -1710,6 +1547,7 @@ def gen(
         desc = summarize_long_description(desc)
     
     # Override config with CLI arguments
+    use_cache = not no_cache
     framework = framework or config.get('framework', 'html')
     theme = theme or config.get('theme', 'minimal')
     output_dir = output_dir or get_next_available_output_dir()
@@ -1744,44 +1582,21 @@ def gen(
                 # Use the first URL for simple mode
                 url = urls[0]
                 console.print(f"[bold blue]📸 Capturing reference screenshot from {url}...[/bold blue]")
+                # Playwright is only imported when a screenshot is actually needed
+                from .scrape_simple import capture
                 _, screenshot_path = capture(url, output_dir)
             except Exception as e:
                 console.print(f"[yellow]⚠️  Failed to capture screenshot: {e}[/yellow]")
         
-        # Generate directly
+        # Generate directly, streaming the page straight to disk
         prompt = landing_prompt(desc, framework, theme, sections, include_forms=include_forms)
-        output, stats = run_claude_with_progress(prompt, "Generating landing page...")
+        output_file = 'App.jsx' if framework == 'react' else 'index.html'
+        stats = run_claude_to_file(prompt, os.path.join(output_dir, output_file), "Generating landing page...",
+                                   use_cache=use_cache, refresh_cache=refresh,
+                                   validate=None if framework == 'react' else validate_html_output)
         
-        # Save output
-        if framework == 'react':
-            # Save React component
-            with open(os.path.join(output_dir, 'App.jsx'), 'w') as f:
-                f.write(strip_code_blocks(output))
-            
-            # Create minimal index.html shell
-            html_shell = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{desc}</title>
-    <script src="https://unpkg.com/react@18/umd/react.development.js"></script>
-    <script src="https://unpkg.com/react-dom@18/umd/react-dom.development.js"></script>
-    <script src="https://unpkg.com/@babel/standalone/babel.min.js"></script>
-    <script src="https://cdn.tailwindcss.com"></script>
-</head>
-<body>
-    <div id="root"></div>
-    <script type="text/babel" src="App.jsx"></script>
-</body>
-</html>'''
-            
-            with open(os.path.join(output_dir, 'index.html'), 'w') as f:
-                f.write(html_shell)
-        else:
-            # Save HTML
-            with open(os.path.join(output_dir, 'index.html'), 'w') as f:
-                f.write(strip_code_blocks(output))
+        # Save output (the page itself was streamed to disk above)
+        _save_output(None, framework, desc, output_dir)
         
         # Save minimal design analysis for cost tracking
         fast_analysis = {
@@ -1799,8 +1614,7 @@ def gen(
         }
         
         try:
-            with open(os.path.join(output_dir, 'design_analysis.json'), 'w') as f:
-                json.dump(fast_analysis, f, indent=2)
+            save_json_file(os.path.join(output_dir, 'design_analysis.json'), fast_analysis)
         except Exception as e:
             console.print(f"[yellow]⚠️  Could not save cost tracking data: {e}[/yellow]")
 
@@ -1816,198 +1630,200 @@ def gen(
         console.print("\n[bold green]🧠 Running comprehensive design thinking process...[/bold green]")
         
         try:
-            # Phase 1: Reference Discovery
-            console.print("\n[bold]Phase 1: Reference Discovery[/bold]")
-            prompt = reference_discovery_prompt(desc)
-            refs_output, _ = run_claude_with_progress(prompt, "Discovering competitor references...")
-            
-            # Parse reference URLs
-            ref_urls = []
-            for line in refs_output.split('\n'):
-                if '–' in line and 'http' in line:
-                    try:
-                        url_part = line.split('–')[1].strip()
-                        if url_part.startswith('http'):
-                            ref_urls.append(url_part.split()[0])
-                    except:
-                        continue
-            
-            # Add user-provided URLs if available
-            if urls:
-                # Insert user URLs at the beginning, maintaining order
-                for i, user_url in enumerate(reversed(urls)):
-                    ref_urls.insert(0, user_url)
+            # Phases form a dependency graph: each starts as soon as the phases it
+            # reads from have finished, so independent work runs concurrently.
+            # Concurrent calls would each be charged for the others' tokens, so
+            # usage is measured once around the whole graph instead of per phase.
+            def run_design_phase(prompt, description, refresh_cache=refresh, stream=False, validate=is_json_output):
+                # Only the implementation phase streams; the JSON phases are parsed once complete
+                runner = run_claude_with_progress if stream else run_claude_simple
+                return runner(prompt, description, progress=progress, use_cache=use_cache,
+                              refresh_cache=refresh_cache, track_usage=False, validate=validate)
             
-            # Limit to 3 references for performance
-            ref_urls = ref_urls[:3]
-            
-            # 🔍 Debug / confirmation log
-            if ref_urls:
-                console.print("\n[bold]Discovered Reference URLs:[/bold]")
-                for i, u in enumerate(ref_urls, 1):
-                    console.print(f"  {i}. {u}", style="cyan")
-
+            def discover_references(results):
+                # Phase 1: Reference Discovery
+                console.print("\n[bold]Phase 1: Reference Discovery[/bold]")
+                prompt = reference_discovery_prompt(desc)
+                refs_output, _ = run_design_phase(prompt, "Discovering competitor references...", validate=None)
+                
+                discovered_urls = extract_reference_urls(refs_output)
+                
+                # User-provided URLs go first; limit to 3 references for performance
+                ref_urls = list(dict.fromkeys([*(urls or []), *discovered_urls]))[:3]
+                
+                # 🔍 Debug / confirmation log
+                if ref_urls:
+                    console.print("\n[bold]Discovered Reference URLs:[/bold]")
+                    for i, u in enumerate(ref_urls, 1):
+                        console.print(f"  {i}. {u}", style="cyan")
+                return ref_urls
             
-            if not ref_urls:
-                console.print("[yellow]⚠️  No reference URLs found. Continuing without screenshots.[/yellow]")
-                screenshot_refs = []
-            else:
+            def capture_screenshots(results):
+                ref_urls = results['references']
+                if not ref_urls:
+                    console.print("[yellow]⚠️  No reference URLs found. Continuing without screenshots.[/yellow]")
+                    return []
+                
                 # Phase 2: Screenshot Capture
                 console.print(f"\n[bold]Phase 2: Capturing {len(ref_urls)} reference screenshots[/bold]")
-                screenshot_results = capture_multiple_references(ref_urls, output_dir)
-                screenshot_refs = [(url, screenshot_path) for url, _, screenshot_path in screenshot_results]
+                from .scrape import capture_multiple_references
+                screenshot_results = capture_multiple_references(ref_urls, output_dir, progress=progress)
+                return [(url, screenshot_path) for url, _, screenshot_path in screenshot_results]
             
-            # Phase 3: Product Analysis
-            console.print("\n[bold]Phase 3: Product Analysis[/bold]")
-            prompt = deep_product_understanding_prompt(desc)
-            product_output, _ = run_claude_with_progress(prompt, "Analyzing product positioning...")
-            product_understanding = safe_json_parse(product_output)
+            def analyze_product(results):
+                # Phase 3: Product Analysis
+                console.print("\n[bold]Phase 3: Product Analysis[/bold]")
+                prompt = deep_product_understanding_prompt(desc)
+                product_output, _ = run_design_phase(prompt, "Analyzing product positioning...")
+                return safe_json_parse(product_output)
             
-            # Phase 4: UX Research
-            ux_analysis = {}
-            if screenshot_refs:
+            def research_ux(results):
+                # Phase 4: UX Research
+                screenshot_refs = results['screenshots']
+                if not screenshot_refs:
+                    return {}
                 console.print("\n[bold]Phase 4: UX Research[/bold]")
-                screenshot_paths = [screenshot_path for url, screenshot_path in screenshot_refs]
-                prompt = ux_analysis_prompt(desc, screenshot_paths)
-                ux_output, _ = run_claude_with_progress(prompt, "Analyzing competitor UX patterns...")
-                ux_analysis = safe_json_parse(ux_output)
+                screenshot_names = [os.path.basename(screenshot_path) for url, screenshot_path in screenshot_refs]
+                prompt = ux_analysis_prompt(desc, screenshot_names)
+                ux_output, _ = run_design_phase(prompt, "Analyzing competitor UX patterns...")
+                return safe_json_parse(ux_output)
             
-            # Phase 5: Empathy & User Research
-            console.print("\n[bold]Phase 5: User Empathy Mapping[/bold]")
-            prompt = empathize_prompt(desc, product_understanding, ux_analysis)
-            empathy_output, _ = run_claude_with_progress(prompt, "Mapping user empathy...")
-            user_research = safe_json_parse(empathy_output)
+            def map_empathy(results):
+                # Phase 5: Empathy & User Research
+                console.print("\n[bold]Phase 5: User Empathy Mapping[/bold]")
+                prompt = empathize_prompt(desc, results['product_understanding'], results['ux_analysis'])
+                empathy_output, _ = run_design_phase(prompt, "Mapping user empathy...")
+                return safe_json_parse(empathy_output)
             
-            # Phase 6: Define Site Flow
-            console.print("\n[bold]Phase 6: Defining Site Flow[/bold]")
-            prompt = define_prompt(desc, user_research)
-            define_output, _ = run_claude_with_progress(prompt, "Defining site architecture...")
-            site_flow = safe_json_parse(define_output)
+            def define_site_flow(results):
+                # Phase 6: Define Site Flow
+                console.print("\n[bold]Phase 6: Defining Site Flow[/bold]")
+                prompt = define_prompt(desc, results['user_research'])
+                define_output, _ = run_design_phase(prompt, "Defining site architecture...")
+                return safe_json_parse(define_output)
             
-            # Phase 7: Content Strategy
-            console.print("\n[bold]Phase 7: Content Strategy[/bold]")
-            prompt = ideate_prompt(desc, user_research, site_flow)
-            strategy_output, _ = run_claude_with_progress(prompt, "Developing content strategy...")
-            content_strategy = safe_json_parse(strategy_output)
+            def develop_content_strategy(results):
+                # Phase 7: Content Strategy
+                console.print("\n[bold]Phase 7: Content Strategy[/bold]")
+                prompt = ideate_prompt(desc, results['user_research'], results['site_flow'])
+                strategy_output, _ = run_design_phase(prompt, "Developing content strategy...")
+                return safe_json_parse(strategy_output)
             
-            # Phase 8: Wireframes (depends on content strategy)
-            console.print("\n[bold]Phase 8: Wireframes[/bold]")
-            wireframe_prompt_call = wireframe_prompt(desc, content_strategy, site_flow)
-            wireframe_output, _ = run_claude_with_progress(wireframe_prompt_call, "Creating wireframes...")
-            wireframes = safe_json_parse(wireframe_output)
+            def create_wireframes(results):
+                # Phase 8: Wireframes (depends on content strategy)
+                console.print("\n[bold]Phase 8: Wireframes[/bold]")
+                wireframe_prompt_call = wireframe_prompt(desc, results['content_strategy'], results['site_flow'])
+                wireframe_output, _ = run_design_phase(wireframe_prompt_call, "Creating wireframes...")
+                return safe_json_parse(wireframe_output)
             
-            # Phase 9: Design System
-            console.print("\n[bold]Phase 9: Design System[/bold]")
-            design_prompt_call = design_system_prompt(desc, wireframes, content_strategy, theme)
-            design_output, _ = run_claude_with_progress(design_prompt_call, "Building design system...")
-            design_system = safe_json_parse(design_output)
+            def build_design_system(results):
+                # Phase 9: Design System
+                console.print("\n[bold]Phase 9: Design System[/bold]")
+                design_prompt_call = design_system_prompt(desc, results['wireframes'], results['content_strategy'], theme)
+                design_output, _ = run_design_phase(design_prompt_call, "Building design system...")
+                return safe_json_parse(design_output)
             
-            # Phase 10: Hi-Fi Design
-            console.print("\n[bold]Phase 10: Hi-Fi Design[/bold]")
-            prompt = high_fidelity_design_prompt(desc, design_system, wireframes, content_strategy)
-            hifi_output, _ = run_claude_with_progress(prompt, "Creating high-fidelity design...")
-            hifi_design = safe_json_parse(hifi_output)
+            def create_hifi_design(results):
+                # Phase 10: Hi-Fi Design
+                console.print("\n[bold]Phase 10: Hi-Fi Design[/bold]")
+                prompt = high_fidelity_design_prompt(desc, results['design_system'], results['wireframes'], results['content_strategy'])
+                hifi_output, _ = run_design_phase(prompt, "Creating high-fidelity design...")
+                return safe_json_parse(hifi_output)
             
-            # Phase 11: Copy Generation
-            console.print("\n[bold]Phase 11: Copy Generation[/bold]")
-            prompt = prototype_prompt(desc, content_strategy, design_system, wireframes)
-            copy_output, _ = run_claude_with_progress(prompt, "Generating final copy...")
-            final_copy = safe_json_parse(copy_output)
+            def generate_copy(results):
+                # Phase 11: Copy Generation
+                console.print("\n[bold]Phase 11: Copy Generation[/bold]")
+                prompt = prototype_prompt(desc, results['content_strategy'], results['design_system'], results['wireframes'])
+                copy_output, _ = run_design_phase(prompt, "Generating final copy...")
+                return safe_json_parse(copy_output)
             
-            # Phase 12: Implementation
-            console.print("\n[bold]Phase 12: Code Implementation[/bold]")
-            screenshot_path = screenshot_refs[0][1] if screenshot_refs else None
-            design_data = {
-                'design_system': design_system,
-                'ux_analysis': ux_analysis,
-                'wireframes': wireframes,
-                'content_strategy': content_strategy
-            }
-            # Implementation with error detection and retry
-            max_attempts = 2
-            code_output = None
+            # Rejected pages are retried and kept out of the response cache
+            def is_page_output(output):
+                return framework == 'react' or validate_html_output(strip_code_blocks(output))
             
-            for attempt in range(max_attempts):
-                try:
-                    attempt_desc = "Implementing landing page..." if attempt == 0 else f"Regenerating landing page (attempt {attempt + 1})..."
-                    prompt = implementation_prompt(desc, final_copy, framework, theme, design_data, include_forms=include_forms)
-                    code_output, _ = run_claude_with_progress(prompt, attempt_desc)
-                    
-                    # Validate the output
-                    cleaned_output = strip_code_blocks(code_output)
-                    if validate_html_output(cleaned_output) or framework == 'react':
-                        break
-                    else:
+            def implement_code(results):
+                # Phase 12: Implementation
+                console.print("\n[bold]Phase 12: Code Implementation[/bold]")
+                design_data = {
+                    'design_system': results['design_system'],
+                    'ux_analysis': results['ux_analysis'],
+                    'wireframes': results['wireframes'],
+                    'content_strategy': results['content_strategy']
+                }
+                # Implementation with error detection and retry
+                max_attempts = 2
+                code_output = None
+                
+                for attempt in range(max_attempts):
+                    try:
+                        attempt_desc = "Implementing landing page..." if attempt == 0 else f"Regenerating landing page (attempt {attempt + 1})..."
+                        prompt = implementation_prompt(desc, results['final_copy'], framework, theme, design_data, include_forms=include_forms)
+                        # Retries must bypass the cache, which holds the rejected output
+                        code_output, _ = run_design_phase(prompt, attempt_desc, refresh_cache=refresh or attempt > 0,
+                                                          stream=True, validate=is_page_output)
+                        
+                        # Validate the output
+                        cleaned_output = strip_code_blocks(code_output)
+                        if validate_html_output(cleaned_output) or framework == 'react':
+                            break
+                        else:
+                            if attempt < max_attempts - 1:
+                                console.print("[yellow]⚠️  Generated output appears to be an error message. Retrying...[/yellow]")
+                                continue
+                            else:
+                                console.print("[red]❌ Failed to generate valid output after multiple attempts[/red]")
+                                
+                    except Exception as e:
                         if attempt < max_attempts - 1:
-                            console.print("[yellow]⚠️  Generated output appears to be an error message. Retrying...[/yellow]")
+                            console.print(f"[yellow]⚠️  Implementation failed: {e}. Retrying...[/yellow]")
                             continue
                         else:
-                            console.print("[red]❌ Failed to generate valid output after multiple attempts[/red]")
-                            
-                except Exception as e:
-                    if attempt < max_attempts - 1:
-                        console.print(f"[yellow]⚠️  Implementation failed: {e}. Retrying...[/yellow]")
-                        continue
-                    else:
-                        raise e
+                            raise e
+                return code_output
+            
+            design_phases = {
+                'references': (discover_references, []),
+                'screenshots': (capture_screenshots, ['references']),
+                'product_understanding': (analyze_product, []),
+                'ux_analysis': (research_ux, ['screenshots']),
+                'user_research': (map_empathy, ['product_understanding', 'ux_analysis']),
+                'site_flow': (define_site_flow, ['user_research']),
+                'content_strategy': (develop_content_strategy, ['user_research', 'site_flow']),
+                'wireframes': (create_wireframes, ['content_strategy', 'site_flow']),
+                'design_system': (build_design_system, ['wireframes', 'content_strategy']),
+                'hifi_design': (create_hifi_design, ['design_system', 'wireframes', 'content_strategy']),
+                'final_copy': (generate_copy, ['content_strategy', 'design_system', 'wireframes']),
+                'code_output': (implement_code, ['final_copy', 'design_system', 'ux_analysis', 'wireframes', 'content_strategy']),
+            }
+            
+            pre_usage = get_latest_usage()
+            with create_claude_progress(console) as progress:
+                results = run_phase_graph(design_phases)
+            stats = calculate_usage_difference(pre_usage, get_latest_usage())
+            code_output = results['code_output']
             
             # Save all outputs
             analysis_data = {
-                'product_understanding': product_understanding,
-                'ux_analysis': ux_analysis,
-                'user_research': user_research,
-                'site_flow': site_flow,
-                'content_strategy': content_strategy,
-                'wireframes': wireframes,
-                'design_system': design_system,
-                'hifi_design': hifi_design,
-                'final_copy': final_copy
+                key: results[key] for key in [
+                    'product_understanding', 'ux_analysis', 'user_research', 'site_flow',
+                    'content_strategy', 'wireframes', 'design_system', 'hifi_design', 'final_copy'
+                ]
+            }
+            analysis_data['total_usage'] = {
+                'input_tokens': stats.get('input_tokens', 0),
+                'output_tokens': stats.get('output_tokens', 0),
+                'cost': stats.get('cost', 0.0)
             }
             
-            with open(os.path.join(output_dir, 'design_analysis.json'), 'w') as f:
-                json.dump(analysis_data, f, indent=2)
+            save_json_file(os.path.join(output_dir, 'design_analysis.json'), analysis_data)
             
             # Save code output with final validation
-            cleaned_code = strip_code_blocks(code_output)
-            
-            if framework == 'react':
-                with open(os.path.join(output_dir, 'App.jsx'), 'w') as f:
-                    f.write(cleaned_code)
-                
-                html_shell = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{desc}</title>
-    <script src="https://unpkg.com/react@18/umd/react.development.js"></script>
-    <script src="https://unpkg.com/react-dom@18/umd/react-dom.development.js"></script>
-    <script src="https://unpkg.com/@babel/standalone/babel.min.js"></script>
-    <script src="https://cdn.tailwindcss.com"></script>
-</head>
-<body>
-    <div id="root"></div>
-    <script type="text/babel" src="App.jsx"></script>
-</body>
-</html>'''
-                
-                with open(os.path.join(output_dir, 'index.html'), 'w') as f:
-                    f.write(html_shell)
-            else:
-                # Final validation before writing HTML
-                if not validate_html_output(cleaned_code):
-                    console.print("[red]⚠️  Warning: Generated HTML may contain errors[/red]")
-                    # Save the raw output for debugging
-                    with open(os.path.join(output_dir, 'debug_output.txt'), 'w') as f:
-                        f.write(code_output)
-                    console.print(f"[yellow]Debug output saved to: {output_dir}/debug_output.txt[/yellow]")
-                
-                with open(os.path.join(output_dir, 'index.html'), 'w') as f:
-                    f.write(cleaned_code)
+            _save_output(strip_code_blocks(code_output), framework, desc, output_dir, raw_output=code_output)
             
             console.print(f"\n[bold green]✅ Comprehensive landing page generated successfully![/bold green]")
             console.print(f"📁 Output saved to: [bold]{output_dir}[/bold]")
             console.print(f"📊 Design analysis saved to: [bold]{output_dir}/design_analysis.json[/bold]")
+            print_usage_statistics(stats)
             
         except Exception as e:
             console.print(f"[red]❌ Error during design thinking process: {e}[/red]")
@@ -2328,8 +2144,7 @@ def editgen(
                 }
                 analysis_data['edit_history'].append(edit_entry)
                 
-                with open(analysis_file, 'w') as f:
-                    json.dump(analysis_data, f, indent=2)
+                save_json_file(analysis_file, analysis_data)
                     
                 console.print(f"[cyan]📊 Updated design analysis with edit history[/cyan]")
         except Exception as e:
@@ -2514,8 +2329,7 @@ def theme(
         analysis_data['theme_history'].append(theme_record)
         
         # Save updated analysis
-        with open(analysis_file, 'w') as f:
-            json.dump(analysis_data, f, indent=2)
+        save_json_file(analysis_file, analysis_data)
         
         console.print(f"[bold green]✅ Successfully changed theme to {new_theme}![/bold green]")
         console.print(f"📁 Updated file: [bold]{target_file}[/bold]")
@@ -2731,8 +2545,7 @@ def form(
                 
                 analysis_data['form_history'].append(form_operation)
                 
-                with open(design_analysis_file, 'w') as f:
-                    json.dump(analysis_data, f, indent=2)
+                save_json_file(design_analysis_file, analysis_data)
                     
                 console.print("[cyan]📊 Form operation tracked in design analysis[/cyan]")
                 
@@ -7,6 +7,7 @@ Modular core system providing reusable utilities organized by function:
 - configuration: YAML config management
 - project_management: Project discovery and selection
 - claude_integration: Claude API integration with progress
+- response_cache: On-disk cache of Claude responses
 - content_processing: HTML validation and content processing
 - form_handling: Interactive form generation and management
 - section_management: Section replacement with semantic ordering
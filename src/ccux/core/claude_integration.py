@@ -5,107 +5,513 @@ Provides Claude API integration with progress indicators and error handling.
 Manages subprocess execution with timeout protection and usage tracking.
 """
 
+import os
+import re
+import shutil
+import selectors
 import subprocess
+import tempfile
 import threading
-from typing import Dict, Any, Tuple
+import time
+from collections import Counter
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 from rich.console import Console
 
-from .usage_tracking import get_latest_usage, calculate_usage_difference
-from .signal_handling import set_current_subprocess, set_current_progress, clear_current_subprocess, clear_current_progress
+from .usage_tracking import get_latest_usage, calculate_usage_difference, aggregate_usage_stats
+from .signal_handling import (
+    set_current_subprocess, set_current_progress, clear_current_subprocess, clear_current_progress,
+    terminate_active_subprocesses
+)
 from .configuration import Config
+from .content_processing import strip_code_blocks
+from .response_cache import cache_get, cache_put
 
+# Maximum runtime for a single Claude CLI call, in seconds
+CLAUDE_TIMEOUT = 300
 
-def run_claude_with_progress(prompt: str, description: str = "Claude Code is thinking...") -> Tuple[str, Dict[str, Any]]:
-    """Run Claude CLI with real-time progress indication and usage tracking via ccusage"""
-    console = Console()
+# Bytes read from a pipe per readiness event
+READ_CHUNK_SIZE = 65536
+
+# Trailing bytes of stderr read back for error messages
+STDERR_TAIL_BYTES = 8192
+
+# Header line that starts each task's answer in a batched prompt
+BATCH_TASK_HEADER = "===== TASK: {label} ====="
+_BATCH_TASK_HEADER_PATTERN = re.compile(r'^===== TASK: (\w+) =====[ \t]*$', re.MULTILINE)
+
+# Worker threads of run_phase_graph() see their graph's abort event here
+_phase_state = threading.local()
+
+
+class _ClaudeProgress(Progress):
+    """Progress display that is registered for interrupt cleanup while it is live"""
+    
+    def __enter__(self) -> "_ClaudeProgress":
+        super().__enter__()
+        set_current_progress(self)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        clear_current_progress()
+        super().__exit__(*exc_info)
+
+
+def create_claude_progress(console: Optional[Console] = None) -> Progress:
+    """Create a progress display that can show several Claude calls at once
+    
+    Entering it registers it with the signal handler, so Ctrl+C stops it.
+    """
+    return _ClaudeProgress(
+        SpinnerColumn(),
+        TextColumn("[bold blue]{task.description}"),
+        TimeElapsedColumn(),
+        console=console or Console(),
+        transient=False
+    )
+
+
+def run_claude_with_progress(prompt: str, description: str = "Claude Code is thinking...",
+                             progress: Optional[Progress] = None, use_cache: bool = False,
+                             refresh_cache: bool = False, track_usage: bool = True,
+                             validate: Optional[Callable[[str], bool]] = None) -> Tuple[str, Dict[str, Any]]:
+    """Run Claude CLI with real-time progress indication and usage tracking via ccusage
+    
+    Pass an existing ``progress`` display to show the call as one task on it;
+    this is safe to do from worker threads running several calls concurrently.
+    With ``use_cache`` an identical earlier prompt is answered from the on-disk
+    response cache (with empty usage stats, as it costs nothing); ``refresh_cache``
+    skips the lookup but still stores the fresh response. Empty responses, and
+    responses rejected by ``validate``, are never stored, so a truncated or
+    malformed answer is not replayed on the next run.
+    
+    Usage is measured as the change in ccusage's daily totals across the call,
+    which also counts any other call running at the same time. Concurrent
+    callers should pass ``track_usage=False`` (empty usage stats are returned)
+    and measure usage once around the whole batch instead.
+    """
+    return _run_claude_for_text(prompt, description, progress, use_cache, refresh_cache,
+                                track_usage, validate, stream=True)
+
+
+def run_claude_simple(prompt: str, description: str = "Claude Code is thinking...",
+                      progress: Optional[Progress] = None, use_cache: bool = False,
+                      refresh_cache: bool = False, track_usage: bool = True,
+                      validate: Optional[Callable[[str], bool]] = None) -> Tuple[str, Dict[str, Any]]:
+    """Run Claude CLI for output that is only needed once the call completes
+    
+    Collects output with a single communicate() call instead of draining the
+    pipes as it arrives, so the spinner shows elapsed time but not live output.
+    Takes the same options as run_claude_with_progress().
+    """
+    return _run_claude_for_text(prompt, description, progress, use_cache, refresh_cache,
+                                track_usage, validate, stream=False)
+
+
+def _run_claude_for_text(prompt: str, description: str, progress: Optional[Progress],
+                         use_cache: bool, refresh_cache: bool, track_usage: bool,
+                         validate: Optional[Callable[[str], bool]],
+                         stream: bool) -> Tuple[str, Dict[str, Any]]:
+    """Run a Claude CLI call through the response cache and return its text output"""
+    claude_cmd = Config().get_claude_command()
+    if use_cache and not refresh_cache:
+        cached = cache_get(prompt, claude_cmd)
+        if cached is not None:
+            _show_cached_response(description, progress)
+            return cached[0], {}
+    
+    output = bytearray()
+    usage_stats = _run_claude(prompt, description, progress, output.extend, track_usage, stream=stream)
+    output_text = output.decode('utf-8', errors='replace').strip()
+    
+    if use_cache and _is_cacheable(output_text, validate):
+        cache_put(prompt, claude_cmd, output_text, usage_stats)
+    return output_text, usage_stats
+
+
+def build_batch_prompt(prompts: Dict[str, str]) -> str:
+    """Combine independent labelled prompts into one prompt with delimited answers"""
+    parts = [
+        f"You will complete {len(prompts)} independent tasks. Complete every task fully and in order.",
+        "Begin the answer to each task with a line containing exactly the task's header line shown below,",
+        "and write nothing outside those answers. Follow each task's own output format instructions.",
+    ]
+    for label, prompt in prompts.items():
+        parts.append(f"\n{BATCH_TASK_HEADER.format(label=label)}\n{prompt}")
+    return '\n'.join(parts)
+
+
+def split_batch_output(output: str) -> Dict[str, str]:
+    """Split a batched Claude answer into per-label outputs
+    
+    A label whose header appears more than once is left out, since it is
+    unclear which of its sections answers the task.
+    """
+    matches = list(_BATCH_TASK_HEADER_PATTERN.finditer(output))
+    counts = Counter(match.group(1) for match in matches)
+    results = {}
+    for i, match in enumerate(matches):
+        if counts[match.group(1)] == 1:
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(output)
+            results[match.group(1)] = output[match.end():end].strip()
+    return results
+
+
+def _describe_batch_problems(labels: List[str], output: str, outputs: Dict[str, str],
+                             validators: Dict[str, Callable[[str], bool]]) -> str:
+    """Explain how a batched answer's sections differ from the expected labels"""
+    found = _BATCH_TASK_HEADER_PATTERN.findall(output)
+    counts = Counter(found)
+    problems = []
+    for label in labels:
+        if counts[label] == 0:
+            problems.append(f"'{label}' missing")
+        elif counts[label] > 1:
+            problems.append(f"'{label}' repeated")
+        elif not outputs.get(label):
+            problems.append(f"'{label}' empty")
+        elif not _is_cacheable(outputs[label], validators.get(label)):
+            problems.append(f"'{label}' invalid")
+    unexpected = sorted(set(found) - set(labels))
+    if unexpected:
+        problems.append(f"unexpected {', '.join(unexpected)}")
+    if not problems and found != labels:
+        problems.append("sections out of order")
+    return '; '.join(problems)
+
+
+def run_claude_batch(prompts: Dict[str, str], description: str = "Claude Code is thinking...",
+                     progress: Optional[Progress] = None, use_cache: bool = False,
+                     refresh_cache: bool = False,
+                     validators: Optional[Dict[str, Callable[[str], bool]]] = None
+                     ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Answer several independent prompts with a single Claude CLI invocation
+    
+    Saves the CLI start-up cost of one process per prompt. The combined answer
+    must contain each task's header exactly once; any task whose section is
+    missing, repeated, empty or rejected by its entry in ``validators`` is
+    re-run on its own, with a warning, since every fallback adds a full Claude
+    call. The combined answer is only cached when every section is usable.
+    Returns the outputs keyed by label together with the usage stats of all
+    calls made.
+    """
+    validators = validators or {}
+    if len(prompts) == 1:
+        (label, prompt), = prompts.items()
+        output, usage_stats = run_claude_simple(prompt, description, progress, use_cache, refresh_cache,
+                                                validate=validators.get(label))
+        return {label: output}, usage_stats
+    
+    def is_usable_batch(batch_output: str) -> bool:
+        return not _describe_batch_problems(list(prompts), batch_output, split_batch_output(batch_output),
+                                            validators)
+    
+    batch_output, usage_stats = run_claude_simple(
+        build_batch_prompt(prompts), description, progress, use_cache, refresh_cache,
+        validate=is_usable_batch
+    )
+    outputs = split_batch_output(batch_output)
+    
+    problems = _describe_batch_problems(list(prompts), batch_output, outputs, validators)
+    retry_labels = [label for label in prompts
+                    if not _is_cacheable(outputs.get(label, ''), validators.get(label))]
+    if problems:
+        console = progress.console if progress is not None else Console()
+        action = f"re-running {', '.join(retry_labels)} separately" if retry_labels else "using it as answered"
+        console.print(f"[yellow]⚠️  Batched answer did not match its tasks ({problems}); {action}[/yellow]")
+    
+    stats_list = [usage_stats]
+    for label in retry_labels:
+        outputs[label], retry_stats = run_claude_simple(prompts[label], description, progress, use_cache,
+                                                        refresh_cache, validate=validators.get(label))
+        stats_list.append(retry_stats)
+    
+    if len(stats_list) > 1:
+        usage_stats = aggregate_usage_stats(stats_list)
+    return {label: outputs[label] for label in prompts}, usage_stats
+
+
+def run_claude_to_file(prompt: str, out_path: str, description: str = "Claude Code is thinking...",
+                       progress: Optional[Progress] = None, use_cache: bool = False,
+                       refresh_cache: bool = False, track_usage: bool = True,
+                       validate: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+    """Run Claude CLI and stream its output straight into ``out_path``
+    
+    Output bytes are written as they arrive, so the page is not accumulated in
+    memory while Claude is generating it. They go to a temporary file next to
+    ``out_path``; once the call completes it is passed through
+    strip_code_blocks(), leaving exactly what the buffered runners' callers
+    save, and only then moved onto ``out_path``. A failed call leaves
+    ``out_path`` untouched. Returns usage stats.
+    Caching and usage tracking work as in run_claude_with_progress().
+    """
+    claude_cmd = Config().get_claude_command()
+    if use_cache and not refresh_cache:
+        cached = cache_get(prompt, claude_cmd)
+        if cached is not None:
+            _show_cached_response(description, progress)
+            with open(out_path, 'w', encoding='utf-8') as out_file:
+                out_file.write(cached[0])
+            return {}
+    
+    # Stream into a temporary file so a failed or interrupted call never leaves a partial page behind
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(out_path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out_file:
+            usage_stats = _run_claude(prompt, description, progress, out_file.write, track_usage)
+        
+        with open(tmp_path, 'r', encoding='utf-8', errors='replace', newline='') as out_file:
+            page = strip_code_blocks(out_file.read())
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as out_file:
+            out_file.write(page)
+        # mkstemp creates owner-only files; give the page the usual permissions
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    
+    if use_cache and _is_cacheable(page, validate):
+        cache_put(prompt, claude_cmd, page, usage_stats)
+    return usage_stats
+
+
+def _is_cacheable(output: str, validate: Optional[Callable[[str], bool]]) -> bool:
+    """Whether a response is worth storing in the response cache"""
+    return bool(output) and (validate is None or validate(output))
+
+
+def _show_cached_response(description: str, progress: Optional[Progress]) -> None:
+    """Report a call answered from the response cache"""
+    if progress is not None:
+        progress.add_task(f"{description} (cached)", total=1, completed=1)
+    else:
+        Console().print(f"[dim]♻️  {description} (cached response)[/dim]")
+
+
+def _run_claude(prompt: str, description: str, progress: Optional[Progress],
+                stdout_write: Callable[[bytes], Any], track_usage: bool = True,
+                stream: bool = True) -> Dict[str, Any]:
+    """Run a Claude CLI call on the given progress display, or on a new one"""
+    if progress is not None:
+        return _run_claude_task(prompt, description, progress, stdout_write, track_usage, stream)
+    
+    with create_claude_progress() as own_progress:
+        return _run_claude_task(prompt, description, own_progress, stdout_write, track_usage, stream)
+
+
+def _run_claude_task(prompt: str, description: str, progress: Progress,
+                     stdout_write: Callable[[bytes], Any], track_usage: bool = True,
+                     stream: bool = True) -> Dict[str, Any]:
+    """Run a single Claude CLI call as a task on the given progress display
+    
+    With ``stream`` stdout is passed to ``stdout_write`` as it arrives;
+    otherwise it is collected by communicate() and passed on once at the end.
+    Stderr goes to an anonymous temporary file rather than a second pipe, so
+    only stdout needs draining; it is read back only if the call fails.
+    """
     config = Config()
     claude_cmd = config.get_claude_command()
     
     # Get usage before Claude call for comparison
-    pre_usage = get_latest_usage()
+    pre_usage = get_latest_usage() if track_usage else {}
     
     # Prepare Claude command
-    cmd = [claude_cmd, '--print', prompt]
+    cmd = [_resolve_executable(claude_cmd), '--print', prompt]
     
-    output_lines = []
-    stderr_lines = []
+    if _phase_aborted():
+        raise Exception("Claude Code call cancelled after another phase failed")
     
-    def read_stream(stream, lines_list):
-        """Read from stream and collect output"""
-        try:
-            for line in iter(stream.readline, ''):
-                if line:
-                    lines_list.append(line.strip())
-        except:
-            pass
+    task = progress.add_task(description, total=None)
     
-    with Progress(
-        SpinnerColumn(),
-        TextColumn(f"[bold blue]{description}"),
-        TimeElapsedColumn(),
-        console=console,
-        transient=False
-    ) as progress:
-        set_current_progress(progress)
-        task = progress.add_task("Processing", total=None)
-        
-        try:
+    try:
+        with tempfile.TemporaryFile() as stderr_file:
             # Start Claude process
             current_subprocess = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                stderr=stderr_file,
+                # Binary pipe sized to match our reads, so read1() on the threaded
+                # path returns whole chunks instead of 8 KiB slices
+                bufsize=READ_CHUNK_SIZE,
+                # Python's own descriptors are non-inheritable, so there is nothing to
+                # sweep; leaving close_fds off lets POSIX use posix_spawn() over fork()
+                close_fds=os.name == 'nt'
             )
             set_current_subprocess(current_subprocess)
             
-            # Start threads to read stdout and stderr
-            stdout_thread = threading.Thread(
-                target=read_stream, 
-                args=(current_subprocess.stdout, output_lines)
-            )
-            stderr_thread = threading.Thread(
-                target=read_stream, 
-                args=(current_subprocess.stderr, stderr_lines)
-            )
-            
-            stdout_thread.start()
-            stderr_thread.start()
+            # A sibling phase may have failed while this process was starting
+            if _phase_aborted():
+                current_subprocess.kill()
+                current_subprocess.wait()
+                raise Exception("Claude Code call cancelled after another phase failed")
             
-            # Wait for process with timeout (5 minutes)
+            # Collect output with a timeout (5 minutes)
             try:
-                current_subprocess.wait(timeout=300)
+                if not stream:
+                    stdout_data, _ = current_subprocess.communicate(timeout=CLAUDE_TIMEOUT)
+                    stdout_write(stdout_data)
+                elif os.name == 'nt':
+                    _read_stdout_threaded(current_subprocess, stdout_write, CLAUDE_TIMEOUT)
+                else:
+                    _read_stdout(current_subprocess, stdout_write, CLAUDE_TIMEOUT,
+                                 on_output=lambda: progress.advance(task))
             except subprocess.TimeoutExpired:
                 current_subprocess.kill()
+                current_subprocess.wait()
                 raise Exception("Claude Code timed out after 5 minutes")
             
-            # Wait for threads to finish
-            stdout_thread.join(timeout=2)
-            stderr_thread.join(timeout=2)
-            
             if current_subprocess.returncode != 0:
-                error_msg = '\n'.join(stderr_lines) if stderr_lines else "Claude Code execution failed"
+                error_msg = _read_stderr_tail(stderr_file) or "Claude Code execution failed"
                 raise Exception(f"Claude Code failed: {error_msg}")
+    finally:
+        clear_current_subprocess()
+        # Stop the spinner and elapsed timer for this task
+        progress.update(task, total=1, completed=1)
+    
+    if not track_usage:
+        return {}
+    
+    # Get usage after Claude call and calculate difference
+    post_usage = get_latest_usage()
+    return calculate_usage_difference(pre_usage, post_usage)
+
+
+@lru_cache(maxsize=8)
+def _resolve_executable(command: str) -> str:
+    """Resolve a command to an absolute path once per process
+    
+    subprocess only takes the posix_spawn() fast path for executables given
+    with a directory, and a resolved path also skips a PATH search per call.
+    """
+    return shutil.which(command) or command
+
+
+def _read_stderr_tail(stderr_file) -> str:
+    """Read the last STDERR_TAIL_BYTES of captured stderr as stripped, non-empty lines"""
+    size = stderr_file.seek(0, os.SEEK_END)
+    stderr_file.seek(max(0, size - STDERR_TAIL_BYTES))
+    lines = (line.strip() for line in stderr_file.read().splitlines())
+    return b'\n'.join(line for line in lines if line).decode('utf-8', errors='replace')
+
+
+def _read_stdout(process: subprocess.Popen, stdout_write: Callable[[bytes], Any],
+                 timeout: float, on_output: Optional[Callable[[], None]] = None) -> None:
+    """Drain stdout with a selector loop until the process exits
+    
+    Bytes are passed to ``stdout_write`` unchanged as they arrive. Raises
+    subprocess.TimeoutExpired if the process runs longer than ``timeout``.
+    """
+    deadline = time.monotonic() + timeout
+    stdout_fd = process.stdout.fileno()
+    os.set_blocking(stdout_fd, False)
+    
+    with selectors.DefaultSelector() as selector:
+        selector.register(stdout_fd, selectors.EVENT_READ)
+        
+        while selector.get_map():
+            if time.monotonic() > deadline:
+                raise subprocess.TimeoutExpired(process.args, timeout)
             
-            # Clean up
-            clear_current_subprocess()
-            clear_current_progress()
-            
-            output_text = '\n'.join(output_lines)
-            
-            # Get usage after Claude call and calculate difference
-            post_usage = get_latest_usage()
-            usage_stats = calculate_usage_difference(pre_usage, post_usage)
+            for key, _ in selector.select(timeout=0.1):
+                try:
+                    chunk = os.read(key.fd, READ_CHUNK_SIZE)
+                except BlockingIOError:
+                    continue
+                
+                if not chunk:
+                    selector.unregister(key.fd)
+                else:
+                    stdout_write(chunk)
+                    if on_output:
+                        on_output()
+    
+    process.wait(timeout=max(0.0, deadline - time.monotonic()))
+
+
+def _read_stdout_threaded(process: subprocess.Popen, stdout_write: Callable[[bytes], Any],
+                          timeout: float) -> None:
+    """Drain stdout with a reader thread (for platforms without pipe selectors)"""
+    def read_stdout(stream):
+        """Pass stdout chunks through as they arrive"""
+        try:
+            for chunk in iter(lambda: stream.read1(READ_CHUNK_SIZE), b''):
+                stdout_write(chunk)
+        except:
+            pass
+    
+    stdout_thread = threading.Thread(target=read_stdout, args=(process.stdout,))
+    stdout_thread.start()
+    
+    process.wait(timeout=timeout)
+    
+    # Wait for the reader to finish
+    stdout_thread.join(timeout=2)
+
+
+def run_phase_graph(phases: Dict[str, Tuple[Callable[[Dict[str, Any]], Any], List[str]]],
+                    max_workers: int = 4) -> Dict[str, Any]:
+    """Run dependent phases concurrently, starting each as soon as its inputs are ready
+    
+    ``phases`` maps a phase name to ``(func, dependencies)``. Each func is called
+    with the dict of results completed so far and its return value is stored
+    under the phase name. Independent phases run in parallel worker threads.
+    The first failing phase cancels anything not yet started, terminates the
+    Claude calls of phases still running and re-raises without waiting for them.
+    """
+    for name, (_, deps) in phases.items():
+        unknown = [dep for dep in deps if dep not in phases]
+        if unknown:
+            raise ValueError(f"Phase '{name}' depends on unknown phases: {', '.join(unknown)}")
+    
+    results: Dict[str, Any] = {}
+    pending = dict(phases)
+    running = {}
+    abort = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    
+    try:
+        while pending or running:
+            ready = [name for name, (_, deps) in pending.items()
+                     if all(dep in results for dep in deps)]
+            for name in ready:
+                func, _ = pending.pop(name)
+                running[executor.submit(_run_phase, abort, func, dict(results))] = name
             
-            return output_text, usage_stats
+            if not running:
+                raise ValueError(f"Dependency cycle between phases: {', '.join(pending)}")
             
-        except Exception as e:
-            clear_current_subprocess()
-            clear_current_progress()
-            raise e
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+    except BaseException:
+        # Running phases would otherwise hold the error back until their calls time out
+        abort.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        terminate_active_subprocesses()
+        raise
+    
+    executor.shutdown()
+    return results
+
+
+def _run_phase(abort: threading.Event, func: Callable[[Dict[str, Any]], Any],
+               results: Dict[str, Any]) -> Any:
+    """Run a phase on a worker thread, letting its Claude calls see the graph's abort event"""
+    _phase_state.abort = abort
+    try:
+        return func(results)
+    finally:
+        _phase_state.abort = None
+
+
+def _phase_aborted() -> bool:
+    """Whether the current thread runs a phase of a graph that has already failed"""
+    abort = getattr(_phase_state, 'abort', None)
+    return abort is not None and abort.is_set()
 
 
 def summarize_long_description(desc: str) -> str:
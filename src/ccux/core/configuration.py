@@ -6,10 +6,22 @@ Supports loading project defaults and environment variable overrides.
 """
 
 import os
+import copy
+import functools
 import yaml
 from typing import Dict, Any
 from rich.console import Console
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config_file(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a YAML config file, cached until its modification time or size changes"""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
 
 class Config:
     """Configuration management for CCUX"""
@@ -31,10 +43,10 @@ class Config:
         
         if os.path.exists(self.config_path):
             try:
-                with open(self.config_path, 'r') as f:
-                    config = yaml.safe_load(f) or {}
-                # Merge with defaults
-                return {**self.defaults, **config}
+                stat = os.stat(self.config_path)
+                config = _read_config_file(self.config_path, stat.st_mtime_ns, stat.st_size)
+                # Merge with defaults, copying so updates never touch the cached data
+                return {**self.defaults, **copy.deepcopy(config)}
             except Exception as e:
                 console.print(f"[yellow]⚠️  Error loading config: {e}. Using defaults.[/yellow]")
         
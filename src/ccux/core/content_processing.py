@@ -7,37 +7,79 @@ Handles parsing Claude output, stripping code blocks, and safe JSON parsing.
 
 import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_JSON_FENCE_PATTERN = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_JSON_OBJECT_PATTERN = re.compile(r'\{.*\}', re.DOTALL)
+REFERENCE_URL_PATTERN = re.compile(r'https?://[^\s<>"\'()\[\]]+')
+
+
+def _json_loads(text: str) -> Any:
+    """Decode JSON with orjson when available, falling back to the stdlib"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def save_json_file(path: str, data: Any) -> None:
+    """Write data as indented JSON, using orjson when available"""
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # orjson rejects some values the stdlib accepts (e.g. non-string keys)
+            payload = json.dumps(data, indent=2).encode('utf-8')
+    else:
+        payload = json.dumps(data, indent=2).encode('utf-8')
+    
+    with open(path, 'wb') as f:
+        f.write(payload)
 
-def safe_json_parse(text: str) -> Dict[str, Any]:
-    """Safely parse JSON from Claude output with fallback"""
-    try:
-        # Try direct JSON parse first
-        return json.loads(text.strip())
-    except:
-        # Try to extract JSON from code blocks
-        json_match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(1).strip())
-            except:
-                pass
-        
-        # Try to find JSON-like content
-        json_pattern = r'\{.*\}'
-        json_match = re.search(json_pattern, text, re.DOTALL)
+
+def try_json_parse(text: str) -> Optional[Any]:
+    """Parse JSON from Claude output, returning None when no JSON can be found"""
+    stripped = text.strip()
+    
+    # Try direct JSON parse first
+    if stripped.startswith(('{', '[')):
+        try:
+            return _json_loads(stripped)
+        except ValueError:
+            pass
+    
+    # Try the first fenced JSON block, then the outermost brace-delimited region
+    for pattern in (_JSON_FENCE_PATTERN, _JSON_OBJECT_PATTERN):
+        json_match = pattern.search(text)
         if json_match:
             try:
-                return json.loads(json_match.group(0))
-            except:
+                return _json_loads(json_match.group(json_match.lastindex or 0))
+            except ValueError:
                 pass
-        
-        # Fallback to empty dict
-        console = Console()
-        console.print(f"[yellow]⚠️  Could not parse JSON from Claude output[/yellow]")
-        return {}
+    
+    return None
+
+
+def is_json_output(text: str) -> bool:
+    """Check whether Claude output contains parsable JSON"""
+    return try_json_parse(text) is not None
+
+
+def safe_json_parse(text: str) -> Dict[str, Any]:
+    """Safely parse JSON from Claude output with fallback"""
+    result = try_json_parse(text)
+    if result is not None:
+        return result
+    
+    # Fallback to empty dict
+    console = Console()
+    console.print(f"[yellow]⚠️  Could not parse JSON from Claude output[/yellow]")
+    return {}
 
 
 def strip_code_blocks(text: str) -> str:
@@ -49,6 +91,11 @@ def strip_code_blocks(text: str) -> str:
     return text.strip()
 
 
+def extract_reference_urls(text: str) -> List[str]:
+    """Find the URLs in Claude output, without trailing punctuation or repeats, in first-seen order"""
+    return list(dict.fromkeys(url.rstrip('.,;:') for url in REFERENCE_URL_PATTERN.findall(text)))
+
+
 def extract_html_content(claude_output: str) -> str:
     """Extract HTML content from Claude's response"""
     # First try to find HTML in code blocks
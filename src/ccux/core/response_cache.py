@@ -0,0 +1,57 @@
+"""
+Response Cache Module
+
+Provides an on-disk cache of Claude CLI responses keyed by prompt.
+Lets repeated generation runs skip identical Claude calls entirely.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, Any, Optional, Tuple
+
+
+def get_cache_dir() -> str:
+    """Get the response cache directory, honouring XDG_CACHE_HOME"""
+    base_dir = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base_dir, 'ccux', 'phases')
+
+
+def get_cache_key(prompt: str, claude_cmd: str) -> str:
+    """Hash a prompt and the Claude command that answers it into a cache key"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(claude_cmd.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(prompt.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cache_get(prompt: str, claude_cmd: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Get a cached (output, usage_stats) pair, or None on a cache miss"""
+    cache_path = os.path.join(get_cache_dir(), f"{get_cache_key(prompt, claude_cmd)}.json")
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        return entry['output'], entry.get('stats', {})
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def cache_put(prompt: str, claude_cmd: str, output: str, usage_stats: Dict[str, Any]) -> None:
+    """Store a Claude response; failures are ignored since the cache is optional"""
+    cache_dir = get_cache_dir()
+    cache_path = os.path.join(cache_dir, f"{get_cache_key(prompt, claude_cmd)}.json")
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so concurrent phases never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'output': output, 'stats': usage_stats}, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
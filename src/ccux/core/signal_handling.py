@@ -7,34 +7,41 @@ Manages subprocess cleanup and progress indicator termination.
 
 import sys
 import signal
+import threading
 from typing import Optional
 from rich.console import Console
 
-# Global variables for signal handling
-current_subprocess = None
-current_progress = None
+# Registries of in-flight subprocesses and progress indicators. Claude calls may
+# run concurrently from worker threads, so each thread tracks its own entries in
+# thread-local storage while the signal handler sees all of them.
+_active_subprocesses = set()
+_active_progress = set()
+_registry_lock = threading.Lock()
+_thread_state = threading.local()
 
 
 def signal_handler(signum, frame):
     """Handle keyboard interrupts gracefully"""
-    global current_subprocess, current_progress
-    
     console = Console()
     console.print("\n[yellow]⚠️  Interrupt received, cleaning up...[/yellow]")
-    
-    if current_subprocess:
+
+    with _registry_lock:
+        progress_indicators = list(_active_progress)
+
+    subprocesses = terminate_active_subprocesses()
+
+    for subprocess_obj in subprocesses:
         try:
-            current_subprocess.terminate()
-            current_subprocess.wait(timeout=5)
+            subprocess_obj.wait(timeout=5)
         except:
             try:
-                current_subprocess.kill()
+                subprocess_obj.kill()
             except:
                 pass
-    
-    if current_progress:
-        current_progress.stop()
-    
+
+    for progress_obj in progress_indicators:
+        progress_obj.stop()
+
     console.print("[red]❌ Operation cancelled by user[/red]")
     sys.exit(1)
 
@@ -44,31 +51,60 @@ def register_signal_handler():
     signal.signal(signal.SIGINT, signal_handler)
 
 
+def terminate_active_subprocesses() -> list:
+    """Ask every registered subprocess to terminate and return them, without waiting"""
+    with _registry_lock:
+        subprocesses = list(_active_subprocesses)
+
+    for subprocess_obj in subprocesses:
+        try:
+            subprocess_obj.terminate()
+        except:
+            pass
+    return subprocesses
+
+
 def set_current_subprocess(subprocess_obj):
-    """Set the current subprocess for cleanup"""
-    global current_subprocess
-    current_subprocess = subprocess_obj
+    """Set the current thread's subprocess for cleanup"""
+    clear_current_subprocess()
+    _thread_state.subprocess = subprocess_obj
+    with _registry_lock:
+        _active_subprocesses.add(subprocess_obj)
 
 
 def set_current_progress(progress_obj):
-    """Set the current progress indicator for cleanup"""
-    global current_progress
-    current_progress = progress_obj
+    """Set the current thread's progress indicator for cleanup"""
+    clear_current_progress()
+    _thread_state.progress = progress_obj
+    with _registry_lock:
+        _active_progress.add(progress_obj)
 
 
 def clear_current_subprocess():
-    """Clear the current subprocess reference"""
-    global current_subprocess
-    current_subprocess = None
+    """Clear the current thread's subprocess reference"""
+    subprocess_obj = getattr(_thread_state, 'subprocess', None)
+    if subprocess_obj is not None:
+        _thread_state.subprocess = None
+        with _registry_lock:
+            _active_subprocesses.discard(subprocess_obj)
 
 
 def clear_current_progress():
-    """Clear the current progress reference"""
-    global current_progress
-    current_progress = None
+    """Clear the current thread's progress reference"""
+    progress_obj = getattr(_thread_state, 'progress', None)
+    if progress_obj is not None:
+        _thread_state.progress = None
+        with _registry_lock:
+            _active_progress.discard(progress_obj)
+
+
+def get_active_subprocess_count() -> int:
+    """Get the number of subprocesses currently registered for cleanup"""
+    with _registry_lock:
+        return len(_active_subprocesses)
 
 
 def cleanup_on_exit():
     """Perform cleanup operations on exit"""
     clear_current_subprocess()
-    clear_current_progress()
\ No newline at end of file
+    clear_current_progress()
@@ -7,7 +7,6 @@ Complete interactive interface for CCUX landing page generation
 import os
 import sys
 import time
-import json
 from typing import List, Dict, Optional, Any
 from dataclasses import dataclass
 from rich.console import Console
@@ -19,7 +18,7 @@ from rich.align import Align
 from rich.prompt import Prompt, Confirm, IntPrompt
 
 # Import utilities from core modules
-from .core.content_processing import safe_json_parse
+from .core.content_processing import safe_json_parse, save_json_file
 
 console = Console()
 
@@ -542,14 +541,17 @@ class InteractiveForm:
 class CCUXApp:
     """Main CCUX Interactive Application"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True, refresh_cache: bool = False):
         self.current_project = None
         self.projects = []
         self.running = True
+        # Response cache options for generation calls, as with gen's --no-cache/--refresh
+        self.use_cache = use_cache
+        self.refresh_cache = refresh_cache
     
     def discover_projects(self):
         """Discover existing CCUX projects"""
-        from .cli import discover_existing_projects
+        from .core.project_management import discover_existing_projects
         self.projects = discover_existing_projects()
     
     def show_welcome(self):
@@ -673,13 +675,13 @@ class CCUXApp:
         """Generate project using full 12-phase design thinking methodology"""
         try:
             # Import comprehensive design logic
-            from .cli import (
-                summarize_long_description, 
-                get_theme_choices,
-                run_claude_with_progress,
-                strip_code_blocks,
-                os
+            from .core.claude_integration import (
+                run_claude_with_progress, run_claude_batch, create_claude_progress, summarize_long_description
             )
+            from .core.content_processing import (
+                strip_code_blocks, is_json_output, validate_html_structure, extract_reference_urls
+            )
+            from .theme_specifications import get_theme_choices
             from .prompt_templates import (
                 reference_discovery_prompt,
                 deep_product_understanding_prompt,
@@ -693,11 +695,11 @@ class CCUXApp:
                 prototype_prompt,
                 implementation_prompt
             )
-            import json
             import time
             
             # Create output directory
             os.makedirs(output_dir, exist_ok=True)
+            cache_options = {'use_cache': self.use_cache, 'refresh_cache': self.refresh_cache}
             
             # Validate inputs
             if theme not in get_theme_choices():
@@ -739,157 +741,171 @@ class CCUXApp:
                 'design_phases': {}
             }
             
-            # Phase 1: Reference Discovery (if URLs not provided, auto-discover)
-            if not urls or len(urls) == 0:
-                console.print("\n[bold blue]📋 Phase 1/12: Reference Discovery[/bold blue]")
-                ref_prompt = reference_discovery_prompt(desc)
-                ref_output, ref_stats = run_claude_with_progress(ref_prompt, "Discovering competitor references...")
-                analysis_data['design_phases']['reference_discovery'] = {
-                    'output': ref_output,
-                    'stats': ref_stats
-                }
+            # Phases 1 and 3 depend only on the description, so when references still
+            # need discovering both prompts are answered by one batched Claude call
+            product_prompt = deep_product_understanding_prompt(desc)
+            batched_product_output = None
+            
+            # One live display covers every phase; each Claude call adds its own task to it
+            with create_claude_progress(console) as progress:
+                # Phase 1: Reference Discovery (if URLs not provided, auto-discover)
+                if not urls or len(urls) == 0:
+                    console.print("\n[bold blue]📋 Phase 1/12: Reference Discovery[/bold blue]")
+                    ref_prompt = reference_discovery_prompt(desc)
+                    batch_outputs, ref_stats = run_claude_batch(
+                        {'reference_discovery': ref_prompt, 'product_understanding': product_prompt},
+                        "Discovering competitor references and analyzing product...",
+                        progress=progress, validators={'product_understanding': is_json_output}, **cache_options
+                    )
+                    ref_output = batch_outputs['reference_discovery']
+                    batched_product_output = batch_outputs['product_understanding']
+                    analysis_data['design_phases']['reference_discovery'] = {
+                        'output': ref_output,
+                        'stats': ref_stats
+                    }
                 
-                # Extract URLs from Claude's response (simplified for now)
-                import re
-                discovered_urls = re.findall(r'https?://[^\s<>"{}|\\^`\[\]]+', ref_output)
-                urls = discovered_urls[:3] if discovered_urls else []
-                analysis_data['project_metadata']['reference_urls'] = urls
+                    # Extract URLs from Claude's response
+                    urls = extract_reference_urls(ref_output)[:3]
+                    analysis_data['project_metadata']['reference_urls'] = urls
                 
-                if urls:
-                    console.print(f"[green]✓ Discovered {len(urls)} reference URLs[/green]")
+                    if urls:
+                        console.print(f"[green]✓ Discovered {len(urls)} reference URLs[/green]")
+                        for i, url in enumerate(urls, 1):
+                            console.print(f"   {i}. {url}")
+                    else:
+                        console.print("[yellow]No reference URLs discovered, continuing with original approach[/yellow]")
+                else:
+                    console.print(f"\n[bold blue]📋 Phase 1/12: Using provided reference URLs ({len(urls)})[/bold blue]")
                     for i, url in enumerate(urls, 1):
                         console.print(f"   {i}. {url}")
-                else:
-                    console.print("[yellow]No reference URLs discovered, continuing with original approach[/yellow]")
-            else:
-                console.print(f"\n[bold blue]📋 Phase 1/12: Using provided reference URLs ({len(urls)})[/bold blue]")
-                for i, url in enumerate(urls, 1):
-                    console.print(f"   {i}. {url}")
-            
-            # Phase 2: Screenshot Capture
-            screenshot_refs = []
-            if urls and len(urls) > 0:
-                console.print(f"\n[bold blue]📸 Phase 2/12: Capturing {len(urls)} reference screenshots[/bold blue]")
-                try:
-                    from .scrape import capture_multiple_references
-                    screenshot_results = capture_multiple_references(urls, output_dir)
-                    screenshot_refs = [(url, screenshot_path) for url, _, screenshot_path in screenshot_results]
-                    console.print(f"[green]✓ Captured {len(screenshot_refs)} screenshots[/green]")
-                except Exception as e:
-                    console.print(f"[yellow]⚠️ Screenshot capture failed: {e}[/yellow]")
-                    console.print("[yellow]Continuing without screenshots...[/yellow]")
-            
-            # Phase 3: Deep Product Understanding
-            console.print("\n[bold blue]🎯 Phase 3/12: Product Analysis[/bold blue]")
-            product_prompt = deep_product_understanding_prompt(desc)
-            product_output, product_stats = run_claude_with_progress(product_prompt, "Analyzing product positioning...")
-            product_understanding = safe_json_parse(product_output)
-            analysis_data['design_phases']['product_understanding'] = {
-                'output': product_output,
-                'stats': product_stats
-            }
             
-            # Phase 4: Competitive UX Analysis
-            ux_analysis = {}
-            if screenshot_refs:
-                console.print("\n[bold blue]🔍 Phase 4/12: Competitive UX Analysis[/bold blue]")
-                # Extract only the screenshot paths from the tuples
-                screenshot_paths = [screenshot_path for url, screenshot_path in screenshot_refs]
-                ux_prompt = ux_analysis_prompt(desc, screenshot_paths)
-                ux_output, ux_stats = run_claude_with_progress(ux_prompt, "Analyzing competitor UX patterns...")
-                ux_analysis = safe_json_parse(ux_output)
-                analysis_data['design_phases']['ux_analysis'] = {
-                    'output': ux_output,
-                    'stats': ux_stats
+                # Phase 2: Screenshot Capture
+                screenshot_refs = []
+                if urls and len(urls) > 0:
+                    console.print(f"\n[bold blue]📸 Phase 2/12: Capturing {len(urls)} reference screenshots[/bold blue]")
+                    try:
+                        from .scrape import capture_multiple_references
+                        screenshot_results = capture_multiple_references(urls, output_dir, progress=progress)
+                        screenshot_refs = [(url, screenshot_path) for url, _, screenshot_path in screenshot_results]
+                        console.print(f"[green]✓ Captured {len(screenshot_refs)} screenshots[/green]")
+                    except Exception as e:
+                        console.print(f"[yellow]⚠️ Screenshot capture failed: {e}[/yellow]")
+                        console.print("[yellow]Continuing without screenshots...[/yellow]")
+            
+                # Phase 3: Deep Product Understanding
+                console.print("\n[bold blue]🎯 Phase 3/12: Product Analysis[/bold blue]")
+                if batched_product_output is not None:
+                    # Usage for the batched call is recorded under Phase 1
+                    product_output, product_stats = batched_product_output, {}
+                else:
+                    product_output, product_stats = run_claude_with_progress(product_prompt, "Analyzing product positioning...", progress=progress, validate=is_json_output, **cache_options)
+                product_understanding = safe_json_parse(product_output)
+                analysis_data['design_phases']['product_understanding'] = {
+                    'output': product_output,
+                    'stats': product_stats
                 }
             
-            # Phase 5: User Empathy Mapping
-            console.print("\n[bold blue]👥 Phase 5/12: User Research[/bold blue]")
-            empathy_prompt = empathize_prompt(desc, product_understanding, ux_analysis)
-            empathy_output, empathy_stats = run_claude_with_progress(empathy_prompt, "Creating user empathy maps...")
-            user_research = safe_json_parse(empathy_output)
-            analysis_data['design_phases']['empathy_mapping'] = {
-                'output': empathy_output,
-                'stats': empathy_stats
-            }
+                # Phase 4: Competitive UX Analysis
+                ux_analysis = {}
+                if screenshot_refs:
+                    console.print("\n[bold blue]🔍 Phase 4/12: Competitive UX Analysis[/bold blue]")
+                    # Extract only the screenshot file names from the tuples
+                    screenshot_names = [os.path.basename(screenshot_path) for url, screenshot_path in screenshot_refs]
+                    ux_prompt = ux_analysis_prompt(desc, screenshot_names)
+                    ux_output, ux_stats = run_claude_with_progress(ux_prompt, "Analyzing competitor UX patterns...", progress=progress, validate=is_json_output, **cache_options)
+                    ux_analysis = safe_json_parse(ux_output)
+                    analysis_data['design_phases']['ux_analysis'] = {
+                        'output': ux_output,
+                        'stats': ux_stats
+                    }
+            
+                # Phase 5: User Empathy Mapping
+                console.print("\n[bold blue]👥 Phase 5/12: User Research[/bold blue]")
+                empathy_prompt = empathize_prompt(desc, product_understanding, ux_analysis)
+                empathy_output, empathy_stats = run_claude_with_progress(empathy_prompt, "Creating user empathy maps...", progress=progress, validate=is_json_output, **cache_options)
+                user_research = safe_json_parse(empathy_output)
+                analysis_data['design_phases']['empathy_mapping'] = {
+                    'output': empathy_output,
+                    'stats': empathy_stats
+                }
             
-            # Phase 6: Define Site Flow
-            console.print("\n[bold blue]🗺️ Phase 6/12: Site Flow Definition[/bold blue]")
-            define_prompt_text = define_prompt(desc, user_research)
-            define_output, define_stats = run_claude_with_progress(define_prompt_text, "Mapping user journey...")
-            site_flow = safe_json_parse(define_output)
-            analysis_data['design_phases']['site_flow'] = {
-                'output': define_output,
-                'stats': define_stats
-            }
+                # Phase 6: Define Site Flow
+                console.print("\n[bold blue]🗺️ Phase 6/12: Site Flow Definition[/bold blue]")
+                define_prompt_text = define_prompt(desc, user_research)
+                define_output, define_stats = run_claude_with_progress(define_prompt_text, "Mapping user journey...", progress=progress, validate=is_json_output, **cache_options)
+                site_flow = safe_json_parse(define_output)
+                analysis_data['design_phases']['site_flow'] = {
+                    'output': define_output,
+                    'stats': define_stats
+                }
             
-            # Phase 7: Content Strategy
-            console.print("\n[bold blue]📝 Phase 7/12: Content Strategy[/bold blue]")
-            ideate_prompt_text = ideate_prompt(desc, user_research, site_flow)
-            ideate_output, ideate_stats = run_claude_with_progress(ideate_prompt_text, "Developing content strategy...")
-            content_strategy = safe_json_parse(ideate_output)
-            analysis_data['design_phases']['content_strategy'] = {
-                'output': ideate_output,
-                'stats': ideate_stats
-            }
+                # Phase 7: Content Strategy
+                console.print("\n[bold blue]📝 Phase 7/12: Content Strategy[/bold blue]")
+                ideate_prompt_text = ideate_prompt(desc, user_research, site_flow)
+                ideate_output, ideate_stats = run_claude_with_progress(ideate_prompt_text, "Developing content strategy...", progress=progress, validate=is_json_output, **cache_options)
+                content_strategy = safe_json_parse(ideate_output)
+                analysis_data['design_phases']['content_strategy'] = {
+                    'output': ideate_output,
+                    'stats': ideate_stats
+                }
             
-            # Phase 8: Wireframe Validation
-            console.print("\n[bold blue]📐 Phase 8/12: Wireframe Validation[/bold blue]")
-            wireframe_prompt_text = wireframe_prompt(desc, content_strategy, site_flow)
-            wireframe_output, wireframe_stats = run_claude_with_progress(wireframe_prompt_text, "Validating layout structure...")
-            wireframes = safe_json_parse(wireframe_output)
-            analysis_data['design_phases']['wireframe'] = {
-                'output': wireframe_output,
-                'stats': wireframe_stats
-            }
+                # Phase 8: Wireframe Validation
+                console.print("\n[bold blue]📐 Phase 8/12: Wireframe Validation[/bold blue]")
+                wireframe_prompt_text = wireframe_prompt(desc, content_strategy, site_flow)
+                wireframe_output, wireframe_stats = run_claude_with_progress(wireframe_prompt_text, "Validating layout structure...", progress=progress, validate=is_json_output, **cache_options)
+                wireframes = safe_json_parse(wireframe_output)
+                analysis_data['design_phases']['wireframe'] = {
+                    'output': wireframe_output,
+                    'stats': wireframe_stats
+                }
             
-            # Phase 9: Design System
-            console.print("\n[bold blue]🎨 Phase 9/12: Design System[/bold blue]")
-            design_sys_prompt = design_system_prompt(desc, wireframes, content_strategy, theme)
-            design_sys_output, design_sys_stats = run_claude_with_progress(design_sys_prompt, "Creating design system...")
-            design_system = safe_json_parse(design_sys_output)
-            analysis_data['design_phases']['design_system'] = {
-                'output': design_sys_output,
-                'stats': design_sys_stats
-            }
+                # Phase 9: Design System
+                console.print("\n[bold blue]🎨 Phase 9/12: Design System[/bold blue]")
+                design_sys_prompt = design_system_prompt(desc, wireframes, content_strategy, theme)
+                design_sys_output, design_sys_stats = run_claude_with_progress(design_sys_prompt, "Creating design system...", progress=progress, validate=is_json_output, **cache_options)
+                design_system = safe_json_parse(design_sys_output)
+                analysis_data['design_phases']['design_system'] = {
+                    'output': design_sys_output,
+                    'stats': design_sys_stats
+                }
             
-            # Phase 10: High-Fidelity Design
-            console.print("\n[bold blue]✨ Phase 10/12: High-Fidelity Design[/bold blue]")
-            hifi_prompt = high_fidelity_design_prompt(desc, design_system, wireframes, content_strategy)
-            hifi_output, hifi_stats = run_claude_with_progress(hifi_prompt, "Polishing visual design...")
-            hifi_design = safe_json_parse(hifi_output)
-            analysis_data['design_phases']['high_fidelity'] = {
-                'output': hifi_output,
-                'stats': hifi_stats
-            }
+                # Phase 10: High-Fidelity Design
+                console.print("\n[bold blue]✨ Phase 10/12: High-Fidelity Design[/bold blue]")
+                hifi_prompt = high_fidelity_design_prompt(desc, design_system, wireframes, content_strategy)
+                hifi_output, hifi_stats = run_claude_with_progress(hifi_prompt, "Polishing visual design...", progress=progress, validate=is_json_output, **cache_options)
+                hifi_design = safe_json_parse(hifi_output)
+                analysis_data['design_phases']['high_fidelity'] = {
+                    'output': hifi_output,
+                    'stats': hifi_stats
+                }
             
-            # Phase 11: Prototype Validation
-            console.print("\n[bold blue]🔄 Phase 11/12: Interactive Prototype[/bold blue]")
-            proto_prompt = prototype_prompt(desc, content_strategy, design_system, wireframes)
-            proto_output, proto_stats = run_claude_with_progress(proto_prompt, "Adding interactions...")
-            final_copy = safe_json_parse(proto_output)
-            analysis_data['design_phases']['prototype'] = {
-                'output': proto_output,
-                'stats': proto_stats
-            }
+                # Phase 11: Prototype Validation
+                console.print("\n[bold blue]🔄 Phase 11/12: Interactive Prototype[/bold blue]")
+                proto_prompt = prototype_prompt(desc, content_strategy, design_system, wireframes)
+                proto_output, proto_stats = run_claude_with_progress(proto_prompt, "Adding interactions...", progress=progress, validate=is_json_output, **cache_options)
+                final_copy = safe_json_parse(proto_output)
+                analysis_data['design_phases']['prototype'] = {
+                    'output': proto_output,
+                    'stats': proto_stats
+                }
             
-            # Phase 12: Final Implementation
-            console.print("\n[bold blue]⚡ Phase 12/12: Code Generation[/bold blue]")
-            # Build design_data structure for implementation_prompt
-            design_data = {
-                'design_system': design_system,
-                'content_strategy': content_strategy,
-                'ux_analysis': ux_analysis
-            }
-            impl_prompt = implementation_prompt(
-                desc, final_copy, 'html', theme, design_data, 
-                include_forms
-            )
-            code_output, impl_stats = run_claude_with_progress(impl_prompt, "Generating production code...")
-            analysis_data['design_phases']['implementation'] = {
-                'output': code_output,
-                'stats': impl_stats
-            }
+                # Phase 12: Final Implementation
+                console.print("\n[bold blue]⚡ Phase 12/12: Code Generation[/bold blue]")
+                # Build design_data structure for implementation_prompt
+                design_data = {
+                    'design_system': design_system,
+                    'content_strategy': content_strategy,
+                    'ux_analysis': ux_analysis
+                }
+                impl_prompt = implementation_prompt(
+                    desc, final_copy, 'html', theme, design_data, 
+                    include_forms
+                )
+                code_output, impl_stats = run_claude_with_progress(impl_prompt, "Generating production code...", progress=progress, validate=validate_html_structure, **cache_options)
+                analysis_data['design_phases']['implementation'] = {
+                    'output': code_output,
+                    'stats': impl_stats
+                }
             
             # Calculate total usage stats
             total_stats = {'input_tokens': 0, 'output_tokens': 0, 'cost': 0.0}
@@ -902,8 +918,7 @@ class CCUXApp:
             analysis_data['total_usage'] = total_stats
             
             # Save design analysis
-            with open(os.path.join(output_dir, 'design_analysis.json'), 'w') as f:
-                json.dump(analysis_data, f, indent=2)
+            save_json_file(os.path.join(output_dir, 'design_analysis.json'), analysis_data)
             
             # Save final code
             cleaned_code = strip_code_blocks(code_output)
@@ -924,13 +939,11 @@ class CCUXApp:
     def generate_project_fast(self, desc: str, theme: str, include_forms: bool, output_dir: str, urls: List[str] = None) -> bool:
         """Generate project using fast mode - direct generation without design thinking phases"""
         try:
-            from .cli import (
-                summarize_long_description, 
-                get_theme_choices,
-                run_claude_with_progress,
-                strip_code_blocks
-            )
+            from .core.claude_integration import run_claude_with_progress, summarize_long_description
+            from .core.content_processing import strip_code_blocks, validate_html_structure
+            from .theme_specifications import get_theme_choices
             from .prompt_templates import landing_prompt
+            cache_options = {'use_cache': self.use_cache, 'refresh_cache': self.refresh_cache}
             
             # Validate inputs
             if theme not in get_theme_choices():
@@ -949,7 +962,7 @@ class CCUXApp:
             console.print("\n[bold blue]🚀 Generating landing page...[/bold blue]")
             sections = ['hero', 'features', 'pricing', 'footer']
             prompt = landing_prompt(desc, 'html', theme, sections, include_forms=include_forms)
-            output, stats = run_claude_with_progress(prompt, "Creating your landing page...")
+            output, stats = run_claude_with_progress(prompt, "Creating your landing page...", validate=validate_html_structure, **cache_options)
             
             # Save output
             html_file = os.path.join(output_dir, 'index.html')
@@ -973,8 +986,7 @@ class CCUXApp:
             }
             
             try:
-                with open(os.path.join(output_dir, 'design_analysis.json'), 'w') as f:
-                    json.dump(fast_analysis, f, indent=2)
+                save_json_file(os.path.join(output_dir, 'design_analysis.json'), fast_analysis)
             except Exception as e:
                 console.print(f"[yellow]⚠️  Could not save cost tracking data: {e}[/yellow]")
             
@@ -1388,7 +1400,7 @@ class CCUXApp:
                     include_forms = forms != 'none'
                     
                     # Get next available output directory
-                    from .cli import get_next_available_output_dir
+                    from .core.project_management import get_next_available_output_dir
                     output_dir = get_next_available_output_dir()
                     
                     console.print(f"[cyan]Description:[/cyan] {desc}")
@@ -1470,10 +1482,10 @@ class CCUXApp:
                 self.running = False
                 break
 
-def run_interactive_app():
+def run_interactive_app(use_cache: bool = True, refresh_cache: bool = False):
     """Entry point for interactive application"""
     try:
-        app = CCUXApp()
+        app = CCUXApp(use_cache=use_cache, refresh_cache=refresh_cache)
         app.run()
     except KeyboardInterrupt:
         console.print("\n[yellow]Application interrupted by user[/yellow]")
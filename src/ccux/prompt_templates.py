@@ -1,24 +1,36 @@
+"""
+Prompt Templates Module
+
+Builds the prompts sent to Claude for every design phase and page operation.
+Building a prompt is plain string assembly from small dicts, with no numeric
+loops, so it is tuned at the CPython level (module-level templates filled by
+str.format, lru_cache memoization, flat _dig lookups) rather than with a JIT
+such as Numba, which cannot compile str/dict code and would only add overhead.
+"""
 
-from textwrap import dedent
-import os
-from typing import List, Tuple, Dict
+import json
+from functools import lru_cache
+from string import Formatter
+from typing import Any, List, Tuple, Dict
 
-# Import theme specifications for theme-aware prompts
 try:
-    from .theme_specifications import get_theme_design_system_rules
+    import orjson
 except ImportError:
-    # Fallback if theme_specifications not available
-    def get_theme_design_system_rules(theme_name: str) -> str:
+    orjson = None
+
+# Theme specifications for theme-aware prompts are imported on first use
+@lru_cache(maxsize=16)
+def _theme_design_system_rules(theme_name: str) -> str:
+    """Get theme-aware design system rules, built once per theme"""
+    try:
+        from .theme_specifications import get_theme_design_system_rules
+    except ImportError:
+        # Fallback if theme_specifications not available
         return f"Generate design system for {theme_name} theme."
+    return get_theme_design_system_rules(theme_name)
 
-def get_functional_requirements(include_forms: bool = False) -> str:
-    """Get standard functional requirements for all HTML generation prompts"""
-    form_requirements = ""
-    if include_forms:
-        form_requirements = """
-   - Include basic contact form with email input and submit button (action="#" method="POST")"""
-    
-    return f"""
+
+_FUNCTIONAL_REQUIREMENTS_TEMPLATE = """
 CRITICAL FUNCTIONAL REQUIREMENTS:
 
 1. Navigation System (MANDATORY):
@@ -70,6 +82,17 @@ CRITICAL FUNCTIONAL REQUIREMENTS:
    }});
 """
 
+
+@lru_cache(maxsize=2)
+def get_functional_requirements(include_forms: bool = False) -> str:
+    """Get standard functional requirements for all HTML generation prompts"""
+    form_requirements = ""
+    if include_forms:
+        form_requirements = """
+   - Include basic contact form with email input and submit button (action="#" method="POST")"""
+    
+    return _FUNCTIONAL_REQUIREMENTS_TEMPLATE.format(form_requirements=form_requirements)
+
 def get_animation_requirements() -> str:
     """Get smart animation system requirements for CLI-controlled animations"""
     return """
@@ -117,12 +140,63 @@ SMART ANIMATION SYSTEM (REQUIRED):
    - Testimonials: Auto-rotate if multiple (5s intervals)
    - All animations: Enabled by default, controlled by CLI commands"""
 
+def _dig(data, *keys, default="N/A"):
+    """Look up a nested key path in parsed Claude output, or return ``default``
+    
+    Missing keys, None values and non-dict levels all yield ``default``.
+    """
+    for key in keys:
+        data = data.get(key) if isinstance(data, dict) else None
+        if data is None:
+            return default
+    return data
+
+
+def _json_inline(value: Any) -> str:
+    """Render a value as compact JSON for embedding in a prompt, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def _preview(value, max_items: int = 5, max_chars: int = 300) -> str:
+    """Render parsed phase output as compact JSON, keeping at most ``max_items``
+    list entries and ``max_chars`` characters so prompts stay bounded
+    """
+    if isinstance(value, list):
+        value = value[:max_items]
+    text = _json_inline(value)
+    if len(text) > max_chars:
+        return text[:max_chars - 1] + "…"
+    return text
+
+
+def _truncate(value, limit: int) -> str:
+    """Cut a value to ``limit`` characters after collapsing whitespace runs
+    (newlines, tabs, repeated spaces) to single spaces
+    """
+    if not isinstance(value, str):
+        value = str(value)
+    return " ".join(value.split())[:limit]
+
+
+def _join_names(items, key: str) -> str:
+    """Comma-join the ``key`` field of each item in a parsed list, or "N/A" when empty"""
+    return ", ".join([str(_dig(item, key)) for item in items]) or "N/A"
+
+
+_REFERENCE_DISCOVERY_TEMPLATE = "Given this product: '{desc}', find 3 live product URLs of similar tools. Only list working websites, not blogs. Format: Name – URL – short note."
+
+
+@lru_cache(maxsize=256)
 def reference_discovery_prompt(desc: str) -> str:
-    return f"Given this product: '{desc}', find 3 live product URLs of similar tools. Only list working websites, not blogs. Format: Name – URL – short note."
+    return _REFERENCE_DISCOVERY_TEMPLATE.format(desc=desc)
 
 
-def deep_product_understanding_prompt(desc: str) -> str:
-    return f'''Analyze this product for deep understanding: {desc}
+_DEEP_PRODUCT_UNDERSTANDING_TEMPLATE = '''Analyze this product for deep understanding: {desc}
 
 Context: Perform a strategic analysis to understand the core problem this product solves, who needs it, what makes it different, its strongest feature, and potential risks.
 
@@ -139,48 +213,51 @@ IMPORTANT: You must respond with valid JSON only. No explanations, no markdown,
 }}'''
 
 
-def ux_analysis_prompt(product_desc: str, refs: List[str]) -> str:
-    refs_text = "\n".join(
-        f"- {screenshot_path.split('/')[-1]}" for screenshot_path in refs
-    )
+@lru_cache(maxsize=256)
+def deep_product_understanding_prompt(desc: str) -> str:
+    return _DEEP_PRODUCT_UNDERSTANDING_TEMPLATE.format(desc=desc)
 
-    return f'''UX competitive analysis of: {product_desc}
+
+_UX_ANALYSIS_HEADER = '''UX competitive analysis of: {product_desc}
 
 Read and analyze the following screenshots for UX patterns:
 {refs_text}
 
-Respond in JSON:
-{{
-  "patterns": {{
+'''
+
+_UX_ANALYSIS_SCHEMA = '''Respond in JSON:
+{
+  "patterns": {
     "navigation": ["..."],
     "ctas": ["..."],
     "layouts": ["..."],
     "messaging": ["..."]
-  }},
-  "differentiators": [{{"screenshot":"...","element":"...","why":"..."}}],
-  "weaknesses": {{
+  },
+  "differentiators": [{"screenshot":"...","element":"...","why":"..."}],
+  "weaknesses": {
     "common": ["..."],
     "severe": ["..."]
-  }},
-  "recommendations": {{
+  },
+  "recommendations": {
     "adopt": ["..."],
     "avoid": ["..."],
     "innovate": ["..."]
-  }},
+  },
   "summary": "1-2 sentence takeaway"
-}}
+}
 Rules: Be concise, specific, mobile-first.'''
 
 
-def empathize_prompt(product_desc: str, product_understanding: Dict, ux_analysis: Dict) -> str:
-    short_problem = str(product_understanding.get("problem", "N/A"))[:200]
-    short_user = str(product_understanding.get("user", "N/A"))[:200]
-    short_diff = str(product_understanding.get("differentiator", "N/A"))[:200]
-    
-    nav_patterns = ux_analysis.get("patterns", {}).get("navigation", [])
-    adopt = ux_analysis.get("recommendations", {}).get("adopt", [])
-    avoid = ux_analysis.get("recommendations", {}).get("avoid", [])
-    return f'''Product: {product_desc}
+def ux_analysis_prompt(product_desc: str, ref_names: List[str]) -> str:
+    """UX analysis prompt; ``ref_names`` are screenshot file names (not full paths)"""
+    refs_text = ("- " + "\n- ".join(ref_names)) if ref_names else ""
+    return _UX_ANALYSIS_HEADER.format(
+        product_desc=product_desc,
+        refs_text=refs_text
+    ) + _UX_ANALYSIS_SCHEMA
+
+
+_EMPATHIZE_HEADER = '''Product: {product_desc}
 
 Understanding (trimmed):
 - Problem: {short_problem}
@@ -192,334 +269,446 @@ UX Insights:
 - Adopt: {adopt}
 - Avoid: {avoid}
 
-IMPORTANT: You must respond with valid JSON only. No explanations, no markdown, no code blocks - just the raw JSON object.
+'''
 
-{{
-  "context": {{
+_EMPATHIZE_SCHEMA = '''IMPORTANT: You must respond with valid JSON only. No explanations, no markdown, no code blocks - just the raw JSON object.
+
+{
+  "context": {
     "device": "...",
     "channels": ["...", "...", "..."],
     "immediate_need": "..."
-  }},
-  "questions": {{
+  },
+  "questions": {
     "identity": ["...", "..."],
     "value": ["...", "..."],
     "trust": ["...", "..."]
-  }},
-  "conversion": {{
+  },
+  "conversion": {
     "primary": "...",
     "secondary": ["...", "..."],
     "required_info": ["...", "..."]
-  }},
+  },
   "personas": [
-    {{
+    {
       "name": "...",
       "role": "...",
       "urgency": "...",
       "decision_process": "...",
       "content_needs": ["...", "..."]
-    }}
+    }
   ],
-  "touchpoints": {{
+  "touchpoints": {
     "first_impression": "...",
     "dropoff_risk": "...",
     "persuasive_element": "..."
-  }},
+  },
   "research_gaps": ["...", "..."]
-}}
+}
 
 Rules: Be concise, quote user questions, focus on behaviors. Output only the JSON structure above with no additional text.'''
 
 
-def define_prompt(product_desc, user_research) -> str:
-    return f'''Product: {product_desc}
+def empathize_prompt(product_desc: str, product_understanding: Dict, ux_analysis: Dict) -> str:
+    short_problem = _truncate(product_understanding.get("problem", "N/A"), 200)
+    short_user = _truncate(product_understanding.get("user", "N/A"), 200)
+    short_diff = _truncate(product_understanding.get("differentiator", "N/A"), 200)
+    
+    nav_patterns = _preview(_dig(ux_analysis, "patterns", "navigation", default=[]))
+    adopt = _preview(_dig(ux_analysis, "recommendations", "adopt", default=[]))
+    avoid = _preview(_dig(ux_analysis, "recommendations", "avoid", default=[]))
+    return _EMPATHIZE_HEADER.format(
+        product_desc=product_desc,
+        short_problem=short_problem,
+        short_user=short_user,
+        short_diff=short_diff,
+        nav_patterns=nav_patterns,
+        adopt=adopt,
+        avoid=avoid
+    ) + _EMPATHIZE_SCHEMA
+
+
+_DEFINE_HEADER = '''Product: {product_desc}
 
 Research:
-- Goal: {user_research.get("conversion",{}).get("primary","N/A")}
-- Context: {user_research.get("context",{}).get("immediate_need","N/A")}
-- Questions: {user_research.get("questions",{}).get("value",[])}
-- Personas: {[p.get("name","N/A")+" ("+p.get("role","")+")" for p in user_research.get("personas",[])]}
-
-Output JSON only:
-{{
-  "core_pages": {{
-    "homepage": {{"job":"...","must_show":["...","..."],"next_step":"..."}},
-    "key_secondary": [{{"page":"...","job":"...","exit_risk":"...","recovery":"..."}}]
-  }},
-  "primary_flow": {{
+- Goal: {goal}
+- Context: {context}
+- Questions: {questions}
+- Personas: {personas}
+
+'''
+
+_DEFINE_SCHEMA = '''Output JSON only:
+{
+  "core_pages": {
+    "homepage": {"job":"...","must_show":["...","..."],"next_step":"..."},
+    "key_secondary": [{"page":"...","job":"...","exit_risk":"...","recovery":"..."}]
+  },
+  "primary_flow": {
     "steps":["...","...","..."],
     "dropoff_points":["...","..."],
     "support_elements":["...","..."]
-  }},
-  "alternate_paths": {{
+  },
+  "alternate_paths": {
     "price_concerns":"...",
     "trust_issues":"...",
     "feature_questions":"..."
-  }},
-  "navigation": {{
+  },
+  "navigation": {
     "global_nav":["...","...","..."],
     "mobile_priority":"...",
     "footer_strategy":"..."
-  }},
+  },
   "conflicts":["...","..."],
   "research_gaps":["...","..."]
-}}
+}
 Rules: Be concrete, use UI elements, flag conflicts, note missing research.'''
 
-def ideate_prompt(product_desc, user_research, site_flow) -> str:
-    return f'''Product: {product_desc}
+
+def define_prompt(product_desc, user_research) -> str:
+    goal = _dig(user_research, "conversion", "primary")
+    context = _dig(user_research, "context", "immediate_need")
+    questions = _preview(_dig(user_research, "questions", "value", default=[]))
+    personas = ", ".join([f'{_dig(p, "name")} ({_dig(p, "role", default="")})' for p in _dig(user_research, "personas", default=[])]) or "N/A"
+    return _DEFINE_HEADER.format(
+        product_desc=product_desc,
+        goal=goal,
+        context=context,
+        questions=questions,
+        personas=personas
+    ) + _DEFINE_SCHEMA
+
+_IDEATE_HEADER = '''Product: {product_desc}
 
 Research:
-- Goal: {user_research.get("conversion",{}).get("primary","N/A")}
-- Questions: {user_research.get("questions",{}).get("value",[])}
-- Homepage Must Show: {site_flow.get("core_pages",{}).get("homepage",{}).get("must_show",[])}
-- Primary Flow: {site_flow.get("primary_flow",{}).get("steps",[])}
+- Goal: {goal}
+- Questions: {questions}
+- Homepage Must Show: {must_show}
+- Primary Flow: {primary_flow}
 
-Output JSON only:
-{{
-  "core_messaging": {{
+'''
+
+_IDEATE_SCHEMA = '''Output JSON only:
+{
+  "core_messaging": {
     "value_proposition": "...",
     "unique_angle": "..."
-  }},
-  "hero": {{
+  },
+  "hero": {
     "headline": "...",
     "subhead": "...",
     "primary_cta": "...",
     "supporting_element": "..."
-  }},
+  },
   "benefits": [
-    {{"headline":"...","proof_point":"...","icon_concept":"..."}},
-    {{"headline":"...","proof_point":"...","icon_concept":"..."}},
-    {{"headline":"...","proof_point":"...","icon_concept":"..."}}
+    {"headline":"...","proof_point":"...","icon_concept":"..."},
+    {"headline":"...","proof_point":"...","icon_concept":"..."},
+    {"headline":"...","proof_point":"...","icon_concept":"..."}
   ],
-  "objections": {{
+  "objections": {
     "top_3_concerns": ["...","...","..."],
-    "faq_answers": [{{"question":"...","answer":"..."}}],
+    "faq_answers": [{"question":"...","answer":"..."}],
     "trust_elements": ["...","..."]
-  }},
-  "ctas": {{
+  },
+  "ctas": {
     "primary_action":"...",
     "secondary_action":"...",
     "microcopy":"..."
-  }},
-  "rules": {{
+  },
+  "rules": {
     "tone":"...",
     "avoid":["...","..."],
     "must_include":["...","..."]
-  }}
-}}
+  }
+}
 Rules: Be concise, outcome-focused, use real user wording where possible.'''
 
-def wireframe_prompt(product_desc, content_strategy, site_flow) -> str:
-    return f'''Product: {product_desc}
+
+def ideate_prompt(product_desc, user_research, site_flow) -> str:
+    goal = _dig(user_research, "conversion", "primary")
+    questions = _preview(_dig(user_research, "questions", "value", default=[]))
+    must_show = _preview(_dig(site_flow, "core_pages", "homepage", "must_show", default=[]))
+    primary_flow = _preview(_dig(site_flow, "primary_flow", "steps", default=[]))
+    return _IDEATE_HEADER.format(
+        product_desc=product_desc,
+        goal=goal,
+        questions=questions,
+        must_show=must_show,
+        primary_flow=primary_flow
+    ) + _IDEATE_SCHEMA
+
+_WIREFRAME_HEADER = '''Product: {product_desc}
 
 Content:
-- Hero: {content_strategy.get("hero",{}).get("headline","N/A")}
-- Benefits: {[b.get("headline","N/A") for b in content_strategy.get("benefits",[])]}
-- CTA: {content_strategy.get("ctas",{}).get("primary_action","N/A")}
+- Hero: {hero}
+- Benefits: {benefits}
+- CTA: {cta}
 
 Flow:
-- Pages: {list(site_flow.get("core_pages",{}).keys())}
-- Nav Priority: {site_flow.get("navigation",{}).get("mobile_priority","N/A")}
+- Pages: {pages}
+- Nav Priority: {nav_priority}
 
-Output JSON only:
-{{
-  "layout": {{
+'''
+
+_WIREFRAME_SCHEMA = '''Output JSON only:
+{
+  "layout": {
     "sections": [
-      {{"name":"hero","elements":["..."],"mobile_stack":["..."],"priority":"..."}},
-      {{"name":"benefits","elements":["..."],"mobile_stack":["..."],"priority":"..."}}
+      {"name":"hero","elements":["..."],"mobile_stack":["..."],"priority":"..."},
+      {"name":"benefits","elements":["..."],"mobile_stack":["..."],"priority":"..."}
     ]
-  }},
-  "mobile_checks": {{
+  },
+  "mobile_checks": {
     "critical":["...","...","..."],
     "red_flags":["...","..."]
-  }},
-  "interactions": {{
-    "key":[{{"element":"...","behavior":"...","mobile_consideration":"..."}}]
-  }},
-  "responsive": {{
-    "breakpoints": {{
-      "mobile": {{"rules":["...","..."]}},
-      "tablet": {{"rules":["...","..."]}}
-    }}
-  }}
-}}
+  },
+  "interactions": {
+    "key":[{"element":"...","behavior":"...","mobile_consideration":"..."}]
+  },
+  "responsive": {
+    "breakpoints": {
+      "mobile": {"rules":["...","..."]},
+      "tablet": {"rules":["...","..."]}
+    }
+  }
+}
 Rules: Be concise, mobile-first, ensure CTA always visible.'''
 
 
-def design_system_prompt(product_desc, wireframes, content_strategy, theme: str = "minimal") -> str:
-    return f'''Product: {product_desc}
+def wireframe_prompt(product_desc, content_strategy, site_flow) -> str:
+    hero = _dig(content_strategy, "hero", "headline")
+    benefits = _join_names(_dig(content_strategy, "benefits", default=[]), "headline")
+    cta = _dig(content_strategy, "ctas", "primary_action")
+    pages = ", ".join([str(page) for page in _dig(site_flow, "core_pages", default={})]) or "N/A"
+    nav_priority = _dig(site_flow, "navigation", "mobile_priority")
+    return _WIREFRAME_HEADER.format(
+        product_desc=product_desc,
+        hero=hero,
+        benefits=benefits,
+        cta=cta,
+        pages=pages,
+        nav_priority=nav_priority
+    ) + _WIREFRAME_SCHEMA
+
+
+_DESIGN_SYSTEM_HEADER = '''Product: {product_desc}
 
 Wireframes:
-- Sections: {[s.get("name","N/A") for s in wireframes.get("layout",{}).get("sections",[])]}
-- Mobile Checks: {wireframes.get("mobile_checks",{}).get("critical",[])}
+- Sections: {sections}
+- Mobile Checks: {mobile_checks}
 
-Tone: {content_strategy.get("rules",{}).get("tone","Professional")}
+Tone: {tone}
 
-Output JSON only:
-{{
-  "typography": {{
+'''
+
+_DESIGN_SYSTEM_SCHEMA = '''Output JSON only:
+{
+  "typography": {
     "typeface_choice": "...",
     "brand_rationale": "...",
-    "heading_hierarchy": {{"h1":"...","h2":"...","h3":"..."}},
+    "heading_hierarchy": {"h1":"...","h2":"...","h3":"..."},
     "body_text": "..."
-  }},
-  "color_tokens": {{
+  },
+  "color_tokens": {
     "primary":"#...","primary_light":"#...","primary_dark":"#...",
     "secondary":"#...","accent":"#...","surface":"#...","background":"#...",
     "success":"#...","warning":"#...","error":"#...",
     "text_primary":"#...","text_secondary":"#...","text_muted":"#...",
     "border":"#...","border_light":"#...","shadow":"#..."
-  }},
-  "gradients": {{
+  },
+  "gradients": {
     "primary_gradient":"linear-gradient(135deg, #... 0%, #... 100%)",
     "hero_gradient":"linear-gradient(180deg, #... 0%, #... 100%)",
     "card_gradient":"linear-gradient(145deg, #... 0%, #... 100%)",
     "button_gradient":"linear-gradient(135deg, #... 0%, #... 100%)"
-  }},
-  "shadows": {{
+  },
+  "shadows": {
     "card_shadow":"0 4px 6px -1px rgba(0,0,0,0.1), 0 2px 4px -1px rgba(0,0,0,0.06)",
     "button_shadow":"0 10px 15px -3px rgba(0,0,0,0.1), 0 4px 6px -2px rgba(0,0,0,0.05)",
     "hover_shadow":"0 20px 25px -5px rgba(0,0,0,0.1), 0 10px 10px -5px rgba(0,0,0,0.04)"
-  }},
-  "animations": {{
-    "duration": {{"fast":"150ms","normal":"300ms","slow":"500ms"}},
-    "easing": {{"ease_in":"cubic-bezier(0.4, 0, 1, 1)","ease_out":"cubic-bezier(0, 0, 0.2, 1)","ease_in_out":"cubic-bezier(0.4, 0, 0.2, 1)"}},
-    "transforms": {{"scale_hover":"scale(1.05)","scale_click":"scale(0.95)","lift":"translateY(-2px)"}}
-  }},
-  "wcag_contrast": {{
+  },
+  "animations": {
+    "duration": {"fast":"150ms","normal":"300ms","slow":"500ms"},
+    "easing": {"ease_in":"cubic-bezier(0.4, 0, 1, 1)","ease_out":"cubic-bezier(0, 0, 0.2, 1)","ease_in_out":"cubic-bezier(0.4, 0, 0.2, 1)"},
+    "transforms": {"scale_hover":"scale(1.05)","scale_click":"scale(0.95)","lift":"translateY(-2px)"}
+  },
+  "wcag_contrast": {
     "primary_cta":"X.X:1 - PASS/FAIL",
     "body_text":"X.X:1 - PASS/FAIL",
     "secondary_text":"X.X:1 - PASS/FAIL",
     "error_text":"X.X:1 - PASS/FAIL",
     "accessible":"true/false"
-  }},
+  },
   "signature_elements": [
-    {{"element":"...","specification":"...","usage":"..."}},
-    {{"element":"...","specification":"...","usage":"..."}}
+    {"element":"...","specification":"...","usage":"..."},
+    {"element":"...","specification":"...","usage":"..."}
   ],
-  "components": {{
-    "buttons": {{
-      "primary":{{"default":"...","hover":"...","active":"...","disabled":"...","animation":"transform 300ms ease-out"}},
-      "secondary":{{"default":"...","hover":"...","active":"...","disabled":"...","animation":"all 200ms ease-in-out"}},
-      "ghost":{{"default":"...","hover":"...","active":"...","disabled":"...","animation":"all 150ms ease-in-out"}}
-    }},
-    "inputs": {{
-      "text_field":{{"default":"...","focus":"...","error":"...","animation":"border-color 200ms ease-in-out"}},
-      "select":{{"default":"...","focus":"...","hover":"...","animation":"all 150ms ease-out"}},
-      "textarea":{{"default":"...","focus":"...","error":"...","animation":"border-color 200ms ease-in-out"}}
-    }},
-    "cards": {{
-      "content":{{"default":"...","hover":"...","animation":"transform 300ms ease-out, box-shadow 300ms ease-out"}},
-      "pricing":{{"default":"...","hover":"...","featured":"...","animation":"transform 200ms ease-in-out"}},
-      "testimonial":{{"default":"...","hover":"...","animation":"all 250ms ease-out"}}
-    }}
-  }},
-  "spacing_system": {{"scale":["2px","4px","8px","12px","16px","24px","32px","48px","64px","96px"],"usage":"..."}},
-  "border_radius": {{"sm":"4px","md":"8px","lg":"12px","xl":"16px","2xl":"24px","full":"9999px"}},
-  "svg_patterns": {{
+  "components": {
+    "buttons": {
+      "primary":{"default":"...","hover":"...","active":"...","disabled":"...","animation":"transform 300ms ease-out"},
+      "secondary":{"default":"...","hover":"...","active":"...","disabled":"...","animation":"all 200ms ease-in-out"},
+      "ghost":{"default":"...","hover":"...","active":"...","disabled":"...","animation":"all 150ms ease-in-out"}
+    },
+    "inputs": {
+      "text_field":{"default":"...","focus":"...","error":"...","animation":"border-color 200ms ease-in-out"},
+      "select":{"default":"...","focus":"...","hover":"...","animation":"all 150ms ease-out"},
+      "textarea":{"default":"...","focus":"...","error":"...","animation":"border-color 200ms ease-in-out"}
+    },
+    "cards": {
+      "content":{"default":"...","hover":"...","animation":"transform 300ms ease-out, box-shadow 300ms ease-out"},
+      "pricing":{"default":"...","hover":"...","featured":"...","animation":"transform 200ms ease-in-out"},
+      "testimonial":{"default":"...","hover":"...","animation":"all 250ms ease-out"}
+    }
+  },
+  "spacing_system": {"scale":["2px","4px","8px","12px","16px","24px","32px","48px","64px","96px"],"usage":"..."},
+  "border_radius": {"sm":"4px","md":"8px","lg":"12px","xl":"16px","2xl":"24px","full":"9999px"},
+  "svg_patterns": {
     "hero_bg":"Complex geometric SVG background pattern with subtle animation",
     "section_divider":"Organic wave or curve SVG divider between sections",
     "decorative_elements":"Abstract shapes, dots, or lines for visual interest"
-  }},
-  "logo_concept": {{
+  },
+  "logo_concept": {
     "style":"Modern, minimal, geometric/organic",
     "elements":"Icon + wordmark or symbol only",
     "colors":"Uses primary brand colors",
     "usage":"Header, footer, favicon"
-  }},
+  },
   "summary": "..."
-}}
+}
+
+'''
 
-{get_theme_design_system_rules(theme)}
+_DESIGN_SYSTEM_RULES = '''
 
 Rules: Modern, animated, gradient-rich, high-contrast, mobile-optimized, includes SVG patterns and logo concept.'''
 
 
-def high_fidelity_design_prompt(product_desc, design_system, wireframes, content_strategy) -> str:
-    return f'''Product: {product_desc}
+@lru_cache(maxsize=16)
+def _design_system_body(theme: str) -> str:
+    """Static part of the design system prompt (schema and rules), built once per theme"""
+    return _DESIGN_SYSTEM_SCHEMA + _theme_design_system_rules(theme) + _DESIGN_SYSTEM_RULES
+
+
+def design_system_prompt(product_desc, wireframes, content_strategy, theme: str = "minimal") -> str:
+    sections = _join_names(_dig(wireframes, "layout", "sections", default=[]), "name")
+    mobile_checks = _preview(_dig(wireframes, "mobile_checks", "critical", default=[]))
+    tone = _dig(content_strategy, "rules", "tone", default="Professional")
+    return _DESIGN_SYSTEM_HEADER.format(
+        product_desc=product_desc,
+        sections=sections,
+        mobile_checks=mobile_checks,
+        tone=tone
+    ) + _design_system_body(theme)
+
+
+_HIGH_FIDELITY_DESIGN_HEADER = '''Product: {product_desc}
 
 System:
-- Typography: {design_system.get("typography",{}).get("typeface_choice","N/A")}
-- Primary Color: {design_system.get("color_tokens",{}).get("primary","N/A")}
-- Signature Elements: {[e.get("element","N/A") for e in design_system.get("signature_design_elements",[])]}
+- Typography: {typeface}
+- Primary Color: {primary_color}
+- Signature Elements: {signature_elements}
 
-Wireframes: {[s.get("name","N/A") for s in wireframes.get("layout",{}).get("sections",[])]}
-Tone: {content_strategy.get("rules",{}).get("tone","Professional")}
+Wireframes: {sections}
+Tone: {tone}
 
-Output JSON only:
-{{
-  "design_specifications": {{
+'''
+
+_HIGH_FIDELITY_DESIGN_SCHEMA = '''Output JSON only:
+{
+  "design_specifications": {
     "typography": "...",
     "colors": "...",
     "spacing": "...",
     "components": "..."
-  }},
-  "interactions": {{
+  },
+  "interactions": {
     "hover_states": "...",
     "transitions": "...",
     "responsive": "..."
-  }},
-  "accessibility": {{
+  },
+  "accessibility": {
     "contrast": "...",
     "typography": "...",
     "navigation": "..."
-  }},
+  },
   "implementation_ready": "..."
-}}
+}
 Rules: Be clean, consistent, accessible, mobile-first.'''
 
 
-def prototype_prompt(product_desc, content_strategy, design_system, wireframes) -> str:
-    return f'''Product: {product_desc}
+def high_fidelity_design_prompt(product_desc, design_system, wireframes, content_strategy) -> str:
+    typeface = _dig(design_system, "typography", "typeface_choice")
+    primary_color = _dig(design_system, "color_tokens", "primary")
+    signature_elements = _join_names(_dig(design_system, "signature_elements", default=[]), "element")
+    sections = _join_names(_dig(wireframes, "layout", "sections", default=[]), "name")
+    tone = _dig(content_strategy, "rules", "tone", default="Professional")
+    return _HIGH_FIDELITY_DESIGN_HEADER.format(
+        product_desc=product_desc,
+        typeface=typeface,
+        primary_color=primary_color,
+        signature_elements=signature_elements,
+        sections=sections,
+        tone=tone
+    ) + _HIGH_FIDELITY_DESIGN_SCHEMA
+
+
+_PROTOTYPE_HEADER = '''Product: {product_desc}
 
 Content:
-- Value Proposition: {content_strategy.get("core_messaging",{}).get("value_proposition","N/A")}
-- Hero: {content_strategy.get("hero",{}).get("headline","N/A")}
-- CTA: {content_strategy.get("ctas",{}).get("primary_action","N/A")}
-- Tone: {content_strategy.get("rules",{}).get("tone","Professional")}
+- Value Proposition: {value_proposition}
+- Hero: {hero}
+- CTA: {cta}
+- Tone: {tone}
 
 Design:
-- Sections: {[s.get("name","N/A") for s in wireframes.get("layout",{}).get("sections",[])]}
-- Personality: {design_system.get("typography",{}).get("brand_rationale","Modern and clean")}
-
-Output JSON only:
-{{
-  "hero": {{"headline":"...","subheadline":"...","cta_primary":"...","cta_secondary":"..."}},
-  "problem": {{"headline":"...","description":"...","pain_points":["...","...","..."]}},
-  "solution": {{"headline":"...","value_proposition":"...","key_benefits":["...","...","..."]}},
-  "features": {{"headline":"...","features":[{{"title":"...","description":"...","benefit":"..."}}]}},
-  "social_proof": {{"headline":"...","testimonial":"...","stats":["...","...","..."]}},
-  "pricing": {{"headline":"...","plan_name":"...","price":"...","features":["...","..."],"cta":"..."}},
-  "footer": {{"cta_headline":"...","cta_description":"...","cta_button":"..."}}
-}}
+- Sections: {sections}
+- Personality: {personality}
+
+'''
+
+_PROTOTYPE_SCHEMA = '''Output JSON only:
+{
+  "hero": {"headline":"...","subheadline":"...","cta_primary":"...","cta_secondary":"..."},
+  "problem": {"headline":"...","description":"...","pain_points":["...","...","..."]},
+  "solution": {"headline":"...","value_proposition":"...","key_benefits":["...","...","..."]},
+  "features": {"headline":"...","features":[{"title":"...","description":"...","benefit":"..."}]},
+  "social_proof": {"headline":"...","testimonial":"...","stats":["...","...","..."]},
+  "pricing": {"headline":"...","plan_name":"...","price":"...","features":["...","..."],"cta":"..."},
+  "footer": {"cta_headline":"...","cta_description":"...","cta_button":"..."}
+}
 Rules: Use AIDA/PAS style, focus on benefits, strong CTAs, address objections, keep tone consistent.'''
 
-def implementation_prompt(product_description, copy_content, framework, theme, design_data, include_forms: bool = False) -> str:
-    """Final implementation prompt that consolidates all previous steps"""
-    # Extract only what's essential from previous stages
-    design_system = design_data.get('design_system', {})
-    content_strategy = design_data.get('content_strategy', {})
-    ux_analysis = design_data.get('ux_analysis', {})
-    
-    # Dynamic color handling
-    primary_color = design_system.get('color_tokens', {}).get('primary')
-    color_context = f"Primary Color: {primary_color}" if primary_color else "Color System: Generate appropriate palette"
-    
-    # Content highlights
-    value_prop = content_strategy.get('core_messaging', {}).get('value_proposition', '')
-    primary_cta = content_strategy.get('ctas', {}).get('primary_action', 'Get Started')
-    
-    return f'''You are a senior product designer implementing the final landing page.
 
-Product: {product_description}
-Framework: {framework}
-Theme: {theme}
+def prototype_prompt(product_desc, content_strategy, design_system, wireframes) -> str:
+    value_proposition = _dig(content_strategy, "core_messaging", "value_proposition")
+    hero = _dig(content_strategy, "hero", "headline")
+    cta = _dig(content_strategy, "ctas", "primary_action")
+    tone = _dig(content_strategy, "rules", "tone", default="Professional")
+    sections = _join_names(_dig(wireframes, "layout", "sections", default=[]), "name")
+    personality = _dig(design_system, "typography", "brand_rationale", default="Modern and clean")
+    return _PROTOTYPE_HEADER.format(
+        product_desc=product_desc,
+        value_proposition=value_proposition,
+        hero=hero,
+        cta=cta,
+        tone=tone,
+        sections=sections,
+        personality=personality
+    ) + _PROTOTYPE_SCHEMA
+
+
+# Shared by the full-page HTML prompts (implementation and landing)
+_IMAGE_PATH_RULE = "- IMPORTANT: When referencing images (reference.jpg, reference_1_*.jpg, etc.), use relative path ../filename.jpg since HTML is in output/landing-page/ but images are in output/"
+
+_HTML_ONLY_TRAILER = '''
 
-Consolidated Design Inputs:
-1. {color_context}
-2. Value Proposition: {value_prop[:120]}
-3. Primary CTA: {primary_cta}
-4. UX Patterns: {ux_analysis.get('recommendations', {}).get('adopt', [])[:2]}
+CRITICAL: Output ONLY the complete HTML code starting with <!DOCTYPE html>.
+Do NOT include any explanations, descriptions, or markdown formatting.
+Do NOT write about what you created - just output the raw HTML code.
+Your response should begin immediately with <!DOCTYPE html> and end with </html>.'''
+
+
+_IMPLEMENTATION_RULES_TEMPLATE = '''You are a senior product designer implementing the final landing page.
 
 Implementation Rules:
 - Start with mobile layout then enhance for desktop
@@ -528,7 +717,7 @@ Implementation Rules:
 - Maintain AA accessibility throughout
 - Use system-generated assets where needed
 - Use SVG icons or icon libraries (Heroicons, Lucide, Feather) instead of emoji characters for professional appearance
-- IMPORTANT: When referencing images (reference.jpg, reference_1_*.jpg, etc.), use relative path ../filename.jpg since HTML is in output/landing-page/ but images are in output/
+''' + _IMAGE_PATH_RULE + '''
 
 CRITICAL FUNCTIONAL REQUIREMENTS:
 
@@ -552,45 +741,72 @@ CRITICAL FUNCTIONAL REQUIREMENTS:
    - Test all sections at different breakpoints
 
 3. Working CTAs (REQUIRED):
-   - Primary CTA must be functional: use mailto: link for contact{" or working form with action='#'" if include_forms else ""}
-   {"   - Include basic contact form with email input and submit button (action='#' method='POST')" if include_forms else ""}
+   - Primary CTA must be functional: use mailto: link for contact{cta_form_option}
+   {form_requirement}
    - Secondary CTAs use real links (href="#contact" or "mailto:contact@example.com")
    - All buttons must have hover states and keyboard accessibility
 
-{get_animation_requirements()}
+{animation_requirements}
 
 Visual Treatment Guide:
 <!-- IMAGE-STRATEGY: [hero-image/product-shot/illustration/none] -->
 <!-- ANIMATION-LEVEL: [none/micro/scroll-triggered] -->
 <!-- VISUAL-DENSITY: [sparse/balanced/rich] -->
 
-CRITICAL: Output ONLY the complete HTML code starting with <!DOCTYPE html>.
-Do NOT include any explanations, descriptions, or markdown formatting.
-Do NOT write about what you created - just output the raw HTML code.
-Your response should begin immediately with <!DOCTYPE html> and end with </html>.'''
+'''
 
+_IMPLEMENTATION_INPUTS_TEMPLATE = '''Product: {product_description}
+Framework: {framework}
+Theme: {theme}
 
-def landing_prompt(product_description, framework, theme, sections, design_data=None, include_forms: bool = False) -> str:
-    sections_str = ", ".join(sections) if sections else "hero, features, pricing, footer"
+Consolidated Design Inputs:
+1. {color_context}
+2. Value Proposition: {value_prop_excerpt}
+3. Primary CTA: {primary_cta}
+4. UX Patterns: {ux_patterns}'''
+
+
+@lru_cache(maxsize=2)
+def _implementation_rules(include_forms: bool) -> str:
+    """Static lead of the implementation prompt, built once per include_forms value"""
+    # Optional form requirements
+    cta_form_option = " or working form with action='#'" if include_forms else ""
+    form_requirement = "   - Include basic contact form with email input and submit button (action='#' method='POST')" if include_forms else ""
+    return _IMPLEMENTATION_RULES_TEMPLATE.format(
+        cta_form_option=cta_form_option,
+        form_requirement=form_requirement,
+        animation_requirements=get_animation_requirements()
+    )
+
+
+def implementation_prompt(product_description, copy_content, framework, theme, design_data, include_forms: bool = False) -> str:
+    """Final implementation prompt that consolidates all previous steps"""
+    # Extract only what's essential from previous stages, walking each sub-dict once
+    design_system = design_data.get('design_system') or {}
+    content_strategy = design_data.get('content_strategy') or {}
+    ux_analysis = design_data.get('ux_analysis') or {}
     
-    # Dynamic content integration
-    content_hooks = ""
-    if design_data:
-        cs = design_data.get('content_strategy', {})
-        hooks = [
-            f"Value Hook: {cs.get('core_messaging',{}).get('unique_angle','')}",
-            f"Emotional Trigger: {cs.get('hero',{}).get('supporting_element','')}",
-            f"Social Proof: {cs.get('objections',{}).get('trust_elements',[])[:1]}"
-        ]
-        content_hooks = "\nContent Anchors:\n- " + "\n- ".join(filter(None, hooks))
+    # Dynamic color handling
+    primary_color = _dig(design_system, 'color_tokens', 'primary', default=None)
+    color_context = f"Primary Color: {primary_color}" if primary_color else "Color System: Generate appropriate palette"
     
-    return f'''Create a high-converting landing page that adapts to its purpose.
+    # Content highlights
+    value_prop_excerpt = _truncate(_dig(content_strategy, 'core_messaging', 'value_proposition', default=''), 120)
+    primary_cta = _dig(content_strategy, 'ctas', 'primary_action', default='Get Started')
+    ux_patterns = _preview(_dig(ux_analysis, 'recommendations', 'adopt', default=[]), max_items=2)
+    
+    return _implementation_rules(include_forms) + _IMPLEMENTATION_INPUTS_TEMPLATE.format(
+        product_description=product_description,
+        framework=framework,
+        theme=theme,
+        color_context=color_context,
+        value_prop_excerpt=value_prop_excerpt,
+        primary_cta=primary_cta,
+        ux_patterns=ux_patterns
+    ) + _HTML_ONLY_TRAILER
 
-Product: {product_description}
-Sections: {sections_str}
-Framework: {framework}
-Theme: {theme}
-{content_hooks}
+
+_LANDING_RULES_TEMPLATE = '''Create a high-converting landing page that adapts to its purpose.
 
 Design Framework:
 1. Assess each section's communication goal
@@ -606,7 +822,7 @@ Technical Requirements:
 - Responsive images
 - Accessible interactions
 - Use SVG icons or icon libraries (Heroicons, Lucide, Feather) instead of emoji characters for professional appearance
-- IMPORTANT: When referencing images (reference.jpg, reference_1_*.jpg, etc.), use relative path ../filename.jpg since HTML is in output/landing-page/ but images are in output/
+''' + _IMAGE_PATH_RULE + '''
 
 CRITICAL FUNCTIONAL REQUIREMENTS:
 
@@ -635,63 +851,71 @@ CRITICAL FUNCTIONAL REQUIREMENTS:
    - Make all images and text scale appropriately
 
 3. Working CTAs (REQUIRED):
-   - Primary CTA must be functional: Use mailto: link for contact{" or implement working form" if include_forms else ""}
-   {"   - Contact form example: action='#' method='POST' with email input and submit button" if include_forms else ""}
+   - Primary CTA must be functional: Use mailto: link for contact{cta_form_option}
+   {form_example}
    - Secondary CTAs use real links: href="#contact" or "mailto:contact@example.com"
    - All buttons must have hover states and be keyboard accessible (tabindex, focus states)
-   {"   - Include proper form validation and user feedback" if include_forms else ""}
+   {form_validation}
 
-{get_animation_requirements()}
+{animation_requirements}
 
-CRITICAL: Output ONLY the complete HTML code starting with <!DOCTYPE html>.
-Do NOT include any explanations, descriptions, or markdown formatting.
-Do NOT write about what you created - just output the raw HTML code.
-Your response should begin immediately with <!DOCTYPE html> and end with </html>.'''
+'''
 
+_LANDING_INPUTS_TEMPLATE = '''Product: {product_description}
+Sections: {sections_str}
+Framework: {framework}
+Theme: {theme}
+{content_hooks}'''
+
+
+@lru_cache(maxsize=2)
+def _landing_rules(include_forms: bool) -> str:
+    """Static lead of the landing prompt, built once per include_forms value"""
+    # Optional form requirements
+    cta_form_option = " or implement working form" if include_forms else ""
+    form_example = "   - Contact form example: action='#' method='POST' with email input and submit button" if include_forms else ""
+    form_validation = "   - Include proper form validation and user feedback" if include_forms else ""
+    return _LANDING_RULES_TEMPLATE.format(
+        cta_form_option=cta_form_option,
+        form_example=form_example,
+        form_validation=form_validation,
+        animation_requirements=get_animation_requirements()
+    )
 
-def regeneration_prompt(product_desc, framework, theme, section_list, existing_context=None) -> str:
-    """Smart regeneration that understands existing design language"""
-    context_analysis = ""
-    if existing_context:
-        context_analysis = "\n".join(
-            f"- {k}: {v[:60]}..." if isinstance(v,str) else f"- {k}: {v}"
-            for k,v in existing_context.items()
-        )
-    
-    sections_to_generate = "\n".join([f"- {section}" for section in section_list])
-    
-    # Add section-specific guidance
-    section_guidance = ""
-    if any(section.lower() in ['header', 'nav', 'navigation'] for section in section_list):
-        section_guidance += """
-HEADER/NAVIGATION SPECIFIC REQUIREMENTS:
-- MUST include proper section markers: <!-- START: header --> and <!-- END: header -->
-- MUST maintain all navigation links to existing sections (#hero, #features, #pricing, etc.)
-- MUST preserve mobile hamburger menu functionality with onclick="toggleMobileMenu()"
-- MUST keep fixed navigation: position fixed, top-0, z-50 classes
-- MUST include backdrop-blur or similar styling for scroll effects
-- MUST maintain brand logo and company name consistency
-- Navigation links should match existing section structure
-"""
+
+def landing_prompt(product_description, framework, theme, sections, design_data=None, include_forms: bool = False) -> str:
+    sections_str = ", ".join(sections) if sections else "hero, features, pricing, footer"
     
-    if any(section.lower() == 'footer' for section in section_list):
-        section_guidance += """
-FOOTER SPECIFIC REQUIREMENTS:
-- MUST include proper section markers: <!-- START: footer --> and <!-- END: footer -->
-- MUST include comprehensive company information and contact details
-- MUST maintain multi-column responsive grid layout (4 columns on desktop, stacked on mobile)
-- MUST include social media links with proper icons and hover effects
-- MUST preserve business hours, location, and contact information
-- MUST include quick navigation links to main page sections
-- MUST maintain copyright notice and legal links (Privacy Policy, Terms, etc.)
-- MUST preserve dark theme styling (typically bg-gray-900 with light text)
-- Footer should be comprehensive and informative, containing all essential business info
-"""
+    # Dynamic content integration
+    content_hooks = ""
+    cs = _dig(design_data, 'content_strategy', default=None)
+    if cs:
+        # Only anchors with content are listed
+        hooks = []
+        unique_angle = _dig(cs, 'core_messaging', 'unique_angle', default=None)
+        if unique_angle:
+            hooks.append(f"Value Hook: {unique_angle}")
+        supporting_element = _dig(cs, 'hero', 'supporting_element', default=None)
+        if supporting_element:
+            hooks.append(f"Emotional Trigger: {supporting_element}")
+        trust_elements = _dig(cs, 'objections', 'trust_elements', default=[])
+        if trust_elements:
+            hooks.append(f"Social Proof: {_preview(trust_elements, max_items=1)}")
+        if hooks:
+            content_hooks = "\nContent Anchors:\n- " + "\n- ".join(hooks)
     
-    # Get theme-specific design rules
-    theme_rules = ""
-    if theme == "brutalist":
-        theme_rules = """
+    return _landing_rules(include_forms) + _LANDING_INPUTS_TEMPLATE.format(
+        product_description=product_description,
+        sections_str=sections_str,
+        framework=framework,
+        theme=theme,
+        content_hooks=content_hooks
+    ) + _HTML_ONLY_TRAILER
+
+
+# Theme-specific design rules shared by regeneration_prompt and editgen_prompt
+_THEME_RULES = {
+    "brutalist": """
 BRUTALIST THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
 - Use ONLY these colors: bg-black, bg-white, bg-red-600, bg-yellow-400
 - Use ONLY these text styles: font-black, font-bold, uppercase, tracking-tight, tracking-wide
@@ -701,9 +925,8 @@ BRUTALIST THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
 - Use sharp, geometric layouts with high contrast
 - All buttons MUST have: brutalist-border brutalist-shadow hover:translate-x-1 hover:translate-y-1 hover:shadow-none
 - All text MUST be UPPERCASE where appropriate
-- Color combinations: black text on white/yellow, white text on black/red"""
-    elif theme == "minimal":
-        theme_rules = """
+- Color combinations: black text on white/yellow, white text on black/red""",
+    "minimal": """
 MINIMAL THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
 - Use neutral colors: bg-white, bg-gray-50, bg-gray-100, text-gray-900, text-gray-600
 - Typography: font-normal, font-medium, font-semibold (NO font-black)
@@ -711,62 +934,96 @@ MINIMAL THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
 - Subtle borders: border border-gray-200, rounded-lg
 - Clean buttons: bg-blue-600, hover:bg-blue-700, rounded-md, px-6 py-3
 - Minimal shadows: shadow-sm, shadow-md
-- Simple layouts with lots of breathing room"""
-    elif theme == "playful":
-        theme_rules = """
+- Simple layouts with lots of breathing room""",
+    "playful": """
 PLAYFUL THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
 - Bright colors: bg-pink-500, bg-purple-500, bg-blue-500, bg-yellow-400, bg-green-500
 - Rounded elements: rounded-xl, rounded-2xl, rounded-full
 - Fun typography: font-bold, font-extrabold
 - Organic shapes and bouncy animations: hover:scale-105, transition-transform
 - Colorful gradients: bg-gradient-to-r from-pink-500 to-purple-500
-- Playful spacing and asymmetrical layouts"""
-    elif theme == "corporate":
-        theme_rules = """
+- Playful spacing and asymmetrical layouts""",
+    "corporate": """
 CORPORATE THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
 - Professional colors: bg-blue-900, bg-gray-800, bg-white, text-blue-900
 - Conservative typography: font-medium, font-semibold
 - Structured layouts: grid system, even spacing
 - Subtle shadows: shadow-lg, shadow-xl
 - Professional buttons: bg-blue-600, hover:bg-blue-700
-- Clean, trustworthy design patterns"""
-    elif theme == "terminal":
-        theme_rules = """
+- Clean, trustworthy design patterns""",
+    "terminal": """
 TERMINAL THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
 - Matrix colors: bg-black, bg-gray-900, text-green-400, text-green-300
 - Monospace font: font-mono (already loaded)
 - Terminal aesthetics: border-green-500, bg-green-500/10
 - Command-line elements: $ prompts, code blocks
 - Pixelated/blocky design: sharp edges, no rounded corners
-- Glowing effects: animate-pulse, text-green-400"""
-    elif theme == "dark":
-        theme_rules = """
+- Glowing effects: animate-pulse, text-green-400""",
+    "dark": """
 DARK THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
 - Dark backgrounds: bg-gray-900, bg-gray-800, bg-black
 - Light text: text-white, text-gray-100, text-gray-300
 - Dark accent colors: bg-blue-600, bg-purple-600, bg-indigo-600
 - Subtle borders: border-gray-700, border-gray-600
-- High contrast for accessibility"""
-    elif theme == "morphism":
-        theme_rules = """
+- High contrast for accessibility""",
+    "morphism": """
 MORPHISM THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
 - Soft backgrounds: bg-gray-100, bg-white, bg-gradient-to-br
 - Glass effects: backdrop-blur-sm, bg-white/20, border border-white/20
 - Soft shadows: shadow-xl, shadow-2xl with blur
 - Rounded corners: rounded-xl, rounded-2xl
 - Subtle colors with transparency: bg-blue-500/10, text-gray-700"""
-    else:
-        theme_rules = f"Follow {theme} theme guidelines with appropriate colors and styling"
+}
+
+_DEFAULT_THEME_RULES = "Follow {theme} theme guidelines with appropriate colors and styling"
+
+_FORMATTER = Formatter()
+
+
+@lru_cache(maxsize=32)
+def _specialize_theme_template(template: str, framework: str, theme: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Pre-render the framework, theme and theme_rules fields of a prompt template
     
-    return f'''You are a design system specialist refreshing page sections.
+    Returns the literal text runs and the names of the per-call fields that
+    separate them, for _fill_template() to join with the per-call values.
+    """
+    fixed = {
+        'framework': framework,
+        'theme': theme,
+        'theme_rules': _THEME_RULES.get(theme) or _DEFAULT_THEME_RULES.format(theme=theme),
+    }
+    literals, fields = [''], []
+    for literal, field, _, _ in _FORMATTER.parse(template):
+        literals[-1] += literal
+        if field is None:
+            continue
+        if field in fixed:
+            literals[-1] += fixed[field]
+        else:
+            fields.append(field)
+            literals.append('')
+    return tuple(literals), tuple(fields)
+
+
+def _fill_template(specialized: Tuple[Tuple[str, ...], Tuple[str, ...]], **values) -> str:
+    """Join a specialized template's literal runs with the per-call field values"""
+    literals, fields = specialized
+    parts = [literals[0]]
+    for field, literal in zip(fields, literals[1:]):
+        parts.append(str(values[field]))
+        parts.append(literal)
+    return ''.join(parts)
+
+
+_REGENERATION_TEMPLATE = '''You are a design system specialist refreshing page sections.
 
 Product: {product_desc}
-Sections to update: {", ".join(section_list)}
+Sections to update: {section_names}
 Framework: {framework}
 Theme: {theme}
 
 Existing Context:
-{context_analysis or "No specific context provided"}
+{context_analysis}
 
 {section_guidance}
 
@@ -815,90 +1072,70 @@ Do NOT include any explanations, descriptions, or markdown formatting.
 Do NOT output a complete HTML document - just the requested sections.'''
 
 
-def editgen_prompt(product_desc, framework, theme, edit_instruction, existing_context=None, affected_sections=None) -> str:
-    """Smart targeted editing that preserves design theme and layout while making specific changes"""
-    context_analysis = ""
-    if existing_context:
-        context_analysis = "\n".join(
-            f"- {k}: {v[:60]}..." if isinstance(v,str) else f"- {k}: {v}"
-            for k,v in existing_context.items()
-        )
+_HEADER_SECTION_NAMES = frozenset(['header', 'nav', 'navigation'])
+
+_HEADER_SECTION_GUIDANCE = """
+HEADER/NAVIGATION SPECIFIC REQUIREMENTS:
+- MUST include proper section markers: <!-- START: header --> and <!-- END: header -->
+- MUST maintain all navigation links to existing sections (#hero, #features, #pricing, etc.)
+- MUST preserve mobile hamburger menu functionality with onclick="toggleMobileMenu()"
+- MUST keep fixed navigation: position fixed, top-0, z-50 classes
+- MUST include backdrop-blur or similar styling for scroll effects
+- MUST maintain brand logo and company name consistency
+- Navigation links should match existing section structure
+"""
+
+_FOOTER_SECTION_GUIDANCE = """
+FOOTER SPECIFIC REQUIREMENTS:
+- MUST include proper section markers: <!-- START: footer --> and <!-- END: footer -->
+- MUST include comprehensive company information and contact details
+- MUST maintain multi-column responsive grid layout (4 columns on desktop, stacked on mobile)
+- MUST include social media links with proper icons and hover effects
+- MUST preserve business hours, location, and contact information
+- MUST include quick navigation links to main page sections
+- MUST maintain copyright notice and legal links (Privacy Policy, Terms, etc.)
+- MUST preserve dark theme styling (typically bg-gray-900 with light text)
+- Footer should be comprehensive and informative, containing all essential business info
+"""
+
+
+def _format_existing_context(existing_context) -> str:
+    """List existing page context as bullets, cutting string values to 60 characters"""
+    if not existing_context:
+        return ""
+    return "\n".join([
+        f"- {k}: {v[:60]}..." if isinstance(v, str) else f"- {k}: {v}"
+        for k, v in existing_context.items()
+    ])
+
+
+def regeneration_prompt(product_desc, framework, theme, section_list, existing_context=None) -> str:
+    """Smart regeneration that understands existing design language"""
+    context_analysis = _format_existing_context(existing_context)
     
-    affected_sections_text = ""
-    if affected_sections:
-        affected_sections_text = f"Focus changes on these sections: {', '.join(affected_sections)}"
+    sections_to_generate = ("- " + "\n- ".join(section_list)) if section_list else ""
     
-    # Get theme-specific design rules (same as regeneration)
-    theme_rules = ""
-    if theme == "brutalist":
-        theme_rules = """
-BRUTALIST THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
-- Use ONLY these colors: bg-black, bg-white, bg-red-600, bg-yellow-400
-- Use ONLY these text styles: font-black, font-bold, uppercase, tracking-tight, tracking-wide
-- REQUIRED classes on ALL sections: brutalist-border, brutalist-shadow
-- Typography: JetBrains Mono font (already loaded)
-- NO rounded corners, NO gradients, NO soft shadows
-- Use sharp, geometric layouts with high contrast
-- All buttons MUST have: brutalist-border brutalist-shadow hover:translate-x-1 hover:translate-y-1 hover:shadow-none
-- All text MUST be UPPERCASE where appropriate
-- Color combinations: black text on white/yellow, white text on black/red"""
-    elif theme == "minimal":
-        theme_rules = """
-MINIMAL THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
-- Use neutral colors: bg-white, bg-gray-50, bg-gray-100, text-gray-900, text-gray-600
-- Typography: font-normal, font-medium, font-semibold (NO font-black)
-- Generous whitespace: py-16, py-24, space-y-8, space-y-12
-- Subtle borders: border border-gray-200, rounded-lg
-- Clean buttons: bg-blue-600, hover:bg-blue-700, rounded-md, px-6 py-3
-- Minimal shadows: shadow-sm, shadow-md
-- Simple layouts with lots of breathing room"""
-    elif theme == "playful":
-        theme_rules = """
-PLAYFUL THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
-- Bright colors: bg-pink-500, bg-purple-500, bg-blue-500, bg-yellow-400, bg-green-500
-- Rounded elements: rounded-xl, rounded-2xl, rounded-full
-- Fun typography: font-bold, font-extrabold
-- Organic shapes and bouncy animations: hover:scale-105, transition-transform
-- Colorful gradients: bg-gradient-to-r from-pink-500 to-purple-500
-- Playful spacing and asymmetrical layouts"""
-    elif theme == "corporate":
-        theme_rules = """
-CORPORATE THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
-- Professional colors: bg-blue-900, bg-gray-800, bg-white, text-blue-900
-- Conservative typography: font-medium, font-semibold
-- Structured layouts: grid system, even spacing
-- Subtle shadows: shadow-lg, shadow-xl
-- Professional buttons: bg-blue-600, hover:bg-blue-700
-- Clean, trustworthy design patterns"""
-    elif theme == "terminal":
-        theme_rules = """
-TERMINAL THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
-- Matrix colors: bg-black, bg-gray-900, text-green-400, text-green-300
-- Monospace font: font-mono (already loaded)
-- Terminal aesthetics: border-green-500, bg-green-500/10
-- Command-line elements: $ prompts, code blocks
-- Pixelated/blocky design: sharp edges, no rounded corners
-- Glowing effects: animate-pulse, text-green-400"""
-    elif theme == "dark":
-        theme_rules = """
-DARK THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
-- Dark backgrounds: bg-gray-900, bg-gray-800, bg-black
-- Light text: text-white, text-gray-100, text-gray-300
-- Dark accent colors: bg-blue-600, bg-purple-600, bg-indigo-600
-- Subtle borders: border-gray-700, border-gray-600
-- High contrast for accessibility"""
-    elif theme == "morphism":
-        theme_rules = """
-MORPHISM THEME REQUIREMENTS - MUST FOLLOW EXACTLY:
-- Soft backgrounds: bg-gray-100, bg-white, bg-gradient-to-br
-- Glass effects: backdrop-blur-sm, bg-white/20, border border-white/20
-- Soft shadows: shadow-xl, shadow-2xl with blur
-- Rounded corners: rounded-xl, rounded-2xl
-- Subtle colors with transparency: bg-blue-500/10, text-gray-700"""
-    else:
-        theme_rules = f"Follow {theme} theme guidelines with appropriate colors and styling"
+    # Add section-specific guidance
+    section_guidance = ""
+    requested = {section.lower() for section in section_list}
+    if not requested.isdisjoint(_HEADER_SECTION_NAMES):
+        section_guidance += _HEADER_SECTION_GUIDANCE
     
-    return f'''You are a precision content editor for existing landing pages.
+    if 'footer' in requested:
+        section_guidance += _FOOTER_SECTION_GUIDANCE
+    
+    # Framework, theme and theme rules are pre-rendered once per pair
+    return _fill_template(
+        _specialize_theme_template(_REGENERATION_TEMPLATE, framework, theme),
+        product_desc=product_desc,
+        section_names=", ".join(section_list),
+        context_analysis=context_analysis or "No specific context provided",
+        section_guidance=section_guidance,
+        sections_to_generate=sections_to_generate
+    )
+
+
+_EDITGEN_TEMPLATE = '''You are a precision content editor for existing landing pages.
 
 Product: {product_desc}
 Framework: {framework}
@@ -906,7 +1143,7 @@ Theme: {theme}
 Edit Request: {edit_instruction}
 
 Existing Context:
-{context_analysis or "No specific context provided"}
+{context_analysis}
 
 {affected_sections_text}
 
@@ -957,15 +1194,30 @@ Do NOT add explanations or describe your changes.
 Your response should be the updated HTML code only.'''
 
 
-def editgen_sections_prompt(product_desc, framework, theme, edit_instruction, affected_sections, sections_html) -> str:
-    """Lightweight section-only editing - much faster than full page regeneration"""
+def editgen_prompt(product_desc, framework, theme, edit_instruction, existing_context=None, affected_sections=None) -> str:
+    """Smart targeted editing that preserves design theme and layout while making specific changes"""
+    context_analysis = _format_existing_context(existing_context)
+    
+    affected_sections_text = ""
+    if affected_sections:
+        affected_sections_text = f"Focus changes on these sections: {', '.join(affected_sections)}"
     
-    return f'''Edit these sections based on the instruction. PRESERVE all theme styling.
+    # Framework, theme and theme rules are pre-rendered once per pair (same as regeneration)
+    return _fill_template(
+        _specialize_theme_template(_EDITGEN_TEMPLATE, framework, theme),
+        product_desc=product_desc,
+        edit_instruction=edit_instruction,
+        context_analysis=context_analysis or "No specific context provided",
+        affected_sections_text=affected_sections_text
+    )
+
+
+_EDITGEN_SECTIONS_TEMPLATE = '''Edit these sections based on the instruction. PRESERVE all theme styling.
 
 Product: {product_desc}
 Theme: {theme} (MUST preserve all theme CSS classes and styling)
 Edit Request: {edit_instruction}
-Sections: {", ".join(affected_sections)}
+Sections: {section_names}
 
 CURRENT SECTIONS:
 {sections_html}
@@ -983,9 +1235,20 @@ Output ONLY the edited sections with their markers:
 <!-- END: section_name -->'''
 
 
-def form_on_prompt(product_desc: str, existing_html: str, detected_theme: str) -> str:
-    """Generate concise prompt for adding contact form with correct placement"""
-    return f'''Add a professional contact form to the landing page below. 
+def editgen_sections_prompt(product_desc, framework, theme, edit_instruction, affected_sections, sections_html) -> str:
+    """Lightweight section-only editing - much faster than full page regeneration"""
+    
+    section_names = ", ".join(affected_sections)
+    return _EDITGEN_SECTIONS_TEMPLATE.format(
+        product_desc=product_desc,
+        theme=theme,
+        edit_instruction=edit_instruction,
+        section_names=section_names,
+        sections_html=sections_html
+    )
+
+
+_FORM_ON_TEMPLATE = '''Add a professional contact form to the landing page below. 
 Theme: {detected_theme}
 
 PRODUCT:
@@ -1031,9 +1294,16 @@ OUTPUT:
 Return full HTML starting with <!DOCTYPE html> and ending with </html>. 
 No explanations, only updated code.'''
 
-def form_off_prompt(existing_html: str) -> str:
-    """Generate concise prompt for removing all forms from landing page"""
-    return f'''Remove all forms from the landing page below while keeping design and functionality intact.
+
+def form_on_prompt(product_desc: str, existing_html: str, detected_theme: str) -> str:
+    """Generate concise prompt for adding contact form with correct placement"""
+    return _FORM_ON_TEMPLATE.format(
+        detected_theme=detected_theme,
+        product_desc=product_desc,
+        existing_html=existing_html
+    )
+
+_FORM_OFF_TEMPLATE = '''Remove all forms from the landing page below while keeping design and functionality intact.
 
 CURRENT HTML:
 {existing_html}
@@ -1050,23 +1320,22 @@ Return the full HTML (<!DOCTYPE html> … </html>) with forms removed.
 Only output updated code, no explanations.'''
 
 
-def form_edit_prompt(existing_html: str, form_type: str, fields: list, style: str = None, cta: str = None, detected_theme: str = "minimal") -> str:
-    """Prompt for inserting/editing forms with correct placement in landing page"""
-    field_descriptions = {
-        'name': 'Full name',
-        'email': 'Email address',
-        'phone': 'Phone number',
-        'message': 'Message textarea',
-        'company': 'Company/organization',
-        'website': 'Website URL',
-        'subject': 'Subject line'
-    }
+def form_off_prompt(existing_html: str) -> str:
+    """Generate concise prompt for removing all forms from landing page"""
+    return _FORM_OFF_TEMPLATE.format(existing_html=existing_html)
 
-    fields_list = ', '.join([field_descriptions.get(field, field) for field in fields])
-    cta_text = cta or "Submit"
-    style_context = f" ({style} style)" if style else ""
 
-    return f'''Insert a {form_type} form{style_context} into the landing page below.
+_FORM_FIELD_DESCRIPTIONS = {
+    'name': 'Full name',
+    'email': 'Email address',
+    'phone': 'Phone number',
+    'message': 'Message textarea',
+    'company': 'Company/organization',
+    'website': 'Website URL',
+    'subject': 'Subject line'
+}
+
+_FORM_EDIT_TEMPLATE = '''Insert a {form_type} form{style_context} into the landing page below.
 Theme: {detected_theme}
 
 CURRENT HTML:
@@ -1075,7 +1344,7 @@ CURRENT HTML:
 FORM DETAILS:
 - Fields: {fields_list}
 - CTA: "{cta_text}"
-- Style: {style or 'inline (embedded)'}
+- Style: {style_text}
 
 PLACEMENT RULES:
 - Analyze the HTML structure to find the correct section:
@@ -1093,4 +1362,21 @@ OTHER RULES:
 
 OUTPUT:
 Return the full HTML (<!DOCTYPE html> … </html>) with the form correctly placed.
-Only output updated code, no explanations.'''
\ No newline at end of file
+Only output updated code, no explanations.'''
+
+
+def form_edit_prompt(existing_html: str, form_type: str, fields: list, style: str = None, cta: str = None, detected_theme: str = "minimal") -> str:
+    """Prompt for inserting/editing forms with correct placement in landing page"""
+    fields_list = ', '.join([_FORM_FIELD_DESCRIPTIONS.get(field, field) for field in fields])
+    cta_text = cta or "Submit"
+    style_context = f" ({style} style)" if style else ""
+    style_text = style or 'inline (embedded)'
+    return _FORM_EDIT_TEMPLATE.format(
+        form_type=form_type,
+        style_context=style_context,
+        detected_theme=detected_theme,
+        existing_html=existing_html,
+        fields_list=fields_list,
+        cta_text=cta_text,
+        style_text=style_text
+    )
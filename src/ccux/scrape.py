@@ -1,33 +1,127 @@
 
 from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+import asyncio
 import os
-from typing import Tuple, List
+from contextlib import nullcontext
+from typing import Optional, Tuple, List
 from urllib.parse import urlparse
-import time
 import subprocess
 from rich import print
 from rich.console import Console
 from rich.status import Status
 from rich.progress import Progress, SpinnerColumn, TextColumn, MofNCompleteColumn
 
+# Resolves once the page has rendered recognizable content
+CONTENT_READY_SCRIPT = """
+() => {
+    // Wait for DOM to be stable
+    const body = document.body;
+    if (!body || body.children.length === 0) return false;
+    
+    // Check if main content areas are present
+    const contentIndicators = [
+        'main', '[role="main"]', '.main', '#main',
+        'article', '.content', '#content', '.page',
+        'h1', 'h2', '.hero', '.banner'
+    ];
+    
+    return contentIndicators.some(selector => 
+        document.querySelector(selector) !== null
+    );
+}
+"""
+
+# Modal dismissal targets, tried in order: ("button", accessible name) or ("css", selector)
+MODAL_DISMISS_TARGETS = [
+    # Cookie banners - multi-language support
+    ("button", "Accept"),
+    ("button", "Accept All"),
+    ("button", "Accept Cookies"),
+    ("button", "Aceitar"),  # Portuguese
+    ("button", "Aceptar"),  # Spanish
+    ("button", "Akzeptieren"),  # German
+    ("button", "Accepter"),  # French
+    
+    # Common close patterns
+    ("css", '[aria-label="Close"]'),
+    ("css", '[data-dismiss="modal"]'),
+    ("css", '.modal-close'),
+    ("css", '.close'),
+    ("css", 'button:has-text("×")'),
+    ("css", 'button:has-text("✕")'),
+    
+    # Subscription/newsletter dismissals
+    ("button", "No thanks"),
+    ("button", "Maybe later"),
+    ("button", "Skip"),
+    ("css", '[aria-label="Dismiss"]'),
+    
+    # Age verification
+    ("button", "I am 18 or older"),
+    ("button", "Yes"),
+    
+    # GDPR/Privacy dismissals
+    ("button", "Agree"),
+    ("button", "Continue"),
+]
+
+# Upper bound on reference pages loading at the same time
+MAX_CONCURRENT_CAPTURES = 4
+
+MAIN_CONTENT_SELECTORS = ['main', '[role="main"]', '.main', '#main', 'article', '.content', '#content']
+
+# Resource types that aren't needed for layout/content analysis
+BLOCKED_RESOURCE_TYPES = [
+    'font',      # Web fonts
+    'media',     # Videos/audio  
+    'other',     # Analytics, tracking
+]
+
+# URL fragments of requests to block
+BLOCKED_URL_PATTERNS = [
+    'google-analytics',
+    'googletagmanager', 
+    'facebook.com/tr',
+    'doubleclick',
+    'googlesyndication',
+    '.woff',
+    '.ttf',
+    '.mp4',
+    '.mp3',
+    '.avi',
+    'advertisement',
+    'ads.'
+]
+
+# Set once Chromium is known to be installed, so later captures skip the check
+_chromium_ready = False
+
 def ensure_chromium_installed() -> bool:
     """Check if Chromium is installed and install if needed"""
+    global _chromium_ready
+    if _chromium_ready:
+        return True
+    
     try:
         with sync_playwright() as p:
-            # Try to launch browser to check if installed
-            browser = p.chromium.launch(headless=True)
-            browser.close()
-            return True
+            # Look for the browser executable rather than cold-starting a probe browser
+            _chromium_ready = os.path.exists(p.chromium.executable_path)
     except Exception:
-        print("[yellow] Chromium not found, installing...[/yellow]")
-        try:
-            subprocess.run(["python", "-m", "playwright", "install", "chromium"], 
-                         check=True, capture_output=True, text=True)
-            print("[green] Chromium installed successfully[/green]")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"[red] Failed to install Chromium: {e}[/red]")
-            return False
+        _chromium_ready = False
+    if _chromium_ready:
+        return True
+    
+    print("[yellow] Chromium not found, installing...[/yellow]")
+    try:
+        subprocess.run(["python", "-m", "playwright", "install", "chromium"], 
+                     check=True, capture_output=True, text=True)
+        print("[green] Chromium installed successfully[/green]")
+        _chromium_ready = True
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"[red] Failed to install Chromium: {e}[/red]")
+        return False
 
 def get_browser_options():
     """Get optimized browser launch options"""
@@ -58,66 +152,40 @@ def get_page_options():
         }
     }
 
-def handle_modals_and_popups(page):
+def _modal_dismiss_locator(page, target):
+    """Build the locator for a modal dismissal target"""
+    kind, value = target
+    if kind == "button":
+        return page.get_by_role("button", name=value)
+    return page.locator(value)
+
+async def handle_modals_and_popups(page):
     """Handle various types of modals and popups"""
-    modal_strategies = [
-        # Cookie banners - multi-language support
-        lambda: page.get_by_role("button", name="Accept").click(timeout=1000),
-        lambda: page.get_by_role("button", name="Accept All").click(timeout=1000),
-        lambda: page.get_by_role("button", name="Accept Cookies").click(timeout=1000),
-        lambda: page.get_by_role("button", name="Aceitar").click(timeout=1000),  # Portuguese
-        lambda: page.get_by_role("button", name="Aceptar").click(timeout=1000),  # Spanish
-        lambda: page.get_by_role("button", name="Akzeptieren").click(timeout=1000),  # German
-        lambda: page.get_by_role("button", name="Accepter").click(timeout=1000),  # French
-        
-        # Common close patterns
-        lambda: page.locator('[aria-label="Close"]').click(timeout=1000),
-        lambda: page.locator('[data-dismiss="modal"]').click(timeout=1000),
-        lambda: page.locator('.modal-close').click(timeout=1000),
-        lambda: page.locator('.close').click(timeout=1000),
-        lambda: page.locator('button:has-text("×")').click(timeout=1000),
-        lambda: page.locator('button:has-text("✕")').click(timeout=1000),
-        
-        # Subscription/newsletter dismissals
-        lambda: page.get_by_role("button", name="No thanks").click(timeout=1000),
-        lambda: page.get_by_role("button", name="Maybe later").click(timeout=1000),
-        lambda: page.get_by_role("button", name="Skip").click(timeout=1000),
-        lambda: page.locator('[aria-label="Dismiss"]').click(timeout=1000),
-        
-        # Age verification
-        lambda: page.get_by_role("button", name="I am 18 or older").click(timeout=1000),
-        lambda: page.get_by_role("button", name="Yes").click(timeout=1000),
-        
-        # GDPR/Privacy dismissals
-        lambda: page.get_by_role("button", name="Agree").click(timeout=1000),
-        lambda: page.get_by_role("button", name="Continue").click(timeout=1000),
-    ]
-    
-    for strategy in modal_strategies:
+    for target in MODAL_DISMISS_TARGETS:
         try:
-            strategy()
-            page.wait_for_timeout(500)  # Brief pause after dismissal
+            await _modal_dismiss_locator(page, target).click(timeout=1000)
+            await page.wait_for_timeout(500)  # Brief pause after dismissal
             break  # Stop after first successful dismissal
         except Exception:
             continue
     
     # Try ESC key as final fallback
     try:
-        page.keyboard.press("Escape")
-        page.wait_for_timeout(500)
+        await page.keyboard.press("Escape")
+        await page.wait_for_timeout(500)
     except Exception:
         pass
     
     # Check for overlay/backdrop elements and try to dismiss
     try:
-        overlays = page.locator('.overlay, .modal-backdrop, [style*="z-index"]').all()
+        overlays = await page.locator('.overlay, .modal-backdrop, [style*="z-index"]').all()
         if overlays:
             # Try clicking outside the modal (backdrop click)
-            page.locator('body').click(position={"x": 50, "y": 50}, timeout=1000)
+            await page.locator('body').click(position={"x": 50, "y": 50}, timeout=1000)
     except Exception:
         pass
 
-def capture_screenshot_with_retry(page, screenshot_path: str, max_attempts: int = 3):
+async def capture_screenshot_with_retry(page, screenshot_path: str, max_attempts: int = 3):
     """Capture screenshot with multiple fallback strategies"""
     
     strategies = [
@@ -137,7 +205,7 @@ def capture_screenshot_with_retry(page, screenshot_path: str, max_attempts: int
     for attempt in range(max_attempts):
         for i, strategy in enumerate(strategies):
             try:
-                strategy()
+                await strategy()
                 return  # Success, exit function
             except Exception as e:
                 if attempt == max_attempts - 1 and i == len(strategies) - 1:
@@ -146,23 +214,21 @@ def capture_screenshot_with_retry(page, screenshot_path: str, max_attempts: int
                 continue
         
         # Wait before retry
-        page.wait_for_timeout(1000 * (attempt + 1))
+        await page.wait_for_timeout(1000 * (attempt + 1))
 
-def capture_main_content_area(page, screenshot_path: str):
+async def capture_main_content_area(page, screenshot_path: str):
     """Try to capture just the main content area"""
-    main_selectors = ['main', '[role="main"]', '.main', '#main', 'article', '.content', '#content']
-    
-    for selector in main_selectors:
+    for selector in MAIN_CONTENT_SELECTORS:
         try:
             element = page.locator(selector).first
-            if element.is_visible():
-                element.screenshot(path=screenshot_path, quality=70, type="jpeg")
+            if await element.is_visible():
+                await element.screenshot(path=screenshot_path, quality=70, type="jpeg")
                 return
         except Exception:
             continue
     
     # Fallback to viewport screenshot
-    page.screenshot(path=screenshot_path, full_page=False, quality=60, type="jpeg")
+    await page.screenshot(path=screenshot_path, full_page=False, quality=60, type="jpeg")
 
 def get_user_friendly_error(error: Exception, url: str) -> str:
     """Convert technical errors to user-friendly messages"""
@@ -199,74 +265,85 @@ def should_retry_with_fallback(error: Exception) -> bool:
     
     return any(condition in error_str for condition in fallback_conditions)
 
-def attempt_fallback_capture(url: str, screenshot_path: str, browser) -> tuple[str, str] | None:
+async def attempt_fallback_capture(url: str, screenshot_path: str, browser) -> Optional[Tuple[str, str]]:
     """Attempt minimal fallback capture with basic settings"""
     try:
         print(f"     Attempting fallback capture for {url}")
         
         # Create minimal page with basic settings
-        page = browser.new_page(viewport={"width": 1280, "height": 800})
+        page = await browser.new_page(viewport={"width": 1280, "height": 800})
         
         # Simple navigation without waiting
-        page.goto(url, timeout=15000)
-        page.wait_for_timeout(3000)  # Basic wait
+        await page.goto(url, timeout=15000)
+        await page.wait_for_timeout(3000)  # Basic wait
         
         # Simple screenshot without retries
-        page.screenshot(path=screenshot_path, quality=40, type="jpeg")
+        await page.screenshot(path=screenshot_path, quality=40, type="jpeg")
         
-        dom = page.content()
-        page.close()
+        dom = await page.content()
+        await page.close()
         
         return (dom, screenshot_path)
         
     except Exception:
         return None
 
-def setup_resource_blocking(page):
-    """Set up intelligent resource blocking for faster loading"""
+def should_block_request(request) -> bool:
+    """Decide whether a request is unnecessary for layout/content analysis"""
+    # Block unwanted resource types
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
     
-    # Block resource types that aren't needed for layout/content analysis
-    blocked_resources = [
-        'font',      # Web fonts
-        'media',     # Videos/audio  
-        'other',     # Analytics, tracking
-    ]
+    # Block unwanted URL patterns
+    url = request.url.lower()
+    return any(pattern in url for pattern in BLOCKED_URL_PATTERNS)
+
+async def setup_resource_blocking(page):
+    """Set up intelligent resource blocking for faster loading"""
+    async def handle_route(route):
+        if should_block_request(route.request):
+            await route.abort()
+        else:
+            await route.continue_()
     
-    # Block specific resource patterns
-    blocked_patterns = [
-        '*google-analytics*',
-        '*googletagmanager*', 
-        '*facebook.com/tr*',
-        '*doubleclick*',
-        '*googlesyndication*',
-        '*.woff*',
-        '*.ttf*',
-        '*.mp4*',
-        '*.mp3*',
-        '*.avi*',
-        '*advertisement*',
-        '*ads.*'
-    ]
+    await page.route('**/*', handle_route)
+
+async def capture_page(browser, url: str, screenshot_path: str) -> str:
+    """Load a page on the given browser, dismiss popups and screenshot it; returns the DOM"""
+    page = await browser.new_page(**get_page_options())
     
-    def handle_route(route):
-        resource_type = route.request.resource_type
-        url = route.request.url.lower()
+    try:
+        # Block unnecessary resources for faster loading
+        await setup_resource_blocking(page)
         
-        # Block unwanted resource types
-        if resource_type in blocked_resources:
-            route.abort()
-            return
+        # Advanced wait strategies for different site types
+        try:
+            await page.goto(url, wait_until="networkidle", timeout=15000)
             
-        # Block unwanted URL patterns
-        for pattern in blocked_patterns:
-            if pattern.replace('*', '') in url:
-                route.abort()
-                return
-                
-        # Allow everything else
-        route.continue_()
-    
-    page.route('**/*', handle_route)
+            # Wait for critical content indicators
+            await page.wait_for_function(CONTENT_READY_SCRIPT, timeout=10000)
+            
+            # Additional wait for SPAs and dynamic content
+            await page.wait_for_load_state("domcontentloaded")
+            await page.wait_for_timeout(1000)  # Reduced wait time for animations
+            
+        except Exception:
+            # Fallback to basic loading
+            await page.goto(url, wait_until="domcontentloaded", timeout=20000)
+            await page.wait_for_timeout(2000)
+        
+        # Comprehensive modal/popup handling
+        await handle_modals_and_popups(page)
+        
+        dom = await page.content()
+        # Robust screenshot capture with retry logic
+        await capture_screenshot_with_retry(page, screenshot_path)
+        return dom
+    finally:
+        try:
+            await page.close()
+        except Exception:
+            pass
 
 def capture(url: str, out_dir: str = "output") -> Tuple[str, str]:
     """
@@ -282,179 +359,75 @@ def capture(url: str, out_dir: str = "output") -> Tuple[str, str]:
         raise Exception("Chromium installation failed")
     
     print(f"[bold blue] Capturing screenshot from {url}...[/bold blue]")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(**get_browser_options())
-        page = browser.new_page(**get_page_options())
+    dom = asyncio.run(_capture_single(url, screenshot_path))
     
-        # Block unnecessary resources for faster loading
-        setup_resource_blocking(page)
-        
-        # Advanced wait strategies for different site types
-        try:
-            page.goto(url, wait_until="networkidle", timeout=15000)
-            
-            # Wait for critical content indicators
-            page.wait_for_function("""
-            () => {
-                // Wait for DOM to be stable
-                const body = document.body;
-                if (!body || body.children.length === 0) return false;
-                
-                // Check if main content areas are present
-                const contentIndicators = [
-                    'main', '[role="main"]', '.main', '#main',
-                    'article', '.content', '#content', '.page',
-                    'h1', 'h2', '.hero', '.banner'
-                ];
-                
-                return contentIndicators.some(selector => 
-                    document.querySelector(selector) !== null
-                );
-            }
-            """, timeout=10000)
-            
-            # Additional wait for SPAs and dynamic content
-            page.wait_for_load_state("domcontentloaded")
-            page.wait_for_timeout(1000)  # Reduced wait time for animations
-            
-        except Exception:
-            # Fallback to basic loading
-            page.goto(url, wait_until="domcontentloaded", timeout=20000)
-            page.wait_for_timeout(2000)
-            
-        # Comprehensive modal/popup handling
-        handle_modals_and_popups(page)
-        
-        dom = page.content()
-        # Robust screenshot capture with retry logic
-        capture_screenshot_with_retry(page, screenshot_path)
-        browser.close()
-        
     print(f"[green] Screenshot saved: {os.path.basename(screenshot_path)}[/green]")
     return dom, screenshot_path
 
-def capture_multiple_references(urls: List[str], out_dir: str = "output", max_time_per_site: int = 30) -> List[Tuple[str, str, str]]:
+async def _capture_single(url: str, screenshot_path: str) -> str:
+    """Capture one page on its own browser instance"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(**get_browser_options())
+        try:
+            return await capture_page(browser, url, screenshot_path)
+        finally:
+            await browser.close()
+
+def capture_multiple_references(urls: List[str], out_dir: str = "output", max_time_per_site: int = 30,
+                                progress: Optional[Progress] = None) -> List[Tuple[str, str, str]]:
     """
     Capture screenshots from multiple reference URLs with timeout safety.
     Returns list of (url, dom_html, screenshot_path) tuples.
+    Pass an existing progress display to report on it instead of starting a new one.
+    """
+    return asyncio.run(capture_multiple_references_async(urls, out_dir, max_time_per_site, progress))
+
+async def capture_multiple_references_async(urls: List[str], out_dir: str = "output", max_time_per_site: int = 30,
+                                            progress: Optional[Progress] = None) -> List[Tuple[str, str, str]]:
+    """
+    Capture screenshots from multiple reference URLs concurrently.
+    Up to MAX_CONCURRENT_CAPTURES pages load in parallel on one shared browser instance.
+    Returns list of (url, dom_html, screenshot_path) tuples in input order.
     """
     os.makedirs(out_dir, exist_ok=True)
-    results = []
     console = Console()
     
-    if not ensure_chromium_installed():
+    # The check uses the sync API, which cannot run inside the event loop
+    if not await asyncio.to_thread(ensure_chromium_installed):
         print("[red] Failed to ensure Chromium installation[/red]")
         return []
     
     print(f"[bold green] Capturing {len(urls)} reference screenshots...[/bold green]")
         
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        MofNCompleteColumn(),
-        console=console,
-        transient=False
-    ) as progress:
-        task = progress.add_task("Capturing references", total=len(urls))
+    if progress is None:
+        progress_display = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            MofNCompleteColumn(),
+            console=console,
+            transient=False
+        )
+    else:
+        # Only one live display can be active at a time, so reuse the caller's
+        progress_display = nullcontext(progress)
+    
+    with progress_display as progress:
+        task = progress.add_task(f"[bold green] Capturing {len(urls)} references...[/bold green]", total=len(urls))
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(**get_browser_options())
-            
-            for i, url in enumerate(urls):
-                try:
-                    progress.update(task, description=f"[bold green] Capturing {url}...[/bold green]")
-                    
-                    # Create unique filename for each site
-                    domain = urlparse(url).netloc.replace("www.", "").replace(".", "_")
-                    # Save screenshot in parent output directory
-                    parent_dir = os.path.dirname(out_dir) if out_dir.endswith('landing-page') else out_dir
-                    screenshot_path = os.path.join(parent_dir, f"reference_{i+1}_{domain}.jpg")
-                    
-                    page = browser.new_page(**get_page_options())
-                    
-                    # Block unnecessary resources for faster loading  
-                    setup_resource_blocking(page)
-                    
-                    # Advanced wait strategies for different site types
-                    try:
-                        page.goto(url, wait_until="networkidle", timeout=15000)
-                        
-                        # Wait for critical content indicators
-                        page.wait_for_function("""
-                            () => {
-                                // Wait for DOM to be stable
-                                const body = document.body;
-                                if (!body || body.children.length === 0) return false;
-                                
-                                // Check if main content areas are present
-                                const contentIndicators = [
-                                    'main', '[role="main"]', '.main', '#main',
-                                    'article', '.content', '#content', '.page',
-                                    'h1', 'h2', '.hero', '.banner'
-                                ];
-                                
-                                return contentIndicators.some(selector => 
-                                    document.querySelector(selector) !== null
-                                );
-                            }
-                        """, timeout=10000)
-                        
-                        # Additional wait for SPAs and dynamic content
-                        page.wait_for_load_state("domcontentloaded")
-                        page.wait_for_timeout(1000)  # Reduced wait time for animations
-                        
-                    except Exception:
-                        # Fallback to basic loading
-                        page.goto(url, wait_until="domcontentloaded", timeout=20000)
-                        page.wait_for_timeout(2000)
-                    
-                    # Comprehensive modal/popup handling
-                    handle_modals_and_popups(page)
-                    
-                    dom = page.content()
-                    # Robust screenshot capture with retry logic
-                    capture_screenshot_with_retry(page, screenshot_path)
-                    page.close()
-                    
-                    results.append((url, dom, screenshot_path))
-                    
-                    # Memory cleanup
-                    del dom  # Free up DOM content memory
-                    progress.advance(task)
-                    progress.update(task, description=f"[bold green] Captured {os.path.basename(screenshot_path)}[/bold green]")
-                    time.sleep(0.3)  # Brief pause to show success
-                    
-                    # Small delay between captures (reduced for performance)
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    error_msg = get_user_friendly_error(e, url)
-                    print(f"     {error_msg}")
-                    
-                    # Attempt graceful cleanup
-                    try:
-                        if 'page' in locals():
-                            page.close()
-                    except:
-                        pass
-                    
-                    # Try fallback capture for certain error types  
-                    if should_retry_with_fallback(e):
-                        progress.update(task, description=f"[yellow] Trying fallback for {url}...[/yellow]")
-                        fallback_result = attempt_fallback_capture(url, screenshot_path, browser)
-                        if fallback_result:
-                            dom, screenshot_path = fallback_result
-                            results.append((url, dom, screenshot_path))
-                            progress.advance(task)
-                            progress.update(task, description=f"[bold green] Fallback succeeded: {os.path.basename(screenshot_path)}[/bold green]")
-                            time.sleep(0.3)
-                            continue
-                    
-                    progress.advance(task)  # Advance even on failure
-                    
-                    continue
-                
-            browser.close()
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(**get_browser_options())
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_CAPTURES)
+
+            async def capture_bounded(index: int, url: str) -> Optional[Tuple[str, str, str]]:
+                async with semaphore:
+                    return await _capture_reference_async(browser, url, index, out_dir, progress, task)
+
+            try:
+                captures = await asyncio.gather(*[capture_bounded(i, url) for i, url in enumerate(urls)])
+            finally:
+                await browser.close()
+    
+    results = [result for result in captures if result]
     
     if results:
         print(f"[bold green] Successfully captured {len(results)} of {len(urls)} reference sites[/bold green]")
@@ -462,3 +435,36 @@ def capture_multiple_references(urls: List[str], out_dir: str = "output", max_ti
         print("[red] Failed to capture any reference sites[/red]")
     
     return results
+
+async def _capture_reference_async(browser, url: str, index: int, out_dir: str,
+                                   progress: Progress, task) -> Optional[Tuple[str, str, str]]:
+    """Capture one reference site on a shared async browser; returns None on failure"""
+    # Create unique filename for each site
+    domain = urlparse(url).netloc.replace("www.", "").replace(".", "_")
+    # Save screenshot in parent output directory
+    parent_dir = os.path.dirname(out_dir) if out_dir.endswith('landing-page') else out_dir
+    screenshot_path = os.path.join(parent_dir, f"reference_{index+1}_{domain}.jpg")
+
+    try:
+        dom = await capture_page(browser, url, screenshot_path)
+
+        progress.advance(task)
+        progress.update(task, description=f"[bold green] Captured {os.path.basename(screenshot_path)}[/bold green]")
+        return (url, dom, screenshot_path)
+
+    except Exception as e:
+        error_msg = get_user_friendly_error(e, url)
+        print(f"     {error_msg}")
+
+        # Try fallback capture for certain error types
+        if should_retry_with_fallback(e):
+            progress.update(task, description=f"[yellow] Trying fallback for {url}...[/yellow]")
+            fallback_result = await attempt_fallback_capture(url, screenshot_path, browser)
+            if fallback_result:
+                dom, screenshot_path = fallback_result
+                progress.advance(task)
+                progress.update(task, description=f"[bold green] Fallback succeeded: {os.path.basename(screenshot_path)}[/bold green]")
+                return (url, dom, screenshot_path)
+
+        progress.advance(task)  # Advance even on failure
+        return None
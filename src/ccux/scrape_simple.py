@@ -3,26 +3,9 @@ import os
 from typing import Tuple, List
 from urllib.parse import urlparse
 import time
-import subprocess
 from rich import print
 
-def ensure_chromium_installed() -> bool:
-    """Check if Chromium is installed and install if needed"""
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            browser.close()
-            return True
-    except Exception:
-        print("[yellow]Chromium not found, installing...[/yellow]")
-        try:
-            subprocess.run(["python", "-m", "playwright", "install", "chromium"], 
-                         check=True, capture_output=True, text=True)
-            print("[green]Chromium installed successfully[/green]")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"[red]Failed to install Chromium: {e}[/red]")
-            return False
+from .scrape import ensure_chromium_installed
 
 def capture(url: str, out_dir: str = "output") -> Tuple[str, str]:
     """Simple capture without complex progress bars"""
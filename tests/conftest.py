@@ -0,0 +1,11 @@
+"""Shared fixtures for the ccux tests"""
+
+import pytest
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    """Point the response cache at a temporary directory"""
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setenv('XDG_CACHE_HOME', str(cache_dir))
+    return cache_dir
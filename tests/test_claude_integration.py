@@ -0,0 +1,353 @@
+"""Tests for ccux.core.claude_integration"""
+
+import threading
+import time
+
+import pytest
+
+from ccux.core import claude_integration
+from ccux.core.content_processing import strip_code_blocks
+
+
+def fake_claude(chunks, usage_stats=None):
+    """Replace a Claude CLI call with one that writes the given stdout chunks"""
+    def run_claude(prompt, description, progress, stdout_write, track_usage=True, stream=True):
+        for chunk in chunks:
+            stdout_write(chunk.encode('utf-8'))
+        return dict(usage_stats or {})
+    return run_claude
+
+
+FENCED_OUTPUTS = {
+    'plain fence': "```html\n<html><body>Hi</body></html>\n```",
+    'preamble': "Here is the page:\n```html\n<html><body>Hi</body></html>\n```\nEnjoy!",
+    'jsx fence': "```jsx\nexport default function App() {\n  return <main />;\n}\n```",
+    'indented closing fence': "```html\n<html>\n  <body>Hi</body>\n</html>\n   ```",
+    'fence inside pre': "```html\n<pre>\n```\ncode\n```\n</pre>\n```",
+    'no fence': "  <html><body>Hi</body></html>\n\n",
+    'trailing fence only': "<html></html>```",
+}
+
+
+@pytest.mark.parametrize('output', FENCED_OUTPUTS.values(), ids=FENCED_OUTPUTS.keys())
+@pytest.mark.parametrize('chunk_size', [1, 7, 65536])
+def test_run_claude_to_file_matches_strip_code_blocks(tmp_path, monkeypatch, output, chunk_size):
+    chunks = [output[i:i + chunk_size] for i in range(0, len(output), chunk_size)]
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude(chunks))
+    out_path = tmp_path / 'index.html'
+
+    claude_integration.run_claude_to_file("prompt", str(out_path))
+
+    assert out_path.read_text(encoding='utf-8') == strip_code_blocks(output)
+
+
+@pytest.mark.parametrize('output', FENCED_OUTPUTS.values(), ids=FENCED_OUTPUTS.keys())
+def test_run_claude_to_file_matches_buffered_runner(tmp_path, monkeypatch, output):
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude([output]))
+    out_path = tmp_path / 'index.html'
+
+    claude_integration.run_claude_to_file("prompt", str(out_path))
+    buffered, _ = claude_integration.run_claude_with_progress("prompt")
+
+    assert out_path.read_text(encoding='utf-8') == strip_code_blocks(buffered)
+
+
+def test_run_claude_to_file_keeps_existing_page_on_failure(tmp_path, monkeypatch):
+    def run_claude(prompt, description, progress, stdout_write, track_usage=True, stream=True):
+        stdout_write(b"```html\n<html><bo")
+        raise RuntimeError("Claude Code timed out")
+
+    monkeypatch.setattr(claude_integration, '_run_claude', run_claude)
+    out_path = tmp_path / 'index.html'
+    out_path.write_text("<html>previous</html>", encoding='utf-8')
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        claude_integration.run_claude_to_file("prompt", str(out_path))
+
+    assert out_path.read_text(encoding='utf-8') == "<html>previous</html>"
+    assert [path.name for path in tmp_path.iterdir()] == ['index.html']
+
+
+def test_cached_response_skips_claude(cache_home, monkeypatch):
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude(["first"], {'cost': 1.0}))
+    assert claude_integration.run_claude_with_progress("prompt", use_cache=True) == ("first", {'cost': 1.0})
+
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude(["second"]))
+    assert claude_integration.run_claude_with_progress("prompt", use_cache=True) == ("first", {})
+    assert claude_integration.run_claude_with_progress("prompt") == ("second", {})
+
+
+def test_refresh_cache_stores_fresh_response(cache_home, monkeypatch):
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude(["first"]))
+    claude_integration.run_claude_with_progress("prompt", use_cache=True)
+
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude(["second"]))
+    assert claude_integration.run_claude_with_progress("prompt", use_cache=True, refresh_cache=True)[0] == "second"
+    assert claude_integration.run_claude_with_progress("prompt", use_cache=True)[0] == "second"
+
+
+def test_cached_page_is_written_to_file(cache_home, tmp_path, monkeypatch):
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude(["```html\n<html></html>\n```"]))
+    claude_integration.run_claude_to_file("prompt", str(tmp_path / 'a.html'), use_cache=True)
+
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude(["unused"]))
+    claude_integration.run_claude_to_file("prompt", str(tmp_path / 'b.html'), use_cache=True)
+
+    assert (tmp_path / 'b.html').read_text(encoding='utf-8') == "<html></html>"
+
+
+def test_run_phase_graph_passes_dependency_results():
+    seen = {}
+
+    def phase(name, value):
+        def run(results):
+            seen[name] = dict(results)
+            return value
+        return run
+
+    results = claude_integration.run_phase_graph({
+        'c': (lambda results: results['a'] + results['b'], ['a', 'b']),
+        'a': (phase('a', 1), []),
+        'b': (phase('b', 2), ['a']),
+    })
+
+    assert results == {'a': 1, 'b': 2, 'c': 3}
+    assert seen['a'] == {}
+    assert seen['b'] == {'a': 1}
+
+
+def test_run_phase_graph_runs_independent_phases_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_sibling(results):
+        # Deadlocks (and times out) unless both phases run at the same time
+        barrier.wait()
+        return True
+
+    results = claude_integration.run_phase_graph({
+        'a': (wait_for_sibling, []),
+        'b': (wait_for_sibling, []),
+    })
+
+    assert results == {'a': True, 'b': True}
+
+
+def test_run_phase_graph_propagates_failure_and_skips_dependants():
+    started = []
+
+    def fail(results):
+        raise RuntimeError("phase failed")
+
+    with pytest.raises(RuntimeError, match="phase failed"):
+        claude_integration.run_phase_graph({
+            'a': (fail, []),
+            'b': (lambda results: started.append('b'), ['a']),
+        })
+
+    assert started == []
+
+
+def test_run_phase_graph_fails_without_waiting_for_running_phases(monkeypatch):
+    release = threading.Event()
+    finished = threading.Event()
+    calls = []
+
+    def slow(results):
+        try:
+            release.wait(timeout=10)
+            # Claude calls made after a sibling phase failed are refused
+            claude_integration.run_claude_with_progress("prompt", track_usage=False)
+        except Exception as e:
+            calls.append(str(e))
+        finally:
+            finished.set()
+
+    def fail(results):
+        raise RuntimeError("phase failed")
+
+    monkeypatch.setattr(claude_integration.subprocess, 'Popen',
+                        lambda *args, **kwargs: calls.append('started Claude'))
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="phase failed"):
+        claude_integration.run_phase_graph({'slow': (slow, []), 'failing': (fail, [])})
+    assert time.monotonic() - start < 5
+
+    release.set()
+    assert finished.wait(timeout=5)
+    assert calls == ["Claude Code call cancelled after another phase failed"]
+
+
+def test_run_phase_graph_rejects_unknown_dependencies():
+    with pytest.raises(ValueError, match="unknown phases: missing"):
+        claude_integration.run_phase_graph({'a': (lambda results: 1, ['missing'])})
+
+
+def test_run_phase_graph_rejects_cycles():
+    with pytest.raises(ValueError, match="Dependency cycle"):
+        claude_integration.run_phase_graph({
+            'a': (lambda results: 1, ['b']),
+            'b': (lambda results: 2, ['a']),
+        })
+
+
+def batch_answer(*sections):
+    """Build a batched answer from (label, text) sections"""
+    return '\n'.join(f"{claude_integration.BATCH_TASK_HEADER.format(label=label)}\n{text}"
+                     for label, text in sections)
+
+
+@pytest.fixture
+def claude_calls(monkeypatch):
+    """Answer run_claude_simple() calls from a prompt -> output mapping, recording the prompts"""
+    answers = {}
+    calls = []
+    # Keep warnings on one line
+    monkeypatch.setenv('COLUMNS', '200')
+
+    def run_claude_simple(prompt, description="", progress=None, use_cache=False, refresh_cache=False,
+                          validate=None):
+        calls.append(prompt)
+        return answers.get(prompt, f"answer to {prompt}"), {'input_tokens': 1, 'output_tokens': 2, 'cost': 0.5}
+
+    monkeypatch.setattr(claude_integration, 'run_claude_simple', run_claude_simple)
+    return answers, calls
+
+
+PROMPTS = {'refs': "find references", 'product': "analyze product"}
+
+
+def test_split_batch_output():
+    output = "preamble\n" + batch_answer(('refs', "https://a.com\n"), ('product', '{"a": 1}'))
+
+    assert claude_integration.split_batch_output(output) == {'refs': "https://a.com", 'product': '{"a": 1}'}
+
+
+def test_split_batch_output_drops_repeated_labels():
+    output = batch_answer(('refs', "one"), ('product', "p"), ('refs', "two"))
+
+    assert claude_integration.split_batch_output(output) == {'product': "p"}
+
+
+def test_build_batch_prompt_includes_every_header():
+    prompt = claude_integration.build_batch_prompt(PROMPTS)
+
+    for label, task in PROMPTS.items():
+        assert f"{claude_integration.BATCH_TASK_HEADER.format(label=label)}\n{task}" in prompt
+
+
+def test_run_claude_batch_single_call(claude_calls, capsys):
+    answers, calls = claude_calls
+    answers[claude_integration.build_batch_prompt(PROMPTS)] = batch_answer(('refs', "R"), ('product', "P"))
+
+    outputs, stats = claude_integration.run_claude_batch(PROMPTS)
+
+    assert outputs == {'refs': "R", 'product': "P"}
+    assert len(calls) == 1
+    assert stats == {'input_tokens': 1, 'output_tokens': 2, 'cost': 0.5}
+    assert "did not match" not in capsys.readouterr().out
+
+
+def test_run_claude_batch_single_prompt_is_not_batched(claude_calls):
+    _, calls = claude_calls
+
+    outputs, _ = claude_integration.run_claude_batch({'refs': "find references"})
+
+    assert outputs == {'refs': "answer to find references"}
+    assert calls == ["find references"]
+
+
+@pytest.mark.parametrize('sections, problem', [
+    ([('refs', "R")], "'product' missing"),
+    ([('refs', "R"), ('product', "")], "'product' empty"),
+    ([('refs', "R"), ('product', "P1"), ('product', "P2")], "'product' repeated"),
+])
+def test_run_claude_batch_reruns_bad_sections(claude_calls, capsys, sections, problem):
+    answers, calls = claude_calls
+    answers[claude_integration.build_batch_prompt(PROMPTS)] = batch_answer(*sections)
+
+    outputs, stats = claude_integration.run_claude_batch(PROMPTS)
+
+    assert outputs == {'refs': "R", 'product': "answer to analyze product"}
+    assert calls[1:] == ["analyze product"]
+    assert stats == {'input_tokens': 2, 'output_tokens': 4, 'cost': 1.0}
+    out = capsys.readouterr().out
+    assert problem in out
+    assert "re-running product separately" in out
+
+
+def test_run_claude_batch_reports_unexpected_and_reordered_sections(claude_calls, capsys):
+    answers, calls = claude_calls
+    answers[claude_integration.build_batch_prompt(PROMPTS)] = batch_answer(
+        ('product', "P"), ('refs', "R"), ('extra', "X")
+    )
+
+    outputs, _ = claude_integration.run_claude_batch(PROMPTS)
+
+    assert outputs == {'refs': "R", 'product': "P"}
+    assert len(calls) == 1
+    assert "unexpected extra" in capsys.readouterr().out
+
+
+def test_run_claude_batch_reports_reordered_sections(claude_calls, capsys):
+    answers, calls = claude_calls
+    answers[claude_integration.build_batch_prompt(PROMPTS)] = batch_answer(('product', "P"), ('refs', "R"))
+
+    outputs, _ = claude_integration.run_claude_batch(PROMPTS)
+
+    assert outputs == {'refs': "R", 'product': "P"}
+    assert len(calls) == 1
+    assert "sections out of order" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('output, validate', [
+    ("", None),
+    ("not json", lambda text: text.startswith('{')),
+])
+def test_rejected_responses_are_not_cached(cache_home, monkeypatch, output, validate):
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude([output]))
+    claude_integration.run_claude_with_progress("prompt", use_cache=True, validate=validate)
+
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude(['{"a": 1}']))
+    assert claude_integration.run_claude_with_progress("prompt", use_cache=True, validate=validate)[0] == '{"a": 1}'
+
+
+def test_run_claude_batch_reruns_invalid_sections(claude_calls, capsys):
+    answers, calls = claude_calls
+    answers[claude_integration.build_batch_prompt(PROMPTS)] = batch_answer(('refs', "R"), ('product', "not json"))
+    answers["analyze product"] = '{"a": 1}'
+
+    outputs, _ = claude_integration.run_claude_batch(
+        PROMPTS, validators={'product': lambda text: text.startswith('{')}
+    )
+
+    assert outputs == {'refs': "R", 'product': '{"a": 1}'}
+    assert calls[1:] == ["analyze product"]
+    assert "'product' invalid" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('sections', [
+    [('refs', "R"), ('product', "not json")],
+    [('refs', "R")],
+])
+def test_run_claude_batch_caches_only_usable_answers(cache_home, monkeypatch, sections):
+    validators = {'product': lambda text: text.startswith('{')}
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude([batch_answer(*sections)]))
+    claude_integration.run_claude_batch(PROMPTS, use_cache=True, validators=validators)
+
+    monkeypatch.setattr(claude_integration, '_run_claude',
+                        fake_claude([batch_answer(('refs', "R2"), ('product', '{"a": 1}'))]))
+    outputs, _ = claude_integration.run_claude_batch(PROMPTS, use_cache=True, validators=validators)
+
+    assert outputs == {'refs': "R2", 'product': '{"a": 1}'}
+
+
+def test_run_claude_batch_caches_usable_answers(cache_home, monkeypatch):
+    monkeypatch.setattr(claude_integration, '_run_claude',
+                        fake_claude([batch_answer(('refs', "R"), ('product', '{"a": 1}'))]))
+    claude_integration.run_claude_batch(PROMPTS, use_cache=True)
+
+    monkeypatch.setattr(claude_integration, '_run_claude', fake_claude(["unused"]))
+    outputs, _ = claude_integration.run_claude_batch(PROMPTS, use_cache=True)
+
+    assert outputs == {'refs': "R", 'product': '{"a": 1}'}
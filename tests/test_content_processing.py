@@ -0,0 +1,70 @@
+"""Tests for ccux.core.content_processing"""
+
+import pytest
+
+from ccux.core import content_processing
+from ccux.core.content_processing import extract_reference_urls, is_json_output, safe_json_parse
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def json_backend(request, monkeypatch):
+    """Run a test with orjson (when installed) and with the stdlib fallback"""
+    if request.param == 'orjson':
+        if content_processing.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(content_processing, 'orjson', None)
+    return request.param
+
+
+def test_safe_json_parse_direct(json_backend):
+    assert safe_json_parse('  {"a": 1, "b": [1, 2]}\n') == {"a": 1, "b": [1, 2]}
+
+
+def test_safe_json_parse_direct_list(json_backend):
+    assert safe_json_parse('[1, 2, 3]') == [1, 2, 3]
+
+
+def test_safe_json_parse_fenced(json_backend):
+    text = 'Here is the analysis:\n```json\n{"problem": "slow", "nested": {"x": true}}\n```\nDone.'
+    assert safe_json_parse(text) == {"problem": "slow", "nested": {"x": True}}
+
+
+def test_safe_json_parse_bare_fence(json_backend):
+    assert safe_json_parse('```\n{"a": 1}\n```') == {"a": 1}
+
+
+def test_safe_json_parse_first_fence_wins(json_backend):
+    text = '```json\n{"first": 1}\n```\nand\n```json\n{"second": 2}\n```'
+    assert safe_json_parse(text) == {"first": 1}
+
+
+def test_safe_json_parse_embedded_object(json_backend):
+    text = 'Sure! The result is {"a": {"b": 2}} as requested.'
+    assert safe_json_parse(text) == {"a": {"b": 2}}
+
+
+def test_safe_json_parse_multiline_embedded_object(json_backend):
+    text = 'Analysis follows.\n{\n  "personas": [\n    {"name": "Ann"}\n  ]\n}\nThanks.'
+    assert safe_json_parse(text) == {"personas": [{"name": "Ann"}]}
+
+
+@pytest.mark.parametrize('text', ['', 'no json here', '{broken', '{"a": }'])
+def test_safe_json_parse_unparsable(json_backend, text):
+    assert safe_json_parse(text) == {}
+
+
+def test_is_json_output(json_backend):
+    assert is_json_output('```json\n{"a": 1}\n```')
+    assert not is_json_output('{"a": 1')
+    assert not is_json_output('')
+
+
+def test_extract_reference_urls():
+    text = ("1. https://stripe.com, 2. (see https://linear.app).\n"
+            "3. <https://vercel.com/home>; again https://stripe.com.")
+    assert extract_reference_urls(text) == ["https://stripe.com", "https://linear.app", "https://vercel.com/home"]
+
+
+def test_extract_reference_urls_none():
+    assert extract_reference_urls("No references found.") == []
@@ -0,0 +1,156 @@
+"""Tests for ccux.prompt_templates"""
+
+from ccux import prompt_templates
+
+
+def test_high_fidelity_design_prompt_lists_signature_elements():
+    design_system = {'signature_elements': [{'element': "Gradient hero"}, {'element': "Glass cards"}]}
+
+    prompt = prompt_templates.high_fidelity_design_prompt("A CRM", design_system, {}, {})
+
+    assert "- Signature Elements: Gradient hero, Glass cards\n" in prompt
+
+
+CONTEXT = {'title': "Acme " * 20, 'sections': 3}
+
+
+def test_regeneration_prompt_matches_full_format():
+    prompt = prompt_templates.regeneration_prompt("A CRM", "html", "dark", ["hero", "pricing"], CONTEXT)
+
+    assert prompt == prompt_templates._REGENERATION_TEMPLATE.format(
+        product_desc="A CRM",
+        section_names="hero, pricing",
+        framework="html",
+        theme="dark",
+        context_analysis=f"- title: {('Acme ' * 20)[:60]}...\n- sections: 3",
+        section_guidance="",
+        theme_rules=prompt_templates._THEME_RULES['dark'],
+        sections_to_generate="- hero\n- pricing"
+    )
+
+
+def test_regeneration_prompt_renders_brace_escapes():
+    prompt = prompt_templates.regeneration_prompt("A CRM", "html", "dark", ["hero"])
+
+    assert "- Maintain smooth scrolling CSS: html { scroll-behavior: smooth; }\n" in prompt
+    assert "{{" not in prompt and "}}" not in prompt
+
+
+def test_regeneration_prompt_section_guidance():
+    header_only = prompt_templates.regeneration_prompt("A CRM", "html", "dark", ["Nav", "hero"])
+    footer_only = prompt_templates.regeneration_prompt("A CRM", "html", "dark", ["footer"])
+    both = prompt_templates.regeneration_prompt("A CRM", "html", "dark", ["header", "footer"])
+    neither = prompt_templates.regeneration_prompt("A CRM", "html", "dark", ["hero"])
+
+    header = prompt_templates._HEADER_SECTION_GUIDANCE
+    footer = prompt_templates._FOOTER_SECTION_GUIDANCE
+    assert header in header_only and footer not in header_only
+    assert footer in footer_only and header not in footer_only
+    assert header + footer in both
+    assert header not in neither and footer not in neither
+    assert "No specific context provided" in neither
+
+
+def test_regeneration_prompt_unknown_theme_uses_default_rules():
+    prompt = prompt_templates.regeneration_prompt("A CRM", "react", "sunset", ["hero"])
+
+    assert "Follow sunset theme guidelines with appropriate colors and styling" in prompt
+    assert "Framework: react\nTheme: sunset\n" in prompt
+
+
+def test_regeneration_prompt_does_not_reformat_values():
+    # Values are inserted as-is, even when they contain format fields or braces
+    prompt = prompt_templates.regeneration_prompt("A {theme} CRM {{x}}", "html", "dark", ["hero"])
+
+    assert "Product: A {theme} CRM {{x}}\n" in prompt
+
+
+def test_specialized_templates_do_not_leak_between_themes():
+    dark = prompt_templates.regeneration_prompt("A CRM", "html", "dark", ["hero"])
+    minimal = prompt_templates.regeneration_prompt("A CRM", "html", "minimal", ["hero"])
+
+    assert prompt_templates._THEME_RULES['dark'] in dark
+    assert prompt_templates._THEME_RULES['dark'] not in minimal
+    assert prompt_templates._THEME_RULES['minimal'] in minimal
+
+
+def test_editgen_prompt_matches_full_format():
+    prompt = prompt_templates.editgen_prompt("A CRM", "html", "morphism", "Make the hero bolder",
+                                             CONTEXT, ["hero", "cta"])
+
+    assert prompt == prompt_templates._EDITGEN_TEMPLATE.format(
+        product_desc="A CRM",
+        framework="html",
+        theme="morphism",
+        edit_instruction="Make the hero bolder",
+        context_analysis=f"- title: {('Acme ' * 20)[:60]}...\n- sections: 3",
+        affected_sections_text="Focus changes on these sections: hero, cta",
+        theme_rules=prompt_templates._THEME_RULES['morphism']
+    )
+    assert "- Smooth Scrolling: Keep html { scroll-behavior: smooth; } CSS\n" in prompt
+
+
+def test_editgen_prompt_without_context_or_sections():
+    prompt = prompt_templates.editgen_prompt("A CRM", "html", "dark", "Fix typos")
+
+    assert "Existing Context:\nNo specific context provided\n\n\n\n" in prompt
+    assert "Focus changes on" not in prompt
+    assert prompt.count("Fix typos") == 2
+
+
+DESIGN_DATA = {
+    'design_system': {'color_tokens': {'primary': "#2563eb"}},
+    'content_strategy': {
+        'core_messaging': {'value_proposition': "Close  deals\nfaster " + "x" * 200, 'unique_angle': "AI follow-ups"},
+        'ctas': {'primary_action': "Start free trial"},
+        'hero': {'supporting_element': "Relief"},
+        'objections': {'trust_elements': ["SOC 2", "GDPR"]},
+    },
+    'ux_analysis': {'recommendations': {'adopt': ["sticky nav", "social proof", "pricing toggle"]}},
+}
+
+HTML_ONLY_END = "Your response should begin immediately with <!DOCTYPE html> and end with </html>."
+
+
+def test_implementation_prompt():
+    prompt = prompt_templates.implementation_prompt("A CRM", "copy", "html", "dark", DESIGN_DATA)
+
+    assert prompt.startswith("You are a senior product designer implementing the final landing page.\n")
+    assert prompt.endswith(HTML_ONLY_END)
+    assert ("Product: A CRM\nFramework: html\nTheme: dark\n\nConsolidated Design Inputs:\n"
+            "1. Primary Color: #2563eb\n"
+            f"2. Value Proposition: {('Close deals faster ' + 'x' * 200)[:120]}\n"
+            "3. Primary CTA: Start free trial\n"
+            '4. UX Patterns: ["sticky nav","social proof"]\n') in prompt
+    assert ("function toggleMobileMenu() { const menu = document.getElementById('mobile-menu'); "
+            "menu.classList.toggle('hidden'); }") in prompt
+    assert "action='#' method='POST'" not in prompt
+
+
+def test_implementation_prompt_defaults_and_forms():
+    prompt = prompt_templates.implementation_prompt("A CRM", "copy", "react", "minimal", {}, include_forms=True)
+
+    assert ("1. Color System: Generate appropriate palette\n2. Value Proposition: \n"
+            "3. Primary CTA: Get Started\n4. UX Patterns: []\n") in prompt
+    assert "Include basic contact form with email input and submit button (action='#' method='POST')" in prompt
+
+
+def test_landing_prompt():
+    prompt = prompt_templates.landing_prompt("A CRM", "html", "dark", ["hero", "pricing"], DESIGN_DATA)
+
+    assert prompt.startswith("Create a high-converting landing page that adapts to its purpose.\n")
+    assert prompt.endswith(HTML_ONLY_END)
+    assert ("Product: A CRM\nSections: hero, pricing\nFramework: html\nTheme: dark\n\n"
+            "Content Anchors:\n- Value Hook: AI follow-ups\n- Emotional Trigger: Relief\n"
+            '- Social Proof: ["SOC 2"]\n') in prompt
+    assert "{{" not in prompt and "}}" not in prompt
+    assert "Contact form example" not in prompt
+
+
+def test_landing_prompt_defaults_and_forms():
+    prompt = prompt_templates.landing_prompt("A CRM", "react", "minimal", [], include_forms=True)
+
+    assert "Product: A CRM\nSections: hero, features, pricing, footer\nFramework: react\nTheme: minimal\n\n\n" in prompt
+    assert "Content Anchors" not in prompt
+    assert "Contact form example: action='#' method='POST' with email input and submit button" in prompt
+    assert "Include proper form validation and user feedback" in prompt
@@ -0,0 +1,81 @@
+"""Tests for ccux.core.response_cache"""
+
+import os
+
+import pytest
+
+from ccux.core.response_cache import cache_get, cache_put, get_cache_dir, get_cache_key
+
+
+# Every test here reads or writes the cache
+pytestmark = pytest.mark.usefixtures('cache_home')
+
+
+def test_cache_dir_honours_xdg_cache_home(cache_home):
+    assert get_cache_dir() == os.path.join(str(cache_home), 'ccux', 'phases')
+
+
+def test_cache_round_trip():
+    stats = {'input_tokens': 10, 'output_tokens': 20, 'cost': 0.5}
+
+    cache_put("prompt", "claude", "output ✓", stats)
+
+    assert cache_get("prompt", "claude") == ("output ✓", stats)
+
+
+def test_cache_miss():
+    assert cache_get("never stored", "claude") is None
+
+
+def test_cache_put_overwrites():
+    cache_put("prompt", "claude", "first", {})
+    cache_put("prompt", "claude", "second", {})
+
+    assert cache_get("prompt", "claude") == ("second", {})
+
+
+def test_cache_put_leaves_no_temporary_files():
+    cache_put("prompt", "claude", "output", {})
+
+    assert [name for name in os.listdir(get_cache_dir()) if not name.endswith('.json')] == []
+
+
+def test_cache_key_is_stable():
+    assert get_cache_key("prompt", "claude") == get_cache_key("prompt", "claude")
+
+
+@pytest.mark.parametrize('prompt, claude_cmd', [
+    ("prompt ", "claude"),
+    ("Prompt", "claude"),
+    ("prompt", "/usr/local/bin/claude"),
+    # The separator keeps command/prompt boundaries from colliding
+    ("eprompt", "claud"),
+])
+def test_cache_key_sensitivity(prompt, claude_cmd):
+    assert get_cache_key(prompt, claude_cmd) != get_cache_key("prompt", "claude")
+
+
+def test_cache_separates_claude_commands():
+    cache_put("prompt", "claude", "from claude", {})
+
+    assert cache_get("prompt", "other-claude") is None
+
+
+@pytest.mark.parametrize('content', ['', 'not json', '{"stats": {}}', '[1, 2]'])
+def test_cache_get_ignores_corrupt_entries(content):
+    os.makedirs(get_cache_dir())
+    path = os.path.join(get_cache_dir(), f"{get_cache_key('prompt', 'claude')}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    assert cache_get("prompt", "claude") is None
+
+
+def test_cache_put_ignores_unwritable_cache_dir(cache_home):
+    # A file where the cache directory should be makes every write fail
+    cache_home.mkdir()
+    (cache_home / 'ccux').write_text('')
+
+    cache_put("prompt", "claude", "output", {})
+
+    assert cache_get("prompt", "claude") is None
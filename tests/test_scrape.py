@@ -0,0 +1,61 @@
+"""Tests for ccux.scrape"""
+
+import asyncio
+
+from ccux import scrape
+
+
+class FakeBrowser:
+    async def close(self):
+        pass
+
+
+class FakePlaywright:
+    """Stands in for async_playwright() without launching a browser"""
+
+    def __init__(self):
+        self.chromium = self
+
+    async def launch(self, **kwargs):
+        return FakeBrowser()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def test_capture_multiple_references_bounds_concurrency(tmp_path, monkeypatch):
+    active = 0
+    peak = 0
+    checks = []
+
+    def ensure_chromium_installed():
+        # The check uses the sync Playwright API, which refuses to run inside an event loop
+        try:
+            asyncio.get_running_loop()
+            checks.append('in event loop')
+        except RuntimeError:
+            checks.append('in thread')
+        return True
+
+    async def capture_page(browser, url, screenshot_path):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return f"<html>{url}</html>"
+
+    monkeypatch.setattr(scrape, 'ensure_chromium_installed', ensure_chromium_installed)
+    monkeypatch.setattr(scrape, 'async_playwright', FakePlaywright)
+    monkeypatch.setattr(scrape, 'capture_page', capture_page)
+    urls = [f"https://site{i}.com" for i in range(scrape.MAX_CONCURRENT_CAPTURES * 2 + 1)]
+
+    results = scrape.capture_multiple_references(urls, str(tmp_path))
+
+    assert checks == ['in thread']
+    assert peak == scrape.MAX_CONCURRENT_CAPTURES
+    assert [url for url, _, _ in results] == urls
+    assert results[0][1] == "<html>https://site0.com</html>"